@@ -0,0 +1,26 @@
+"""
+Add the description_skills column to the jobpost table in PostgreSQL.
+
+Fill it afterwards with: python reextract_skills.py --jobs-only
+"""
+from app.database import engine
+from sqlalchemy import text
+
+def add_columns():
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("""
+                ALTER TABLE jobpost
+                ADD COLUMN IF NOT EXISTS description_skills VARCHAR;
+            """))
+            conn.commit()
+            print("✅ Successfully added columns:")
+            print("   - jobpost.description_skills (VARCHAR, JSON array)")
+        except Exception as e:
+            print(f"❌ Error adding columns: {e}")
+            raise
+
+if __name__ == "__main__":
+    print("Adding description_skills column to jobpost table...")
+    add_columns()
+    print("\n✅ Migration complete! Run reextract_skills.py --jobs-only to fill it.")
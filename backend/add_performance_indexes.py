@@ -0,0 +1,120 @@
+"""
+Add performance indexes and constraints to an existing PostgreSQL database.
+
+SQLModel.metadata.create_all() only creates indexes and constraints for new
+tables, so databases created before these were declared in models.py need
+this one-off migration. Every statement is idempotent.
+"""
+from app.database import engine
+from sqlalchemy import text
+
+
+def _unique_pair(table: str, name: str) -> list[str]:
+    """Drop duplicate (candidate_id, job_post_id) rows, keeping the oldest, then add the constraint."""
+    return [
+        f"""
+        DELETE FROM {table} a USING {table} b
+        WHERE a.candidate_id = b.candidate_id
+          AND a.job_post_id = b.job_post_id
+          AND a.id > b.id;
+        """,
+        f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{name}') THEN
+                ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE (candidate_id, job_post_id);
+            END IF;
+        END $$;
+        """,
+    ]
+
+
+STATEMENTS = [
+    # Team workload rollup (GET /jobs/team/workload)
+    """
+    CREATE INDEX IF NOT EXISTS ix_jobpost_company_creator_status
+    ON jobpost (company_id, created_by_user_id, status);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_jobpost_company_assignee_status
+    ON jobpost (company_id, assigned_to_user_id, status);
+    """,
+    # Keyset pagination on (created_at, id) style keys
+    """
+    CREATE INDEX IF NOT EXISTS ix_candidate_created_id
+    ON candidate (created_at, id);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_jobpost_status_created_id
+    ON jobpost (status, created_at, id);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_jobpost_company_created_id
+    ON jobpost (company_id, created_at, id);
+    """,
+    # Shortlist / likes ordered by when the like happened (replaces the created_at index)
+    """
+    DROP INDEX IF EXISTS ix_matchstate_recruiter_action_created_id;
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_matchstate_recruiter_action_at_id
+    ON matchstate (recruiter_action, (coalesce(recruiter_action_at, created_at)), id);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_matchstate_candidate_action_at_id
+    ON matchstate (candidate_id, candidate_action, (coalesce(candidate_action_at, created_at)), id);
+    """,
+    # Pending ask-to-apply invitations (expiry sweep, candidate inbox); older
+    # invitations were written without a status
+    """
+    UPDATE matchstate SET ask_to_apply_status = 'PENDING'
+    WHERE recruiter_action = 'ASK_TO_APPLY' AND ask_to_apply_status IS NULL AND NOT ask_to_apply_accepted;
+    """,
+    # Settle invitations the match has since moved past (as routers/matches.py now does)
+    """
+    UPDATE matchstate
+    SET ask_to_apply_status = CASE
+            WHEN recruiter_action <> 'ASK_TO_APPLY' THEN 'WITHDRAWN'
+            WHEN candidate_action = 'APPLY' THEN 'ACCEPTED'
+            ELSE 'DECLINED'
+        END,
+        ask_to_apply_accepted = (recruiter_action = 'ASK_TO_APPLY' AND candidate_action = 'APPLY')
+    WHERE ask_to_apply_status = 'PENDING'
+      AND (recruiter_action <> 'ASK_TO_APPLY' OR candidate_action IN ('APPLY', 'PASS'));
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_matchstate_pending_ask_expires
+    ON matchstate (ask_to_apply_expires_at)
+    WHERE ask_to_apply_status = 'PENDING';
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_matchstate_pending_ask_candidate
+    ON matchstate (candidate_id, (coalesce(ask_to_apply_sent_at, created_at)), id)
+    WHERE ask_to_apply_status = 'PENDING';
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_application_candidate_applied_id
+    ON application (candidate_id, applied_at, id);
+    """,
+    # Conflict targets for the match state / application upserts
+    *_unique_pair("matchstate", "uq_matchstate_candidate_job"),
+    *_unique_pair("application", "uq_application_candidate_job"),
+]
+
+
+def add_indexes():
+    with engine.connect() as conn:
+        try:
+            for statement in STATEMENTS:
+                conn.execute(text(statement))
+            conn.commit()
+            print(f"✅ Successfully applied {len(STATEMENTS)} statements")
+        except Exception as e:
+            print(f"❌ Error adding indexes: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    print("Adding performance indexes and constraints...")
+    add_indexes()
+    print("\n✅ Migration complete!")
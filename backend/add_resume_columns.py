@@ -0,0 +1,29 @@
+"""
+Add upload size and content hash columns to the resume table in PostgreSQL
+"""
+from app.database import engine
+from sqlalchemy import text
+
+def add_columns():
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("""
+                ALTER TABLE resume
+                ADD COLUMN IF NOT EXISTS size_bytes INTEGER,
+                ADD COLUMN IF NOT EXISTS content_hash VARCHAR;
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_resume_content_hash ON resume (content_hash);
+            """))
+            conn.commit()
+            print("✅ Successfully added columns:")
+            print("   - resume.size_bytes (INTEGER)")
+            print("   - resume.content_hash (VARCHAR, indexed)")
+        except Exception as e:
+            print(f"❌ Error adding columns: {e}")
+            raise
+
+if __name__ == "__main__":
+    print("Adding size/hash columns to resume table...")
+    add_columns()
+    print("\n✅ Migration complete!")
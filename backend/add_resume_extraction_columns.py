@@ -0,0 +1,47 @@
+"""
+Add text extraction columns to the resume table in PostgreSQL.
+
+Existing resumes start as 'pending', so the background extractor backfills them.
+"""
+from app.database import engine
+from sqlalchemy import text
+
+def add_columns():
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("""
+                ALTER TABLE resume
+                ADD COLUMN IF NOT EXISTS extraction_status VARCHAR NOT NULL DEFAULT 'pending',
+                ADD COLUMN IF NOT EXISTS extraction_attempts INTEGER NOT NULL DEFAULT 0,
+                ADD COLUMN IF NOT EXISTS extraction_due_at TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS extraction_error VARCHAR,
+                ADD COLUMN IF NOT EXISTS extracted_text VARCHAR,
+                ADD COLUMN IF NOT EXISTS text_stats VARCHAR,
+                ADD COLUMN IF NOT EXISTS extracted_at TIMESTAMP;
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_resume_extraction_status ON resume (extraction_status);
+            """))
+            # The extractor's queue scan only ever looks at unfinished rows
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_resume_extraction_queue ON resume (extraction_due_at, id)
+                WHERE extraction_status IN ('pending', 'processing');
+            """))
+            conn.commit()
+            print("✅ Successfully added columns:")
+            print("   - resume.extraction_status (VARCHAR, indexed, default 'pending')")
+            print("   - resume.extraction_attempts (INTEGER)")
+            print("   - resume.extraction_due_at (TIMESTAMP)")
+            print("   - resume.extraction_error (VARCHAR)")
+            print("   - resume.extracted_text (VARCHAR)")
+            print("   - resume.text_stats (VARCHAR, JSON)")
+            print("   - resume.extracted_at (TIMESTAMP)")
+            print("✅ Created partial index ix_resume_extraction_queue")
+        except Exception as e:
+            print(f"❌ Error adding columns: {e}")
+            raise
+
+if __name__ == "__main__":
+    print("Adding text extraction columns to resume table...")
+    add_columns()
+    print("\n✅ Migration complete! Existing resumes will be extracted in the background.")
@@ -0,0 +1,29 @@
+"""
+Add ETag version counters to the jobpost and candidate tables in PostgreSQL
+"""
+from app.database import engine
+from sqlalchemy import text
+
+def add_columns():
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("""
+                ALTER TABLE jobpost
+                ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+            """))
+            conn.execute(text("""
+                ALTER TABLE candidate
+                ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+            """))
+            conn.commit()
+            print("✅ Successfully added columns:")
+            print("   - jobpost.version (INTEGER)")
+            print("   - candidate.version (INTEGER)")
+        except Exception as e:
+            print(f"❌ Error adding columns: {e}")
+            raise
+
+if __name__ == "__main__":
+    print("Adding version columns to jobpost and candidate tables...")
+    add_columns()
+    print("\n✅ Migration complete!")
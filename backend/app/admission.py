@@ -0,0 +1,182 @@
+"""
+In-process admission control for expensive endpoints.
+
+Routes that scan the whole candidate or job pool declare a cost (ROUTE_COSTS)
+and add `Depends(admit("<route>"))`. Before the handler runs, the request takes
+`cost` tokens from its user's bucket and its company's bucket, then one slot of
+a global concurrency limit shared by all expensive routes. If any of these is
+exhausted, the request is rejected at once, either with 429 (rate) or 503
+(concurrency) plus Retry-After, instead of queueing for a worker. Cheap
+endpoints are never admitted here, so they stay responsive while expensive
+ones are shed.
+
+Limits are per worker process.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from fastapi import Depends, HTTPException, status
+
+from .security import get_current_user
+
+# Token buckets: capacity = burst size in cost units, refill = cost units per second
+USER_BUCKET_CAPACITY = float(os.getenv("APP_RATE_USER_CAPACITY", "40"))
+USER_BUCKET_REFILL = float(os.getenv("APP_RATE_USER_REFILL_PER_SEC", "0.5"))
+COMPANY_BUCKET_CAPACITY = float(os.getenv("APP_RATE_COMPANY_CAPACITY", "200"))
+COMPANY_BUCKET_REFILL = float(os.getenv("APP_RATE_COMPANY_REFILL_PER_SEC", "2"))
+# Expensive requests running at once across all expensive routes
+EXPENSIVE_MAX_CONCURRENCY = int(os.getenv("APP_EXPENSIVE_MAX_CONCURRENCY", "4"))
+# Idle buckets are forgotten beyond this many (an absent bucket is a full one)
+MAX_BUCKETS = int(os.getenv("APP_RATE_MAX_BUCKETS", "50000"))
+
+# Cost weights, roughly proportional to the work each route does per call
+ROUTE_COSTS = {
+    "jobs.recommendations_all": 10.0,  # every active job x every candidate
+    "jobs.recommendations_job": 4.0,   # one job x every candidate
+    "swipes.feed": 4.0,                # one job x every candidate, scored
+    "candidates.recommendations": 2.0, # one candidate x every active job
+    "candidates.role_fit_batch": 2.0,  # one role x every candidate, from the column snapshot
+}
+
+
+class TokenBucket:
+    """Classic token bucket; not thread-safe on its own (guarded by the module lock)."""
+
+    __slots__ = ("capacity", "refill_per_second", "tokens", "updated_at")
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, cost: float, now: float) -> float:
+        """Seconds until `cost` tokens are available (0 when they are now)."""
+        self._refill(now)
+        # A cost above capacity is admitted from a full bucket and leaves it in debt
+        needed = min(cost, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return math.inf
+        return (needed - self.tokens) / self.refill_per_second
+
+    def take(self, cost: float) -> None:
+        self.tokens -= cost
+
+    def give_back(self, cost: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + cost)
+
+
+_buckets: "OrderedDict[Hashable, TokenBucket]" = OrderedDict()
+_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(EXPENSIVE_MAX_CONCURRENCY)
+_stats = {"admitted": 0, "rate_limited": 0, "concurrency_rejected": 0, "in_flight": 0}
+
+
+def _bucket(key: Hashable, capacity: float, refill: float) -> TokenBucket:
+    bucket = _buckets.get(key)
+    if bucket is None:
+        bucket = _buckets[key] = TokenBucket(capacity, refill)
+        while len(_buckets) > MAX_BUCKETS:
+            _buckets.popitem(last=False)
+    else:
+        _buckets.move_to_end(key)
+    return bucket
+
+
+def _request_buckets(current_user: dict) -> list[TokenBucket]:
+    buckets = [_bucket(("user", current_user.get("user_id")), USER_BUCKET_CAPACITY, USER_BUCKET_REFILL)]
+    company_id = current_user.get("company_id")
+    if company_id is not None:
+        buckets.append(_bucket(("company", company_id), COMPANY_BUCKET_CAPACITY, COMPANY_BUCKET_REFILL))
+    return buckets
+
+
+def _retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds))) if math.isfinite(seconds) else "60"
+
+
+def try_admit(current_user: dict, cost: float) -> Optional[HTTPException]:
+    """
+    Take `cost` from the caller's buckets and a concurrency slot.
+
+    Returns None when admitted (the caller must release() afterwards), else the
+    429/503 error to raise. Nothing is consumed when the request is rejected.
+    """
+    with _lock:
+        buckets = _request_buckets(current_user)
+        now = time.monotonic()
+        wait = max(bucket.wait_time(cost, now) for bucket in buckets)
+        if wait > 0:
+            _stats["rate_limited"] += 1
+            return HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded for this endpoint, please retry later",
+                headers={"Retry-After": _retry_after(wait)},
+            )
+        for bucket in buckets:
+            bucket.take(cost)
+
+    if not _slots.acquire(blocking=False):
+        with _lock:
+            for bucket in buckets:
+                bucket.give_back(cost)
+            _stats["concurrency_rejected"] += 1
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy with other expensive requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    with _lock:
+        _stats["admitted"] += 1
+        _stats["in_flight"] += 1
+    return None
+
+
+def release() -> None:
+    """Return the concurrency slot taken by a successful try_admit()."""
+    with _lock:
+        _stats["in_flight"] -= 1
+    _slots.release()
+
+
+def admit(route: str):
+    """
+    Dependency factory: admission control for an expensive route named in ROUTE_COSTS.
+
+    Holds a concurrency slot while the handler runs.
+    """
+    cost = ROUTE_COSTS[route]
+
+    def admission(current_user: dict = Depends(get_current_user)):
+        error = try_admit(current_user, cost)
+        if error is not None:
+            raise error
+        try:
+            yield
+        finally:
+            release()
+
+    return admission
+
+
+def admission_stats() -> dict:
+    """Admission counters and limits for this worker process."""
+    with _lock:
+        return {
+            **_stats,
+            "max_concurrency": EXPENSIVE_MAX_CONCURRENCY,
+            "buckets": len(_buckets),
+            "route_costs": dict(ROUTE_COSTS),
+        }
@@ -0,0 +1,257 @@
+"""
+Time-bucketed analytics rollups.
+
+AnalyticsRollup holds hourly and daily counts of every funnel metric
+(match_events.FUNNEL_STAGES) per job, company and recruiter. A background
+thread folds new MatchEvent rows into it incrementally: it reads the events
+after the "match_events" RollupWatermark in id order, adds their counts with
+one multi-row upsert, and moves the watermark in the same transaction.
+
+Events are only rolled up once they are ROLLUP_SETTLE_SECONDS old. Ids are
+taken when a transaction inserts its events, not when it commits, so a newer id
+can become visible before an older one; waiting for the writer to commit keeps
+the watermark from stepping over an event that is not visible yet. A batch
+reads the next ids in order and stops at the first event that has not settled,
+since a lower id can carry a newer created_at than the ids after it.
+
+The watermark row is locked FOR UPDATE SKIP LOCKED, so any number of app
+workers can run the thread and only one of them rolls up at a time. Backfills
+(backfill_analytics.py) take the same lock.
+
+Rollups count events, not distinct candidates: a re-like in another week shows
+up in that week. FunnelCounter has the distinct all-time totals.
+"""
+
+import logging
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select
+
+from .database import engine
+from .match_events import event_stages
+from .models import AnalyticsRollup, MatchEvent, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_ENABLED = os.getenv("APP_ANALYTICS_ROLLUP_ENABLED", "1") != "0"
+ROLLUP_INTERVAL_SECONDS = float(os.getenv("APP_ANALYTICS_ROLLUP_INTERVAL", "60"))
+ROLLUP_BATCH_SIZE = int(os.getenv("APP_ANALYTICS_ROLLUP_BATCH_SIZE", "5000"))
+ROLLUP_SETTLE_SECONDS = 30
+# Rows per upsert statement
+UPSERT_CHUNK_SIZE = 1000
+
+WATERMARK = "match_events"
+GRAINS = ("hour", "day")
+
+# Columns of MatchEvent that rollup_increments() reads
+EVENT_COLUMNS = (
+    MatchEvent.id,
+    MatchEvent.created_at,
+    MatchEvent.actor,
+    MatchEvent.action,
+    MatchEvent.job_post_id,
+    MatchEvent.company_id,
+    MatchEvent.company_user_id,
+    MatchEvent.match_status,
+)
+
+
+def bucket_start(moment: datetime, grain: str) -> datetime:
+    """Start of the hour/day/week (Monday) containing `moment`."""
+    start = moment.replace(minute=0, second=0, microsecond=0)
+    if grain == "hour":
+        return start
+    start = start.replace(hour=0)
+    if grain == "week":
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def rollup_increments(events: Iterable[dict]) -> Counter:
+    """(grain, scope, scope_id, metric, bucket_start) -> count for a batch of events."""
+    increments = Counter()
+    for event in events:
+        stages = event_stages(event)
+        if not stages:
+            continue
+        scopes = [("job", event["job_post_id"]), ("company", event["company_id"])]
+        if event.get("company_user_id"):
+            scopes.append(("recruiter", event["company_user_id"]))
+        for grain in GRAINS:
+            bucket = bucket_start(event["created_at"], grain)
+            for scope, scope_id in scopes:
+                if scope_id is None:
+                    continue
+                for metric in stages:
+                    increments[(grain, scope, scope_id, metric, bucket)] += 1
+    return increments
+
+
+def apply_increments(session: Session, increments: Counter) -> int:
+    """Add counts to AnalyticsRollup (multi-row upserts, in key order). Returns rows touched."""
+    rows = [
+        {"grain": grain, "scope": scope, "scope_id": scope_id, "metric": metric, "bucket_start": bucket, "count": count}
+        for (grain, scope, scope_id, metric, bucket), count in sorted(increments.items())
+    ]
+    for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        statement = pg_insert(AnalyticsRollup).values(rows[offset:offset + UPSERT_CHUNK_SIZE])
+        session.exec(
+            statement.on_conflict_do_update(
+                index_elements=["grain", "scope", "scope_id", "metric", "bucket_start"],
+                set_={"count": AnalyticsRollup.count + statement.excluded["count"]},
+            )
+        )
+    return len(rows)
+
+
+def lock_watermark(session: Session, skip_locked: bool) -> Optional[RollupWatermark]:
+    """The watermark row, locked for this transaction (None if skip_locked and someone else holds it)."""
+    session.exec(pg_insert(RollupWatermark).values(name=WATERMARK, last_event_id=0).on_conflict_do_nothing())
+    return session.exec(
+        select(RollupWatermark)
+        .where(RollupWatermark.name == WATERMARK)
+        .with_for_update(skip_locked=skip_locked)
+    ).first()
+
+
+def roll_up_batch(session: Session, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """Fold the next settled events into the rollups and commit. Returns how many were folded."""
+    mark = lock_watermark(session, skip_locked=True)
+    if mark is None:
+        session.rollback()
+        return 0  # another worker is rolling up
+    now = datetime.utcnow()
+    settled_before = now - timedelta(seconds=ROLLUP_SETTLE_SECONDS)
+    rows = session.exec(
+        select(*EVENT_COLUMNS)
+        .where(MatchEvent.id > mark.last_event_id)
+        .order_by(MatchEvent.id)
+        .limit(batch_size)
+    ).all()
+    # Stop at the first unsettled event: the watermark must not pass it, even if
+    # later ids (written by other transactions) are already old enough
+    for position, row in enumerate(rows):
+        if row.created_at >= settled_before:
+            rows = rows[:position]
+            break
+    if not rows:
+        session.rollback()
+        return 0
+    apply_increments(session, rollup_increments(row._mapping for row in rows))
+    mark.last_event_id = rows[-1].id
+    mark.updated_at = now
+    session.add(mark)
+    session.commit()
+    return len(rows)
+
+
+def rebuild_rollups(session: Session, since: datetime, until: datetime) -> tuple[int, int]:
+    """
+    Recompute the buckets in [since, until) from the event log (both must be day starts).
+
+    Holds the watermark lock and only counts events the incremental roll-up has
+    already folded, so it never double counts with the background thread.
+    Commits; returns (events read, rollup rows written).
+    """
+    mark = lock_watermark(session, skip_locked=False)
+    session.exec(
+        delete(AnalyticsRollup).where(AnalyticsRollup.bucket_start >= since, AnalyticsRollup.bucket_start < until)
+    )
+    events = written = 0
+    last_id = 0
+    while True:
+        rows = session.exec(
+            select(*EVENT_COLUMNS)
+            .where(
+                MatchEvent.id > last_id,
+                MatchEvent.id <= mark.last_event_id,
+                MatchEvent.created_at >= since,
+                MatchEvent.created_at < until,
+            )
+            .order_by(MatchEvent.id)
+            .limit(ROLLUP_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        written += apply_increments(session, rollup_increments(row._mapping for row in rows))
+        events += len(rows)
+        last_id = rows[-1].id
+    session.commit()
+    return events, written
+
+
+class AnalyticsRollupWorker:
+    """Background thread running roll_up_batch() until caught up, then every interval."""
+
+    def __init__(self, interval: float = ROLLUP_INTERVAL_SECONDS):
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self.stats = {"events": 0, "batches": 0, "errors": 0, "last_run_at": None}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="analytics-rollup", daemon=True)
+        self._thread.start()
+        logger.info(f"[ANALYTICS] Rollup worker started (every {self.interval:.0f}s)")
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"[ANALYTICS] Rollup failed: {e}", exc_info=True)
+            self._stopping.wait(self.interval)
+
+    def run_once(self) -> int:
+        folded = 0
+        with Session(engine) as session:
+            while not self._stopping.is_set():
+                count = roll_up_batch(session)
+                if count:
+                    folded += count
+                    self.stats["batches"] += 1
+                if count < ROLLUP_BATCH_SIZE:
+                    break
+        self.stats["events"] += folded
+        self.stats["last_run_at"] = datetime.utcnow().isoformat()
+        if folded:
+            logger.info(f"[ANALYTICS] Rolled up {folded} events")
+        return folded
+
+
+_worker: Optional[AnalyticsRollupWorker] = None
+
+
+def start_analytics_rollup() -> None:
+    """Start this process's rollup worker (called on app startup)."""
+    global _worker
+    if not ROLLUP_ENABLED or _worker is not None:
+        return
+    _worker = AnalyticsRollupWorker()
+    _worker.start()
+
+
+def stop_analytics_rollup() -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
+
+
+def analytics_rollup_stats() -> dict:
+    return {"enabled": _worker is not None, **(_worker.stats if _worker else {})}
@@ -0,0 +1,156 @@
+"""
+Scheduled expiry of ask-to-apply invitations.
+
+A background thread expires due invitations in batches: each batch is one
+UPDATE ... WHERE id IN (due PENDING rows, oldest expiry first, FOR UPDATE SKIP
+LOCKED) ... RETURNING, followed by EXPIRE_ASK match events, in one transaction.
+Only the invitation is expired; the match status moves to EXPIRED only while
+the match is still OPEN. Invitations the match has moved past (candidate
+applied or passed, recruiter liked or passed) are settled by those actions in
+routers/matches.py and are no longer PENDING.
+
+The due rows are found through the partial index on pending expiries, so a
+sweep costs the same however many answered or expired invitations exist, and
+the PENDING set the candidate inbox reads stays small.
+
+SKIP LOCKED lets every app worker run the thread (and lets a sweep pass over a
+row a candidate is answering right now). respond_to_ask expires a single
+invitation through the same function when it is answered after its expiry but
+before the next sweep.
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import case, update
+from sqlmodel import Session, select
+
+from .database import engine
+from .match_events import match_event, record_match_events
+from .models import MatchState
+
+logger = logging.getLogger(__name__)
+
+ASK_EXPIRY_ENABLED = os.getenv("APP_ASK_EXPIRY_ENABLED", "1") != "0"
+ASK_EXPIRY_INTERVAL_SECONDS = float(os.getenv("APP_ASK_EXPIRY_INTERVAL", "60"))
+ASK_EXPIRY_BATCH_SIZE = int(os.getenv("APP_ASK_EXPIRY_BATCH_SIZE", "500"))
+
+
+def expire_due_asks(
+    session: Session,
+    now: datetime,
+    limit: int = ASK_EXPIRY_BATCH_SIZE,
+    match_state_ids: Optional[Iterable[int]] = None,
+) -> list[tuple[int, int, int]]:
+    """
+    Expire up to `limit` pending invitations due at `now` (optionally only the given
+    match states) and record their events. Returns (id, candidate_id, job_post_id)
+    of each expired row; the caller commits.
+    """
+    due = (
+        select(MatchState.id)
+        .where(
+            MatchState.ask_to_apply_status == "PENDING",
+            MatchState.recruiter_action == "ASK_TO_APPLY",
+            MatchState.ask_to_apply_expires_at <= now,
+        )
+        .order_by(MatchState.ask_to_apply_expires_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if match_state_ids is not None:
+        due = due.where(MatchState.id.in_(list(match_state_ids)))
+    expired = session.exec(
+        update(MatchState)
+        .where(MatchState.id.in_(due.scalar_subquery()))
+        .values(
+            ask_to_apply_status="EXPIRED",
+            # Only a match still waiting on the invitation expires with it
+            status=case((MatchState.status == "OPEN", "EXPIRED"), else_=MatchState.status),
+            updated_at=now,
+        )
+        .returning(MatchState.id, MatchState.candidate_id, MatchState.job_post_id, MatchState.status)
+        .execution_options(synchronize_session=False)
+    ).all()
+    record_match_events(session, [
+        match_event("system", "EXPIRE_ASK", candidate_id, job_id, match_status=match_status)
+        for _, candidate_id, job_id, match_status in expired
+    ])
+    return [tuple(row[:3]) for row in expired]
+
+
+class AskExpiryWorker:
+    """Background thread sweeping due invitations until none are left, then every interval."""
+
+    def __init__(self, interval: float = ASK_EXPIRY_INTERVAL_SECONDS, batch_size: int = ASK_EXPIRY_BATCH_SIZE):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self.stats = {"expired": 0, "sweeps": 0, "errors": 0, "last_sweep_at": None}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="ask-expiry", daemon=True)
+        self._thread.start()
+        logger.info(f"[ASK_EXPIRY] Sweeper started (every {self.interval:.0f}s)")
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"[ASK_EXPIRY] Sweep failed: {e}", exc_info=True)
+            self._stopping.wait(self.interval)
+
+    def sweep(self) -> int:
+        """Expire everything due now, one batch per transaction. Returns how many were expired."""
+        now = datetime.utcnow()
+        total = 0
+        with Session(engine) as session:
+            while not self._stopping.is_set():
+                expired = expire_due_asks(session, now, self.batch_size)
+                session.commit()
+                total += len(expired)
+                if len(expired) < self.batch_size:
+                    break
+        self.stats["expired"] += total
+        self.stats["sweeps"] += 1
+        self.stats["last_sweep_at"] = now.isoformat()
+        if total:
+            logger.info(f"[ASK_EXPIRY] Expired {total} invitations")
+        return total
+
+
+_worker: Optional[AskExpiryWorker] = None
+
+
+def start_ask_expiry() -> None:
+    """Start this process's expiry sweeper (called on app startup)."""
+    global _worker
+    if not ASK_EXPIRY_ENABLED or _worker is not None:
+        return
+    _worker = AskExpiryWorker()
+    _worker.start()
+
+
+def stop_ask_expiry() -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
+
+
+def ask_expiry_stats() -> dict:
+    return {"enabled": _worker is not None, **(_worker.stats if _worker else {})}
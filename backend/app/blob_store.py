@@ -0,0 +1,247 @@
+"""
+Content-addressed, deduplicated storage for uploaded resume files.
+
+Each distinct file is stored once under its SHA-256, sharded two levels deep
+(blobs/ab/cd/abcd...) so no directory grows huge. Uploads stream into
+blobs/tmp and are moved into place with an atomic rename; identical uploads
+reuse the existing blob. ResumeBlob.ref_count counts the Resume rows pointing
+at a blob, and the file is removed when the last one is deleted.
+
+Reference counts change in the caller's transaction; the files follow only once
+it has committed (session after_commit / after_rollback hooks, as in
+match_events). A committed upload moves its temp file into place, a rolled back
+one just deletes it, so a failed commit leaves neither an orphan blob nor a
+Resume without its file. Releasing the last reference leaves the row at
+ref_count 0; after the commit a short transaction deletes it, and unlinks the
+file, only if it is still unreferenced, holding the row lock while it does. A
+concurrent upload of the same bytes either re-references the row first or waits
+for the delete, so it never loses its file.
+
+serve_file() answers downloads with ETag/If-None-Match (304), single-range
+requests (206/416, honouring If-Range) and, for whole files, FileResponse,
+which lets servers that support it send the file zero-copy. With
+APP_BLOB_ACCEL_REDIRECT_PREFIX set, the body is left to a fronting nginx via
+X-Accel-Redirect, which serves it with sendfile and handles ranges itself.
+"""
+
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import quote
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import delete, event as sa_event, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+
+from .database import engine
+from .etags import etag_matches
+from .models import ResumeBlob
+
+logger = logging.getLogger(__name__)
+
+BLOB_ROOT = Path(os.getenv("APP_BLOB_DIR", str(Path(__file__).resolve().parent / "uploads" / "blobs")))
+# Uploads in progress; inside BLOB_ROOT so the final rename never crosses filesystems
+BLOB_TMP_DIR = BLOB_ROOT / "tmp"
+BLOB_TMP_DIR.mkdir(parents=True, exist_ok=True)
+
+# Internal nginx location mapped to BLOB_ROOT (e.g. "/_blobs"); unset = serve from Python
+ACCEL_REDIRECT_PREFIX = os.getenv("APP_BLOB_ACCEL_REDIRECT_PREFIX")
+
+# Bytes read per step when streaming a byte range
+RANGE_CHUNK_BYTES = 256 * 1024
+
+
+def blob_relpath(content_hash: str) -> str:
+    return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+
+def blob_path(content_hash: str) -> Path:
+    return BLOB_ROOT / blob_relpath(content_hash)
+
+
+# session.info keys: uploads to move into place / hashes to purge once the transaction commits
+PENDING_BLOBS_KEY = "blob_store_pending_blobs"
+RELEASED_BLOBS_KEY = "blob_store_released_blobs"
+
+
+def add_blob_reference(session: Session, temp_path: str, content_hash: str, size: int) -> Path:
+    """
+    Count one more reference to a blob and return the path its file will have.
+
+    temp_path (a finished upload in BLOB_TMP_DIR) is renamed into place after the
+    caller commits when the blob is new, and deleted otherwise (or on rollback).
+    """
+    session.info.setdefault(PENDING_BLOBS_KEY, []).append((temp_path, content_hash))
+    session.exec(
+        pg_insert(ResumeBlob)
+        .values(content_hash=content_hash, size_bytes=size, ref_count=1, created_at=datetime.utcnow())
+        .on_conflict_do_update(
+            index_elements=[ResumeBlob.content_hash],
+            set_={"ref_count": ResumeBlob.ref_count + 1}
+        )
+    )
+    return blob_path(content_hash)
+
+
+def release_blob_reference(session: Session, content_hash: str) -> None:
+    """Drop one reference; the last one has the blob purged after the caller commits."""
+    remaining = session.exec(
+        update(ResumeBlob)
+        .where(ResumeBlob.content_hash == content_hash)
+        .values(ref_count=ResumeBlob.ref_count - 1)
+        .returning(ResumeBlob.ref_count)
+    ).scalar()
+    if remaining is not None and remaining <= 0:
+        session.info.setdefault(RELEASED_BLOBS_KEY, set()).add(content_hash)
+
+
+def purge_unreferenced_blob(content_hash: str) -> bool:
+    """Delete a blob row and its file if nothing references it any more. Returns whether it did."""
+    with Session(engine) as session:
+        purged = session.exec(
+            delete(ResumeBlob)
+            .where(ResumeBlob.content_hash == content_hash, ResumeBlob.ref_count <= 0)
+            .returning(ResumeBlob.content_hash)
+        ).first()
+        if purged:
+            # Still under the row lock: an upload of the same bytes waits for this commit
+            blob_path(content_hash).unlink(missing_ok=True)
+        session.commit()
+    return purged is not None
+
+
+@sa_event.listens_for(OrmSession, "after_commit")
+def apply_committed_blob_changes(session):
+    for temp_path, content_hash in session.info.pop(PENDING_BLOBS_KEY, ()):
+        path = blob_path(content_hash)
+        try:
+            if path.exists():
+                os.unlink(temp_path)
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(temp_path, path)
+        except OSError as e:
+            logger.error(f"[BLOB_STORE] Storing blob {content_hash[:12]} failed: {e}", exc_info=True)
+    for content_hash in session.info.pop(RELEASED_BLOBS_KEY, ()):
+        try:
+            purge_unreferenced_blob(content_hash)
+        except Exception as e:
+            logger.error(f"[BLOB_STORE] Purging blob {content_hash[:12]} failed: {e}", exc_info=True)
+
+
+@sa_event.listens_for(OrmSession, "after_rollback")
+def discard_rolled_back_blob_changes(session):
+    for temp_path, _ in session.info.pop(PENDING_BLOBS_KEY, ()):
+        Path(temp_path).unlink(missing_ok=True)
+    session.info.pop(RELEASED_BLOBS_KEY, None)
+
+
+def is_blob(path: Path) -> bool:
+    return BLOB_ROOT in path.parents
+
+
+def _content_disposition(filename: str) -> str:
+    fallback = filename.encode("ascii", "ignore").decode() or "download"
+    fallback = fallback.replace('"', "")
+    return f"attachment; filename=\"{fallback}\"; filename*=utf-8''{quote(filename)}"
+
+
+def parse_range(range_header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into inclusive (start, end).
+
+    Returns None for headers we serve in full instead (other units, multiple
+    ranges, malformed values); raises 416 when the range lies outside the file.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start = max(0, size - int(last))
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end and first and last:
+        return None
+    if start >= size or size == 0:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
+
+
+def _iter_range(path: Path, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(RANGE_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_file(
+    path: Path,
+    filename: str,
+    media_type: Optional[str],
+    content_hash: Optional[str] = None,
+    range_header: Optional[str] = None,
+    if_range: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+) -> Response:
+    """Download response for a stored file with conditional and range support."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume file not found on disk"
+        )
+
+    # Content-addressed blobs never change, so the hash is a strong validator
+    etag = f'"{content_hash}"' if content_hash else f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = media_type or "application/octet-stream"
+    headers["Content-Disposition"] = _content_disposition(filename)
+
+    if ACCEL_REDIRECT_PREFIX and is_blob(path):
+        headers["X-Accel-Redirect"] = f"{ACCEL_REDIRECT_PREFIX.rstrip('/')}/{path.relative_to(BLOB_ROOT).as_posix()}"
+        return Response(headers=headers, media_type=media_type)
+
+    byte_range = None
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = parse_range(range_header, stat.st_size)
+
+    if byte_range is None:
+        return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _iter_range(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
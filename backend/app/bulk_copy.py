@@ -0,0 +1,97 @@
+"""
+PostgreSQL COPY helpers for bulk loads.
+
+Rows are pulled lazily from a generator, CSV-encoded in chunks and streamed
+into COPY ... FROM STDIN on the session's connection, so loading millions of
+rows costs one statement and flat memory. Used by the job importer and the
+synthetic data generator.
+"""
+
+import csv
+import io
+from typing import Iterable, Iterator, Sequence
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+# Rows encoded per chunk handed to COPY
+COPY_CHUNK_ROWS = 1000
+
+
+class _ChunkReader:
+    """File-like adapter letting COPY pull text from a generator of chunks."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _csv_chunks(rows: Iterable[Sequence], chunk_rows: int) -> Iterator[str]:
+    """CSV-encode rows; None becomes an empty unquoted field, which COPY reads as NULL."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+    for row in rows:
+        writer.writerow(["" if value is None else value for value in row])
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def copy_rows(
+    session: Session,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    chunk_rows: int = COPY_CHUNK_ROWS
+) -> int:
+    """
+    COPY rows (tuples ordered like `columns`) into `table` within the session's transaction.
+
+    Returns the number of rows copied. The caller commits.
+    """
+    copied = 0
+
+    def counted():
+        nonlocal copied
+        for row in rows:
+            copied += 1
+            yield row
+
+    copy_sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = session.connection().connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(copy_sql, _ChunkReader(_csv_chunks(counted(), chunk_rows)))
+    finally:
+        cursor.close()
+    return copied
+
+
+def next_id(session: Session, table: str) -> int:
+    """First free primary key in `table` (rows copied with explicit ids start here)."""
+    return session.exec(text(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")).scalar_one()
+
+
+def sync_id_sequence(session: Session, table: str) -> None:
+    """Move the table's id sequence past explicitly copied ids so ORM inserts keep working."""
+    session.exec(text(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), false)"
+    ))
@@ -28,6 +28,7 @@ def init_db():
         Skill,
         Certification,
         Resume,
+        ResumeBlob,
         Candidate,
         CandidateJobPreference,
         SocialLink,
@@ -39,6 +40,14 @@ def init_db():
         Application,
         # Match system
         MatchState,
+        MatchEvent,
+        MatchFunnelStage,
+        CompanyFunnelStage,
+        FunnelCounter,
+        AnalyticsRollup,
+        RollupWatermark,
+        # ETags
+        ChangeSequence,
         # Ontology
         ProductAuthor,
         Product,
@@ -51,3 +60,14 @@ def init_db():
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+def iter_with_session(producer, *args, **kwargs):
+    """
+    Run a row-producing generator inside its own session.
+
+    Streamed responses are consumed after the request's get_session dependency
+    has closed, so their producers must own a session for the whole stream.
+    """
+    with Session(engine) as session:
+        yield from producer(session, *args, **kwargs)
@@ -0,0 +1,45 @@
+"""
+ETag / conditional GET helpers.
+
+ETags are derived from cheap version lookups (an entity's version counter, a
+collection's change sequence, or an ontology file's stat) so a
+matching If-None-Match can be answered with 304 before the entity is loaded
+or serialized.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the values that determine a response body."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches etag (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Attach an ETag header to a response."""
+    response.headers["ETag"] = etag
+    return response
@@ -0,0 +1,141 @@
+"""
+Sparse fieldsets (`fields=` query parameter) for list endpoints.
+
+Card and list views usually render a handful of attributes. When a client
+asks for `fields=id,title,location`, the query selects only those columns
+(plus the pagination key) and nested collections are loaded only if named,
+so DB I/O, serialization time and payload size all shrink with the request.
+"""
+
+import json
+from typing import Any, Iterable, Optional
+
+from fastapi import HTTPException, status
+
+from .models import Candidate, JobPost
+from .schemas import CandidateReadWithPreferences, JobPostRead
+
+# Columns always read so keyset pagination can build the next cursor
+KEY_COLUMNS = ("id", "created_at")
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[list[str]]:
+    """
+    Parse a comma-separated `fields` parameter.
+
+    Returns None when no projection was requested (full objects), otherwise the
+    requested field names in order. Unknown names are rejected with 400.
+    """
+    if fields is None:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    if not requested:
+        return None
+    allowed = set(allowed)
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}"
+        )
+    return list(dict.fromkeys(requested))
+
+
+def _columns_for(model, fields: list[str]) -> list:
+    """Model columns backing the requested fields, plus the pagination key."""
+    table_columns = model.__table__.columns.keys()
+    names = list(dict.fromkeys([*KEY_COLUMNS, *(f for f in fields if f in table_columns)]))
+    return [getattr(model, name) for name in names]
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+# ============================================================================
+# JOB POSTS
+# ============================================================================
+
+def job_post_fields(with_creator: bool = False, with_assignee: bool = False) -> tuple[str, ...]:
+    """
+    JobPostRead fields a job endpoint may project. Takes the endpoint's job_post_read
+    flags, so created_by_user_id / assigned_to_user_id are only projectable where
+    the full response includes them.
+    """
+    hidden = set()
+    if not with_creator:
+        hidden.add("created_by_user_id")
+    if not with_assignee:
+        hidden.add("assigned_to_user_id")
+    return tuple(name for name in JobPostRead.model_fields if name not in hidden)
+
+
+# Fields of endpoints rendering plain job_post_read(job)
+JOB_POST_FIELDS = job_post_fields()
+
+# JobPost columns stored in a different shape than JobPostRead exposes
+_JOB_POST_CONVERTERS = {
+    "required_skills": lambda value: json.loads(value or "[]"),
+    "nice_to_have_skills": lambda value: json.loads(value or "[]"),
+    "description_skills": lambda value: json.loads(value or "[]"),
+    "start_date": _isoformat,
+    "created_at": lambda value: value.isoformat(),
+    "updated_at": lambda value: value.isoformat(),
+}
+
+
+def job_post_columns(fields: list[str]) -> list:
+    """JobPost columns to select for a job fieldset."""
+    return _columns_for(JobPost, fields)
+
+
+def project_job_post(row: Any, fields: list[str]) -> dict:
+    """Render a projected JobPost row as a dict holding only the requested JobPostRead fields."""
+    result = {}
+    for name in fields:
+        value = getattr(row, name, None)
+        converter = _JOB_POST_CONVERTERS.get(name)
+        result[name] = converter(value) if converter else value
+    return result
+
+
+# ============================================================================
+# CANDIDATES
+# ============================================================================
+
+CANDIDATE_FIELDS = tuple(CandidateReadWithPreferences.model_fields)
+
+# Nested collections, loaded with one batched query each only when requested
+CANDIDATE_NESTED_FIELDS = ("skills", "job_preferences")
+
+# Defaults applied by the full CandidateReadWithPreferences builder, kept identical here
+_CANDIDATE_DEFAULTS = {
+    "name": "",
+    "email": "",
+    "location": "",
+    "summary": "",
+    "years_experience": 0,
+    "work_type": "",
+    "availability": "",
+}
+
+
+def candidate_columns(fields: list[str]) -> list:
+    """Candidate columns to select for a candidate fieldset."""
+    return _columns_for(Candidate, fields)
+
+
+def project_candidate(row: Any, fields: list[str]) -> dict:
+    """Render the scalar part of a projected Candidate row; nested fields are filled by the caller."""
+    result = {}
+    for name in fields:
+        if name in CANDIDATE_NESTED_FIELDS:
+            continue
+        if name == "status":
+            result[name] = "active"
+            continue
+        value = getattr(row, name, None)
+        if not value and name in _CANDIDATE_DEFAULTS:
+            value = _CANDIDATE_DEFAULTS[name]
+        result[name] = value
+    return result
@@ -16,7 +16,10 @@ load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 logger.info("Environment variables loaded")
 
 from .database import init_db
-from .routers import candidates, job_roles, auth, company, jobs, swipes, preferences, matches
+from .resume_extraction import start_resume_extraction, stop_resume_extraction
+from .analytics import start_analytics_rollup, stop_analytics_rollup
+from .ask_expiry import start_ask_expiry, stop_ask_expiry
+from .routers import candidates, job_roles, auth, company, jobs, swipes, preferences, matches, analytics, events, ops
 
 logger.info("Routers imported successfully")
 
@@ -56,6 +59,16 @@ def on_startup():
     logger.info("=== APPLICATION STARTUP ===")
     init_db()
     logger.info("Database initialized successfully")
+    start_resume_extraction()
+    start_analytics_rollup()
+    start_ask_expiry()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_resume_extraction()
+    stop_analytics_rollup()
+    stop_ask_expiry()
 
 
 @app.get("/")
@@ -76,4 +89,7 @@ app.include_router(company.router)
 app.include_router(jobs.router)
 app.include_router(swipes.router)
 app.include_router(matches.router)
+app.include_router(analytics.router)
+app.include_router(events.router)
+app.include_router(ops.router)
 app.include_router(job_roles.router)
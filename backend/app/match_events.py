@@ -0,0 +1,206 @@
+"""
+Match event log and funnel counters.
+
+Every match action (routers/matches.py, routers/swipes.py) appends a compact
+MatchEvent row, and the funnel stages it reaches are counted per job and per
+company in FunnelCounter, in the caller's transaction. Analytics then read a
+handful of counter rows instead of aggregating MatchState/Application.
+
+Counters count candidates, not clicks: a job counts a candidate once per stage,
+the first time the pair gets there (MatchFunnelStage, insert ON CONFLICT DO
+NOTHING), and a company counts a candidate once per stage across all of its
+jobs (CompanyFunnelStage, same way). A candidate who applies twice, or a
+recruiter re-liking a candidate, adds an event but leaves the counters alone;
+one candidate applying to three jobs of a company adds 1 to each job and 1 to
+the company.
+
+Once the transaction commits, the events are pushed to connected clients
+(push.publish_match_events); a rolled back transaction pushes nothing.
+
+Counter rows are hot (every action of a company bumps its company rows), so
+they are upserted in a fixed order to avoid deadlocks between concurrent
+transactions, and only after the event and stage inserts.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import event as sa_event, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+
+from .models import CompanyFunnelStage, FunnelCounter, JobPost, MatchEvent, MatchFunnelStage
+from .push import publish_match_events
+
+logger = logging.getLogger(__name__)
+
+# Funnel stages, in display order
+FUNNEL_STAGES = (
+    "candidate_liked",
+    "candidate_passed",
+    "shortlisted",
+    "recruiter_passed",
+    "asked_to_apply",
+    "ask_accepted",
+    "ask_declined",
+    "ask_expired",
+    "applied",
+    "matched",
+)
+
+# (actor, action) -> stages reached
+EVENT_STAGES = {
+    ("candidate", "LIKE"): ("candidate_liked",),
+    ("candidate", "PASS"): ("candidate_passed",),
+    ("candidate", "APPLY"): ("applied",),
+    ("candidate", "ACCEPT_ASK"): ("ask_accepted", "applied"),
+    ("candidate", "DECLINE_ASK"): ("ask_declined",),
+    ("recruiter", "LIKE"): ("shortlisted",),
+    ("recruiter", "PASS"): ("recruiter_passed",),
+    ("recruiter", "ASK_TO_APPLY"): ("asked_to_apply",),
+    ("system", "EXPIRE_ASK"): ("ask_expired",),
+}
+
+
+def match_event(
+    actor: str,
+    action: str,
+    candidate_id: int,
+    job_post_id: int,
+    company_id: Optional[int] = None,
+    company_user_id: Optional[int] = None,
+    match_status: Optional[str] = None,
+) -> dict:
+    """One event for record_match_events(); company_id is looked up from the job when omitted."""
+    return {
+        "actor": actor,
+        "action": action,
+        "candidate_id": candidate_id,
+        "job_post_id": job_post_id,
+        "company_id": company_id,
+        "company_user_id": company_user_id,
+        "match_status": match_status,
+    }
+
+
+def event_stages(event: dict) -> tuple[str, ...]:
+    stages = EVENT_STAGES.get((event["actor"], event["action"]), ())
+    if event.get("match_status") == "MATCHED":
+        stages += ("matched",)
+    return stages
+
+
+def record_match_events(session: Session, events: Iterable[dict]) -> None:
+    """
+    Append events and count the funnel stages they reach for the first time.
+
+    At most four statements for any number of events (event insert, job and
+    company stage inserts, counter upsert), plus a company lookup for events without
+    company_id. Does not commit: the caller's commit covers the match change,
+    its events and the counters together, and then pushes the events.
+    """
+    events = list(events)
+    if not events:
+        return
+
+    missing = {event["job_post_id"] for event in events if event["company_id"] is None}
+    if missing:
+        companies = dict(session.exec(
+            select(JobPost.id, JobPost.company_id).where(JobPost.id.in_(missing))
+        ).all())
+        events = [
+            {**event, "company_id": companies.get(event["job_post_id"])}
+            if event["company_id"] is None else event
+            for event in events
+        ]
+
+    now = datetime.utcnow()
+    events = [{**event, "created_at": now} for event in events]
+    session.exec(insert(MatchEvent).values(events))
+    session.info.setdefault(PENDING_PUSH_KEY, []).extend(events)
+
+    # Pairs reaching a stage for the first time, in one insert
+    company_of = {}
+    stage_rows = {}
+    for event in events:
+        company_of[event["job_post_id"]] = event["company_id"]
+        for stage in event_stages(event):
+            key = (event["job_post_id"], event["candidate_id"], stage)
+            stage_rows[key] = {
+                "job_post_id": key[0], "candidate_id": key[1], "stage": stage, "reached_at": now,
+            }
+    if not stage_rows:
+        return
+    reached = session.exec(
+        pg_insert(MatchFunnelStage)
+        .values(list(stage_rows.values()))
+        .on_conflict_do_nothing()
+        .returning(MatchFunnelStage.job_post_id, MatchFunnelStage.candidate_id, MatchFunnelStage.stage)
+    ).all()
+    if not reached:
+        return
+
+    increments = Counter()
+    company_rows = {}
+    for job_id, candidate_id, stage in reached:
+        increments[("job", job_id, stage)] += 1
+        company_id = company_of.get(job_id)
+        # A company's first time for a candidate is always some job's first time too
+        if company_id is not None:
+            company_rows[(company_id, candidate_id, stage)] = {
+                "company_id": company_id, "candidate_id": candidate_id, "stage": stage, "reached_at": now,
+            }
+    if company_rows:
+        for company_id, stage in session.exec(
+            pg_insert(CompanyFunnelStage)
+            .values(list(company_rows.values()))
+            .on_conflict_do_nothing()
+            .returning(CompanyFunnelStage.company_id, CompanyFunnelStage.stage)
+        ).all():
+            increments[("company", company_id, stage)] += 1
+    statement = pg_insert(FunnelCounter).values([
+        {"scope": scope, "scope_id": scope_id, "stage": stage, "count": count, "updated_at": now}
+        for (scope, scope_id, stage), count in sorted(increments.items())
+    ])
+    session.exec(
+        statement.on_conflict_do_update(
+            index_elements=["scope", "scope_id", "stage"],
+            set_={"count": FunnelCounter.count + statement.excluded["count"], "updated_at": now},
+        )
+    )
+
+
+PENDING_PUSH_KEY = "match_events_pending_push"
+
+
+@sa_event.listens_for(OrmSession, "after_commit")
+def push_committed_match_events(session):
+    events = session.info.pop(PENDING_PUSH_KEY, None)
+    if events:
+        try:
+            publish_match_events(events)
+        except Exception as e:
+            logger.error(f"[PUSH] Publishing {len(events)} match events failed: {e}", exc_info=True)
+
+
+@sa_event.listens_for(OrmSession, "after_rollback")
+def drop_rolled_back_match_events(session):
+    session.info.pop(PENDING_PUSH_KEY, None)
+
+
+def funnel_counts(session: Session, scope: str, scope_ids: Iterable[int]) -> dict[int, dict[str, int]]:
+    """scope_id -> {stage: candidates} for every FUNNEL_STAGES entry (missing counters are 0)."""
+    scope_ids = list(scope_ids)
+    counts = {scope_id: dict.fromkeys(FUNNEL_STAGES, 0) for scope_id in scope_ids}
+    if scope_ids:
+        rows = session.exec(
+            select(FunnelCounter.scope_id, FunnelCounter.stage, FunnelCounter.count)
+            .where(FunnelCounter.scope == scope, FunnelCounter.scope_id.in_(scope_ids))
+        ).all()
+        for scope_id, stage, count in rows:
+            if stage in counts[scope_id]:
+                counts[scope_id][stage] = count
+    return counts
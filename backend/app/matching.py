@@ -11,6 +11,7 @@ Formula:
 Final Score: 0-100
 """
 
+import json
 from typing import Optional, List
 from sqlmodel import Session, select
 from .models import Candidate, JobPost, Skill
@@ -175,10 +176,28 @@ def calculate_availability_fit(
     return cand_days <= req_days
 
 
+def parse_job_skills(job_post: JobPost) -> tuple[list, list]:
+    """Parse a job's required and nice-to-have skills (stored as JSON strings)."""
+    required_skills = []
+    nice_to_have = []
+    
+    try:
+        if job_post.required_skills:
+            required_skills = json.loads(job_post.required_skills) if isinstance(job_post.required_skills, str) else job_post.required_skills
+        if job_post.nice_to_have_skills:
+            nice_to_have = json.loads(job_post.nice_to_have_skills) if isinstance(job_post.nice_to_have_skills, str) else job_post.nice_to_have_skills
+    except:
+        pass
+    
+    return required_skills, nice_to_have
+
+
 def calculate_match_score(
     candidate: Candidate,
     job_post: JobPost,
-    session: Optional[Session] = None
+    session: Optional[Session] = None,
+    candidate_skills: Optional[List[str]] = None,
+    job_skills: Optional[tuple[list, list]] = None
 ) -> dict:
     """
     Calculate overall match score (0-100) and explanation.
@@ -189,26 +208,19 @@ def calculate_match_score(
     - Location Fit: 15%
     - Rate Fit: 10%
     - Availability: 5%
+    
+    candidate_skills / job_skills may be passed in pre-loaded (see calculate_match_scores);
+    otherwise skills are queried through `session` and the job's JSON is parsed here.
     """
     
     # Extract candidate skills
-    candidate_skills = []
-    if session:
-        skills = session.exec(select(Skill).where(Skill.candidate_id == candidate.id)).all()
-        candidate_skills = [s.name for s in skills]
+    if candidate_skills is None:
+        candidate_skills = []
+        if session:
+            skills = session.exec(select(Skill).where(Skill.candidate_id == candidate.id)).all()
+            candidate_skills = [s.name for s in skills]
     
-    # Parse job requirements (stored as JSON strings)
-    import json
-    required_skills = []
-    nice_to_have = []
-    
-    try:
-        if job_post.required_skills:
-            required_skills = json.loads(job_post.required_skills) if isinstance(job_post.required_skills, str) else job_post.required_skills
-        if job_post.nice_to_have_skills:
-            nice_to_have = json.loads(job_post.nice_to_have_skills) if isinstance(job_post.nice_to_have_skills, str) else job_post.nice_to_have_skills
-    except:
-        pass
+    required_skills, nice_to_have = job_skills if job_skills is not None else parse_job_skills(job_post)
     
     # Calculate component scores
     skill_score, matched_skills, missing_skills = calculate_skill_overlap_score(
@@ -263,3 +275,36 @@ def calculate_match_score(
         "matched_skills": matched_skills,
         "missing_skills": missing_skills,
     }
+
+
+def calculate_match_scores(
+    pairs: List[tuple[Candidate, JobPost]],
+    session: Session
+) -> List[dict]:
+    """
+    Score many (candidate, job) pairs at once.
+    
+    Loads every candidate's skills with one query and parses each job's skill JSON
+    once, then applies calculate_match_score() per pair. Results follow `pairs` order.
+    """
+    candidate_ids = {candidate.id for candidate, _ in pairs}
+    skills_by_candidate: dict[int, List[str]] = {candidate_id: [] for candidate_id in candidate_ids}
+    if candidate_ids:
+        rows = session.exec(
+            select(Skill.candidate_id, Skill.name).where(Skill.candidate_id.in_(candidate_ids))
+        ).all()
+        for candidate_id, name in rows:
+            skills_by_candidate[candidate_id].append(name)
+    
+    job_skills: dict[int, tuple[list, list]] = {}
+    results = []
+    for candidate, job_post in pairs:
+        if job_post.id not in job_skills:
+            job_skills[job_post.id] = parse_job_skills(job_post)
+        results.append(calculate_match_score(
+            candidate,
+            job_post,
+            candidate_skills=skills_by_candidate[candidate.id],
+            job_skills=job_skills[job_post.id]
+        ))
+    return results
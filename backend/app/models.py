@@ -1,5 +1,8 @@
 from typing import Optional, List
 from datetime import datetime
+from sqlalchemy import Index, UniqueConstraint, event, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session as OrmSession
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -51,11 +54,30 @@ class Resume(SQLModel, table=True):
     filename: str
     content_type: Optional[str] = None
     storage_path: str
+    size_bytes: Optional[int] = None
+    content_hash: Optional[str] = Field(default=None, index=True)  # SHA-256 hex of the file
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+    # Text extraction (see resume_extraction): "pending", "processing", "done", "failed"
+    extraction_status: str = Field(default="pending", index=True)
+    extraction_attempts: int = 0
+    extraction_due_at: Optional[datetime] = None  # retry time, or lease end while processing
+    extraction_error: Optional[str] = None
+    extracted_text: Optional[str] = None
+    text_stats: Optional[str] = None  # JSON token statistics
+    extracted_at: Optional[datetime] = None
+
     candidate: "Candidate" = Relationship(back_populates="resumes")
 
 
+class ResumeBlob(SQLModel, table=True):
+    """Content-addressed resume file (see blob_store), shared by every Resume with the same bytes"""
+    content_hash: str = Field(primary_key=True)  # SHA-256 hex
+    size_bytes: int
+    ref_count: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class SocialLink(SQLModel, table=True):
     """Social media and portfolio links for candidates"""
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -111,6 +133,11 @@ class CandidateJobPreference(SQLModel, table=True):
 
 
 class Candidate(SQLModel, table=True):
+    __table_args__ = (
+        # Keyset pagination for GET /candidates/list/all
+        Index("ix_candidate_created_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", unique=True)
     
@@ -146,6 +173,7 @@ class Candidate(SQLModel, table=True):
     
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = Field(default=1)  # Bumped on every change to the profile or its skills/certs/resumes/links (ETag source)
 
     user: Optional[User] = Relationship(back_populates="candidate")
     skills: List[Skill] = Relationship(back_populates="candidate")
@@ -194,6 +222,15 @@ class CompanyUser(SQLModel, table=True):
 
 class JobPost(SQLModel, table=True):
     """Job posting by a company"""
+    __table_args__ = (
+        # Back the grouped team workload rollup (GET /jobs/team/workload)
+        Index("ix_jobpost_company_creator_status", "company_id", "created_by_user_id", "status"),
+        Index("ix_jobpost_company_assignee_status", "company_id", "assigned_to_user_id", "status"),
+        # Keyset pagination for the job listings
+        Index("ix_jobpost_status_created_id", "status", "created_at", "id"),
+        Index("ix_jobpost_company_created_id", "company_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     company_id: int = Field(foreign_key="companyaccount.id")
     created_by_user_id: Optional[int] = Field(foreign_key="companyuser.id")  # Recruiter who created this job
@@ -220,10 +257,12 @@ class JobPost(SQLModel, table=True):
     salary_max: Optional[float] = None  # Annual salary for permanent jobs
     required_skills: Optional[str] = None  # JSON array of skill names
     nice_to_have_skills: Optional[str] = None  # JSON array
+    description_skills: Optional[str] = None  # JSON array of skills found in the description (skill_extraction)
     
     status: str = "active"  # active, closed, archived
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = Field(default=1)  # Bumped on every update (ETag source)
     
     company: CompanyAccount = Relationship(back_populates="job_posts")
     swipes: List["Swipe"] = Relationship(back_populates="job_post")
@@ -289,6 +328,31 @@ class MatchState(SQLModel, table=True):
     Tracks the interaction state between a candidate and a specific job posting.
     Similar to dating app swipe mechanics.
     """
+    __table_args__ = (
+        # One row per candidate/job pair; target of the ON CONFLICT upsert in routers/matches.py
+        UniqueConstraint("candidate_id", "job_post_id", name="uq_matchstate_candidate_job"),
+        # Keyset pagination for the recruiter shortlist and candidate likes (sort=liked_at)
+        Index(
+            "ix_matchstate_recruiter_action_at_id",
+            "recruiter_action", text("coalesce(recruiter_action_at, created_at)"), "id",
+        ),
+        Index(
+            "ix_matchstate_candidate_action_at_id",
+            "candidate_id", "candidate_action", text("coalesce(candidate_action_at, created_at)"), "id",
+        ),
+        # Pending ask-to-apply invitations only: the expiry sweep (ask_expiry) and the candidate inbox
+        Index(
+            "ix_matchstate_pending_ask_expires",
+            "ask_to_apply_expires_at",
+            postgresql_where=text("ask_to_apply_status = 'PENDING'"),
+        ),
+        Index(
+            "ix_matchstate_pending_ask_candidate",
+            "candidate_id", text("coalesce(ask_to_apply_sent_at, created_at)"), "id",
+            postgresql_where=text("ask_to_apply_status = 'PENDING'"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     candidate_id: int = Field(foreign_key="candidate.id", index=True)
     job_post_id: int = Field(foreign_key="jobpost.id", index=True)
@@ -314,7 +378,7 @@ class MatchState(SQLModel, table=True):
     
     # For ask_to_apply workflow
     ask_to_apply_message: Optional[str] = None  # Custom message from recruiter
-    ask_to_apply_status: Optional[str] = None  # PENDING, ACCEPTED, DECLINED
+    ask_to_apply_status: Optional[str] = None  # PENDING, ACCEPTED, DECLINED, EXPIRED, WITHDRAWN
     ask_to_apply_sent_at: Optional[datetime] = None  # When recruiter sent invitation
     ask_to_apply_expires_at: Optional[datetime] = None  # Expiration date for invitation
     ask_to_apply_accepted: bool = False  # Whether candidate accepted the invitation
@@ -326,6 +390,12 @@ class MatchState(SQLModel, table=True):
 
 class Application(SQLModel, table=True):
     """Candidate application to a job posting"""
+    __table_args__ = (
+        UniqueConstraint("candidate_id", "job_post_id", name="uq_application_candidate_job"),
+        # Keyset pagination for GET /candidates/me/applications
+        Index("ix_application_candidate_applied_id", "candidate_id", "applied_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     candidate_id: int = Field(foreign_key="candidate.id")
     job_post_id: int = Field(foreign_key="jobpost.id")
@@ -337,3 +407,131 @@ class Application(SQLModel, table=True):
     
     candidate: Candidate = Relationship(back_populates="applications")
     job_post: JobPost = Relationship(back_populates="applications")
+
+
+# ============================================================================
+# MATCH EVENTS & FUNNEL COUNTERS
+# ============================================================================
+
+class MatchEvent(SQLModel, table=True):
+    """Append-only log of match actions (written by match_events.record_match_events, never updated)"""
+    __table_args__ = (
+        Index("ix_matchevent_job_created", "job_post_id", "created_at"),
+        Index("ix_matchevent_company_created", "company_id", "created_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    actor: str  # candidate, recruiter, system
+    action: str  # LIKE, PASS, APPLY, ASK_TO_APPLY, ACCEPT_ASK, DECLINE_ASK, EXPIRE_ASK
+    candidate_id: int
+    job_post_id: int
+    company_id: int  # Denormalized from the job for per-company analytics
+    company_user_id: Optional[int] = None  # Recruiter who acted
+    match_status: Optional[str] = None  # MatchState.status after the action
+
+
+class MatchFunnelStage(SQLModel, table=True):
+    """First time a candidate/job pair reached a funnel stage (dedupes the counters)"""
+    job_post_id: int = Field(primary_key=True)
+    candidate_id: int = Field(primary_key=True)
+    stage: str = Field(primary_key=True)  # see match_events.FUNNEL_STAGES
+    reached_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class CompanyFunnelStage(SQLModel, table=True):
+    """First time a candidate reached a funnel stage on any of a company's jobs"""
+    company_id: int = Field(primary_key=True)
+    candidate_id: int = Field(primary_key=True)
+    stage: str = Field(primary_key=True)
+    reached_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class FunnelCounter(SQLModel, table=True):
+    """Number of candidates that reached a funnel stage, per job and per company"""
+    scope: str = Field(primary_key=True)  # job, company
+    scope_id: int = Field(primary_key=True)
+    stage: str = Field(primary_key=True)
+    count: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# ============================================================================
+# ANALYTICS ROLLUPS
+# ============================================================================
+
+class AnalyticsRollup(SQLModel, table=True):
+    """MatchEvent counts per hour/day bucket for a job, company or recruiter (see analytics.py)"""
+    # Key order serves the dashboard query: one series, a range of buckets
+    grain: str = Field(primary_key=True)  # hour, day
+    scope: str = Field(primary_key=True)  # job, company, recruiter
+    scope_id: int = Field(primary_key=True)
+    metric: str = Field(primary_key=True)  # match_events.FUNNEL_STAGES
+    bucket_start: datetime = Field(primary_key=True)
+    count: int = 0
+
+
+class RollupWatermark(SQLModel, table=True):
+    """Last MatchEvent id folded into AnalyticsRollup"""
+    name: str = Field(primary_key=True)
+    last_event_id: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# ============================================================================
+# VERSION TRACKING (ETags)
+# ============================================================================
+
+class ChangeSequence(SQLModel, table=True):
+    """Per-collection change counter, bumped by every transaction that writes the collection"""
+    name: str = Field(primary_key=True)  # jobpost
+    value: int = 0
+
+
+# Child rows rendered inside CandidateRead; changing them changes the candidate's payload
+CANDIDATE_CHILD_MODELS = (Skill, Certification, Resume, SocialLink)
+
+
+def bump_change_sequence(connection, name: str) -> None:
+    """Add one to a collection's ChangeSequence in the caller's transaction."""
+    statement = pg_insert(ChangeSequence.__table__).values(name=name, value=1)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"value": ChangeSequence.__table__.c.value + 1},
+        )
+    )
+
+
+@event.listens_for(OrmSession, "before_flush")
+def bump_entity_versions(session, flush_context, instances):
+    """
+    Keep JobPost.version and Candidate.version in step with every ORM write.
+    
+    Modified jobs and candidates get version + 1 (and a fresh updated_at); adding,
+    changing or removing a candidate's skills, certifications, resumes or social
+    links bumps the owning candidate with a single UPDATE. Any job insert, update
+    or delete also bumps the "jobpost" ChangeSequence the job list ETags read.
+    """
+    now = datetime.utcnow()
+    jobs_changed = any(isinstance(obj, JobPost) for obj in (*session.new, *session.deleted))
+    for obj in session.dirty:
+        if isinstance(obj, (JobPost, Candidate)) and session.is_modified(obj, include_collections=False):
+            # SQL expression so concurrent writers each add one instead of overwriting
+            obj.version = type(obj).version + 1
+            obj.updated_at = now
+            jobs_changed = jobs_changed or isinstance(obj, JobPost)
+    if jobs_changed:
+        bump_change_sequence(session.connection(), "jobpost")
+    
+    candidate_ids = {
+        obj.candidate_id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, CANDIDATE_CHILD_MODELS) and obj.candidate_id
+    }
+    if candidate_ids:
+        session.connection().execute(
+            update(Candidate.__table__)
+            .where(Candidate.__table__.c.id.in_(candidate_ids))
+            .values(version=Candidate.__table__.c.version + 1, updated_at=now)
+        )
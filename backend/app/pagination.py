@@ -0,0 +1,89 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered by an indexed key such as (created_at, id) and the next
+page starts strictly after the last key of the previous one, so page N costs
+the same index range scan as page 1 (no OFFSET). Cursors are opaque
+URL-safe strings encoding that last key.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the key of the last row on a page as an opaque cursor."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """Decode a cursor produced by encode_cursor() back into typed key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("cursor arity mismatch")
+        values = []
+        for value, value_type in zip(payload, types):
+            if value is None:
+                values.append(None)
+            elif value_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            else:
+                values.append(value_type(value))
+        return tuple(values)
+    except (ValueError, TypeError, binascii.Error, orjson.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_paginate(statement, key_columns: Sequence[Any], cursor: Optional[str], limit: int, descending: bool = True):
+    """
+    Order a select by key_columns, start after `cursor` and fetch limit + 1 rows.
+
+    The extra row only signals that another page exists; split_page() drops it.
+    """
+    if cursor:
+        key_types = [column.expression.type.python_type for column in key_columns]
+        after = decode_cursor(cursor, key_types)
+        key = tuple_(*key_columns)
+        statement = statement.where(key < tuple_(*after) if descending else key > tuple_(*after))
+
+    ordering = [column.desc() if descending else column.asc() for column in key_columns]
+    return statement.order_by(*ordering).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], limit: int, key_of) -> tuple[list, Optional[str]]:
+    """Trim the look-ahead row and build the next cursor from the last row kept."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*key_of(page[-1]))
+
+
+def count_rows(session, statement) -> int:
+    """Rows an unpaged select matches, for listings that report a total across pages."""
+    return session.scalar(select(func.count()).select_from(statement.order_by(None).subquery()))
+
+
+def with_next_cursor(response, next_cursor: Optional[str]):
+    """Attach the next-page cursor header to a response."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
@@ -0,0 +1,157 @@
+"""
+Request-scoped principal resolution (the caller's Candidate / CompanyUser).
+
+Login embeds candidate_id or company_user_id in the JWT claims, so most
+requests resolve their principal without touching the database. Tokens issued
+before those claims existed fall back to a small TTL cache of user -> principal
+id, and only then to a lookup. The entity dependencies load the row by primary
+key; FastAPI caches dependency results per request and the session's identity
+map holds the row, so each request loads its principal at most once.
+
+Only ids are cached across requests, never ORM objects. Deactivating an
+employee (routers/company.py) revokes their tokens, so the claims die with
+them, and drops their cached ids with forget_principal().
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlmodel import Session, select
+
+from .database import get_session
+from .models import Candidate, CompanyUser
+from .security import require_candidate, require_company_user
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("APP_PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("APP_PRINCIPAL_CACHE_SIZE", "10000"))
+
+# ("candidate", user_id) / ("company_user", user_id, company_id) -> (expires at, id)
+_principal_ids: "OrderedDict[Hashable, tuple[float, int]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cached_id(key: Hashable) -> Optional[int]:
+    with _lock:
+        entry = _principal_ids.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _principal_ids[key]
+            return None
+        _principal_ids.move_to_end(key)
+        return entry[1]
+
+
+def _remember_id(key: Hashable, principal_id: int) -> None:
+    with _lock:
+        _principal_ids[key] = (time.monotonic() + PRINCIPAL_CACHE_TTL_SECONDS, principal_id)
+        _principal_ids.move_to_end(key)
+        while len(_principal_ids) > PRINCIPAL_CACHE_SIZE:
+            _principal_ids.popitem(last=False)
+
+
+def forget_principal(user_id: int) -> None:
+    """Drop cached principal ids for a user (after deactivating or removing them)."""
+    with _lock:
+        for key in [key for key in _principal_ids if key[1] == user_id]:
+            del _principal_ids[key]
+
+
+def resolve_candidate_id(session: Session, current_user: dict) -> Optional[int]:
+    """Candidate id of the caller: token claim, then the TTL cache, then one lookup."""
+    candidate_id = current_user.get("candidate_id")
+    if candidate_id:
+        return candidate_id
+
+    user_id = current_user.get("user_id")
+    key = ("candidate", user_id)
+    candidate_id = _cached_id(key)
+    if candidate_id is None:
+        candidate_id = session.exec(
+            select(Candidate.id).where(Candidate.user_id == user_id)
+        ).first()
+        if candidate_id is not None:
+            _remember_id(key, candidate_id)
+    return candidate_id
+
+
+def resolve_company_user_id(session: Session, current_user: dict) -> Optional[int]:
+    """CompanyUser id of the caller within the token's company (same order as candidates)."""
+    company_user_id = current_user.get("company_user_id")
+    if company_user_id:
+        return company_user_id
+
+    user_id = current_user.get("user_id")
+    company_id = current_user.get("company_id")
+    key = ("company_user", user_id, company_id)
+    company_user_id = _cached_id(key)
+    if company_user_id is None:
+        statement = select(CompanyUser.id).where(CompanyUser.user_id == user_id)
+        if company_id is not None:
+            statement = statement.where(CompanyUser.company_id == company_id)
+        company_user_id = session.exec(statement).first()
+        if company_user_id is not None:
+            _remember_id(key, company_user_id)
+    return company_user_id
+
+
+def _candidate_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Candidate profile not found"
+    )
+
+
+def _company_user_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="User not found in this company"
+    )
+
+
+def get_current_candidate_id(
+    current_user: dict = Depends(require_candidate),
+    session: Session = Depends(get_session)
+) -> int:
+    """Authenticated candidate's id; 404 when the user has no candidate profile."""
+    candidate_id = resolve_candidate_id(session, current_user)
+    if candidate_id is None:
+        raise _candidate_not_found()
+    return candidate_id
+
+
+def get_current_candidate(
+    candidate_id: int = Depends(get_current_candidate_id),
+    session: Session = Depends(get_session)
+) -> Candidate:
+    """Authenticated candidate's profile row, loaded by primary key."""
+    candidate = session.get(Candidate, candidate_id)
+    if candidate is None:
+        raise _candidate_not_found()
+    return candidate
+
+
+def get_current_company_user_id(
+    current_user: dict = Depends(require_company_user),
+    session: Session = Depends(get_session)
+) -> int:
+    """Authenticated company user's CompanyUser id; 403 when they are not in the token's company."""
+    company_user_id = resolve_company_user_id(session, current_user)
+    if company_user_id is None:
+        raise _company_user_not_found()
+    return company_user_id
+
+
+def get_current_company_user(
+    company_user_id: int = Depends(get_current_company_user_id),
+    session: Session = Depends(get_session)
+) -> CompanyUser:
+    """Authenticated company user's CompanyUser row, loaded by primary key."""
+    company_user = session.get(CompanyUser, company_user_id)
+    if company_user is None:
+        raise _company_user_not_found()
+    return company_user
@@ -0,0 +1,101 @@
+"""
+Shared JobPostRead projection with an in-process LRU cache.
+
+JobPost keeps its skill lists as JSON text, so building a JobPostRead costs
+two json.loads per job. Built projections are cached per job and reused while
+the job's updated_at is unchanged (every ORM update bumps it, see
+models.bump_entity_versions), so listing 1,000 postings re-parses only the
+jobs that changed. Write handlers also evict their job explicitly.
+
+Cached objects are shared between requests: treat them as read-only.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from .models import JobPost
+from .schemas import JobPostRead
+
+JOB_PROJECTION_CACHE_SIZE = int(os.getenv("APP_JOB_PROJECTION_CACHE_SIZE", "5000"))
+
+# job id -> (updated_at, JobPostRead without creator/assignee), least recently used first
+_projections: "OrderedDict[int, tuple[datetime, JobPostRead]]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _build_job_post_read(job: JobPost) -> JobPostRead:
+    return JobPostRead(
+        id=job.id,
+        company_id=job.company_id,
+        title=job.title,
+        description=job.description,
+        product_author=job.product_author,
+        product=job.product,
+        role=job.role,
+        seniority=job.seniority,
+        job_type=job.job_type,
+        duration=job.duration,
+        start_date=job.start_date.isoformat() if job.start_date else None,
+        currency=job.currency,
+        location=job.location,
+        work_type=job.work_type,
+        min_rate=job.min_rate,
+        max_rate=job.max_rate,
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+        required_skills=json.loads(job.required_skills or "[]"),
+        nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
+        description_skills=json.loads(job.description_skills or "[]"),
+        status=job.status,
+        created_at=job.created_at.isoformat(),
+        updated_at=job.updated_at.isoformat()
+    )
+
+
+def job_post_read(job: JobPost, with_creator: bool = False, with_assignee: bool = False) -> JobPostRead:
+    """
+    JobPostRead for a job row, served from the cache when (job id, updated_at) matches.
+
+    with_creator / with_assignee add created_by_user_id / assigned_to_user_id, which
+    only company-facing endpoints expose.
+    """
+    with _lock:
+        cached = _projections.get(job.id)
+        if cached and cached[0] == job.updated_at:
+            _projections.move_to_end(job.id)
+            _stats["hits"] += 1
+            read = cached[1]
+        else:
+            read = None
+
+    if read is None:
+        read = _build_job_post_read(job)
+        with _lock:
+            _stats["misses"] += 1
+            _projections[job.id] = (job.updated_at, read)
+            _projections.move_to_end(job.id)
+            while len(_projections) > JOB_PROJECTION_CACHE_SIZE:
+                _projections.popitem(last=False)
+
+    extra = {}
+    if with_creator:
+        extra["created_by_user_id"] = job.created_by_user_id
+    if with_assignee:
+        extra["assigned_to_user_id"] = job.assigned_to_user_id
+    return read.model_copy(update=extra) if extra else read
+
+
+def invalidate_job_projection(job_id: int) -> None:
+    """Drop a job's cached projection (called by the job write handlers)."""
+    with _lock:
+        _projections.pop(job_id, None)
+
+
+def job_projection_cache_stats() -> dict:
+    """Hit/miss counters and current size of the projection cache."""
+    with _lock:
+        return {**_stats, "size": len(_projections), "max_size": JOB_PROJECTION_CACHE_SIZE}
@@ -0,0 +1,194 @@
+"""
+Bulk provisioning of company employee accounts.
+
+One run validates every entry, resolves existing users with a single IN query,
+inserts new Users and their CompanyUser rows with multi-row INSERT ... RETURNING
+statements and commits once. Existing company-type users without a company are
+linked instead of created (what /company/invite-employee does for one user).
+
+Password hashing happens between plan() and apply() so async callers can run it
+on the dedicated hashing pool (security.hash_passwords_async).
+
+Used by POST /company/employees/bulk and /company/invite-employee.
+"""
+
+import logging
+import secrets
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from .models import CompanyUser, User
+from .schemas import EmployeeProvision
+
+logger = logging.getLogger(__name__)
+
+COMPANY_ROLES = ("ADMIN", "HR", "RECRUITER")
+
+
+def generate_temporary_password() -> str:
+    """Random password that also satisfies the signup password rules."""
+    return f"Tmp-{secrets.token_urlsafe(12)}-{secrets.randbelow(10)}"
+
+
+class EmployeeProvisioning:
+    """
+    One provisioning run for a company: plan(), hash the new accounts' passwords, apply().
+
+    Per-entry problems are reported in the results without failing the batch.
+    With create_missing=False unknown emails are rejected instead of created.
+    """
+
+    def __init__(self, company_id: int, entries: list[EmployeeProvision], create_missing: bool = True):
+        self.company_id = company_id
+        self.entries = entries
+        self.create_missing = create_missing
+        self.results: list[dict] = [
+            {"index": index, "email": entry.email.lower(), "ok": False}
+            for index, entry in enumerate(entries)
+        ]
+        # Indexes of entries to create, with the plaintext passwords to hash (same order)
+        self.to_create: list[int] = []
+        self.passwords: list[str] = []
+        # Entry index -> existing user id to link
+        self.to_link: dict[int, int] = {}
+
+    def _fail(self, index: int, error: str) -> None:
+        self.results[index]["error"] = error
+
+    def plan(self, session: Session) -> None:
+        """Validate entries and split them into accounts to create and users to link."""
+        seen = set()
+        candidates = []
+        for index, entry in enumerate(self.entries):
+            email = self.results[index]["email"]
+            if entry.role not in COMPANY_ROLES:
+                self._fail(index, "role must be ADMIN, HR, or RECRUITER")
+            elif email in seen:
+                self._fail(index, "Duplicate email in request")
+            else:
+                seen.add(email)
+                candidates.append(index)
+        if not candidates:
+            return
+
+        # One query for every existing user (and their company membership) in the batch
+        rows = session.exec(
+            select(User.email, User.id, User.user_type, CompanyUser.id)
+            .outerjoin(CompanyUser, CompanyUser.user_id == User.id)
+            .where(User.email.in_(seen))
+        ).all()
+        existing = {email: (user_id, user_type, company_user_id) for email, user_id, user_type, company_user_id in rows}
+
+        for index in candidates:
+            entry = self.entries[index]
+            found = existing.get(self.results[index]["email"])
+            if found is None:
+                if not self.create_missing:
+                    self._fail(index, "Employee not found or not a company user type")
+                    continue
+                password = entry.password
+                if password is None:
+                    password = generate_temporary_password()
+                    self.results[index]["temporary_password"] = password
+                self.to_create.append(index)
+                self.passwords.append(password)
+                continue
+            user_id, user_type, company_user_id = found
+            if user_type != "company":
+                self._fail(index, "Employee not found or not a company user type")
+            elif company_user_id is not None:
+                self._fail(index, "Employee already in a company")
+            else:
+                self.to_link[index] = user_id
+
+    def apply(self, session: Session, password_hashes: list[str]) -> dict:
+        """
+        Insert the planned Users and CompanyUsers in one transaction.
+
+        password_hashes must match self.passwords. A concurrent signup or invite for
+        one of the emails aborts the whole run with 409.
+        """
+        now = datetime.utcnow()
+        user_ids = dict(self.to_link)
+        try:
+            if self.to_create:
+                inserted = session.exec(
+                    insert(User)
+                    .values([
+                        {
+                            "email": self.results[index]["email"],
+                            "password_hash": password_hash,
+                            "user_type": "company",
+                            "is_active": True,
+                            "created_at": now,
+                        }
+                        for index, password_hash in zip(self.to_create, password_hashes)
+                    ])
+                    .returning(User.id, User.email)
+                ).all()
+                ids_by_email = {email: user_id for user_id, email in inserted}
+                for index in self.to_create:
+                    user_ids[index] = ids_by_email[self.results[index]["email"]]
+
+            company_user_ids = {}
+            if user_ids:
+                inserted = session.exec(
+                    insert(CompanyUser)
+                    .values([
+                        {
+                            "user_id": user_id,
+                            "company_id": self.company_id,
+                            "first_name": self.entries[index].first_name,
+                            "last_name": self.entries[index].last_name,
+                            "role": self.entries[index].role,
+                            "is_active": True,
+                            "created_at": now,
+                        }
+                        for index, user_id in user_ids.items()
+                    ])
+                    .returning(CompanyUser.id, CompanyUser.user_id)
+                ).all()
+                company_user_ids = {user_id: company_user_id for company_user_id, user_id in inserted}
+
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Some of these employees were registered concurrently; please retry"
+            )
+
+        created = set(self.to_create)
+        for index, user_id in user_ids.items():
+            self.results[index].update({
+                "ok": True,
+                "status": "created" if index in created else "linked",
+                "user_id": user_id,
+                "company_user_id": company_user_ids[user_id],
+            })
+
+        logger.info(
+            f"[PROVISION] company {self.company_id}: {len(created)} created, "
+            f"{len(self.to_link)} linked, {self.failed} rejected"
+        )
+        return self.report()
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for result in self.results if "error" in result)
+
+    def report(self) -> dict:
+        return {
+            "created": len(self.to_create),
+            "linked": len(self.to_link),
+            "failed": self.failed,
+            "results": self.results,
+        }
+
+    def first_error(self) -> Optional[str]:
+        return next((result["error"] for result in self.results if "error" in result), None)
@@ -0,0 +1,178 @@
+"""
+In-process pub/sub feeding the server-sent events stream (routers/events.py).
+
+Each open stream subscribes an asyncio queue to its user's topics:
+candidate:<id> for a candidate, company:<id> for a company user. Write paths
+publish from worker threads; messages are serialized once and handed to each
+subscriber's event loop with call_soon_threadsafe, so publishing never blocks
+a request. A subscriber that falls QUEUE_SIZE messages behind gets its queue
+replaced by a single "resync" event and refetches instead.
+
+Match events are published by match_events after the transaction that recorded
+them commits, never before (see publish_match_events).
+
+The hub only reaches streams held by the same process. With several app
+workers, a client learns about changes made through its own worker at once and
+about the rest on its next refetch; every stream starts with a "ready" event so
+clients refetch after (re)connecting.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Iterable, Optional
+
+import orjson
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from .models import JobPost
+from .role_fit import product_authors
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = int(os.getenv("APP_PUSH_QUEUE_SIZE", "100"))
+MAX_SUBSCRIPTIONS = int(os.getenv("APP_PUSH_MAX_CONNECTIONS", "5000"))
+
+
+def candidate_topic(candidate_id: int) -> str:
+    return f"candidate:{candidate_id}"
+
+
+def company_topic(company_id: int) -> str:
+    return f"company:{company_id}"
+
+
+def sse_message(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+RESYNC_MESSAGE = sse_message("resync", {"reason": "too many updates, refetch"})
+
+
+class Subscription:
+    """One open stream: a bounded queue owned by the stream's event loop."""
+
+    def __init__(self, topics: list[str], loop: asyncio.AbstractEventLoop):
+        self.topics = topics
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def deliver(self, message: bytes) -> None:
+        """Runs on the subscriber's loop."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_MESSAGE)
+            push_hub.stats["resyncs"] += 1
+
+
+class PushHub:
+    """Topic -> subscriptions; thread-safe publish."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._topics: dict[str, set[Subscription]] = {}
+        self._count = 0
+        self.stats = {"published": 0, "delivered": 0, "resyncs": 0, "rejected": 0}
+
+    def subscribe(self, topics: list[str]) -> Optional[Subscription]:
+        """Subscribe from the running event loop; None when the connection limit is reached."""
+        subscription = Subscription(topics, asyncio.get_running_loop())
+        with self._lock:
+            if self._count >= MAX_SUBSCRIPTIONS:
+                self.stats["rejected"] += 1
+                return None
+            self._count += 1
+            for topic in topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._count -= 1
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+
+    def has_subscribers(self, prefix: str = "") -> bool:
+        with self._lock:
+            return any(topic.startswith(prefix) for topic in self._topics)
+
+    def publish(self, topic: str, event: str, data: dict) -> None:
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+        self.stats["published"] += 1
+        if not subscribers:
+            return
+        message = sse_message(event, data)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+                self.stats["delivered"] += 1
+            except RuntimeError:
+                pass  # loop closed; the stream's finally block unsubscribes it
+
+    def connections(self) -> int:
+        return self._count
+
+
+push_hub = PushHub()
+
+
+def publish_match_events(events: Iterable[dict]) -> None:
+    """
+    Push committed match events: every event to the job's company, and to the
+    candidate their own actions, invitations, expiries and new matches (not a
+    recruiter's like or pass).
+    """
+    for event in events:
+        data = {
+            "candidate_id": event["candidate_id"],
+            "job_id": event["job_post_id"],
+            "actor": event["actor"],
+            "action": event["action"],
+            "status": event.get("match_status"),
+            "at": event["created_at"].isoformat(),
+        }
+        if event["company_id"] is not None:
+            push_hub.publish(company_topic(event["company_id"]), "match_updated", data)
+        if event["action"] == "ASK_TO_APPLY":
+            push_hub.publish(candidate_topic(event["candidate_id"]), "ask_received", data)
+        elif event["actor"] != "recruiter" or event.get("match_status") == "MATCHED":
+            push_hub.publish(candidate_topic(event["candidate_id"]), "match_updated", data)
+
+
+def publish_feed_candidate(session: Session, candidate_id: int, product: Optional[str]) -> None:
+    """
+    Tell companies a candidate now qualifies for their active jobs' feeds (same
+    product author as the job). Skips the job lookup when no company is listening.
+    """
+    author = product_authors().get(product.strip().lower()) if product else None
+    if not author or not push_hub.has_subscribers("company:"):
+        return
+    jobs_by_company: dict[int, list[int]] = {}
+    for job_id, company_id in session.exec(
+        select(JobPost.id, JobPost.company_id).where(
+            JobPost.status == "active",
+            func.lower(JobPost.product_author) == author,
+        )
+    ).all():
+        jobs_by_company.setdefault(company_id, []).append(job_id)
+    now = datetime.utcnow().isoformat()
+    for company_id, job_ids in jobs_by_company.items():
+        push_hub.publish(
+            company_topic(company_id), "feed_candidate",
+            {"candidate_id": candidate_id, "job_ids": job_ids, "at": now},
+        )
+
+
+def push_stats() -> dict:
+    return {"connections": push_hub.connections(), **push_hub.stats}
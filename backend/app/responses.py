@@ -0,0 +1,93 @@
+"""
+Fast-path JSON rendering for large list endpoints.
+
+Handlers that already build their response objects (validated once, at
+construction) return these responses directly, so FastAPI skips the second
+response_model validation and jsonable_encoder pass and orjson writes the
+bytes. Streaming variants render one item at a time so memory stays flat
+as result sets grow.
+"""
+
+from typing import Any, Iterable, Iterator, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+# Accepted values for the `stream` query parameter on list endpoints
+STREAM_MODES = ("array", "ndjson")
+STREAM_MODE_PATTERN = "^(array|ndjson)$"
+
+# Flush streamed output in chunks of roughly this size
+STREAM_CHUNK_BYTES = 64 * 1024
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _encode_default(obj: Any) -> Any:
+    """orjson fallback for objects it does not serialize natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content (dicts, lists, Pydantic models, datetimes) to JSON bytes."""
+    return orjson.dumps(content, default=_encode_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson, accepting Pydantic models anywhere in the payload."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _chunked(parts: Iterable[bytes]) -> Iterator[bytes]:
+    """Coalesce small encoded parts into ~STREAM_CHUNK_BYTES writes."""
+    buffer = bytearray()
+    for part in parts:
+        buffer += part
+        if len(buffer) >= STREAM_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def _json_array_parts(items: Iterable[Any]) -> Iterator[bytes]:
+    yield b"["
+    first = True
+    for item in items:
+        if not first:
+            yield b","
+        first = False
+        yield dumps(item)
+    yield b"]"
+
+
+def _ndjson_parts(items: Iterable[Any]) -> Iterator[bytes]:
+    for item in items:
+        yield dumps(item) + b"\n"
+
+
+def stream_json(items: Iterable[Any], mode: str = "array") -> StreamingResponse:
+    """
+    Stream items as a chunked JSON array (mode="array") or as NDJSON (mode="ndjson").
+
+    `items` should be a lazy iterator; it is consumed while the response is sent,
+    after the request's dependencies have been torn down, so it must own any
+    database session it needs.
+    """
+    if mode == "ndjson":
+        return StreamingResponse(_chunked(_ndjson_parts(items)), media_type="application/x-ndjson")
+    return StreamingResponse(_chunked(_json_array_parts(items)), media_type="application/json")
+
+
+def list_response(items: Iterable[Any], stream: Optional[str] = None):
+    """Render a list endpoint: streamed when `stream` is set, otherwise one orjson buffer."""
+    if stream:
+        return stream_json(items, stream)
+    return FastJSONResponse(list(items))
@@ -0,0 +1,344 @@
+"""
+Background resume text extraction.
+
+New resumes are stored with extraction_status="pending". A background thread
+claims due rows in batches (FOR UPDATE SKIP LOCKED, so several app workers can
+run it side by side), converts the files to text in a bounded process pool
+(text_extraction, plus skill_extraction for the skills mentioned), and stores
+the text and token statistics on the Resume. Requests never pay the parsing
+cost; uploads just nudge the thread with notify(). With APP_SKILL_AUTO_ATTACH=1
+the skills found are also added to the candidate's profile.
+
+Resumes whose bytes were already extracted (same content_hash) reuse that text
+without touching the pool. Transient failures are retried with exponential
+backoff up to EXTRACTION_MAX_ATTEMPTS; unsupported or empty files fail at once.
+A claimed row's extraction_due_at doubles as a lease, so rows held by a crashed
+worker become due again; reclaiming one counts as an attempt too, and a row
+whose lease expires on its last attempt is marked failed instead.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_, update
+from sqlmodel import Session, select
+
+from .database import engine
+from .models import Resume, Skill
+from .skill_extraction import extract_resume_text_and_skills, get_skill_matcher
+from .text_extraction import ExtractionError
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_ENABLED = os.getenv("APP_RESUME_EXTRACTION_ENABLED", "1") != "0"
+EXTRACTION_WORKERS = int(os.getenv("APP_RESUME_EXTRACTION_WORKERS", "2"))
+EXTRACTION_BATCH_SIZE = int(os.getenv("APP_RESUME_EXTRACTION_BATCH_SIZE", "16"))
+EXTRACTION_MAX_ATTEMPTS = 3
+# Seconds allowed per file before the batch gives up on it (and the pool is replaced)
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("APP_RESUME_EXTRACTION_TIMEOUT", "60"))
+# Idle poll interval; uploads wake the thread immediately
+EXTRACTION_POLL_SECONDS = 10.0
+# How long a claimed row is leased to this worker before others may retry it
+EXTRACTION_LEASE = timedelta(minutes=10)
+RETRY_BASE_DELAY = timedelta(seconds=30)
+# Recycle worker processes periodically so large PDFs cannot bloat them for good
+TASKS_PER_PROCESS = 50
+# Add skills found in a resume to the candidate's profile (otherwise they are only suggested)
+SKILL_AUTO_ATTACH = os.getenv("APP_SKILL_AUTO_ATTACH", "0") == "1"
+
+PENDING, PROCESSING, DONE, FAILED = "pending", "processing", "done", "failed"
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    # spawn: children import only the extraction modules (skill_extraction, text_extraction),
+    # never inheriting DB connections or threads
+    return ProcessPoolExecutor(
+        max_workers=EXTRACTION_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=TASKS_PER_PROCESS,
+    )
+
+
+def fail_exhausted_leases(session: Session, now: datetime) -> int:
+    """
+    Mark FAILED the rows whose lease expired on their last allowed attempt (the
+    worker died mid-extraction every time). Returns how many; the caller commits.
+    """
+    exhausted = (
+        select(Resume.id)
+        .where(
+            Resume.extraction_status == PROCESSING,
+            Resume.extraction_due_at <= now,
+            Resume.extraction_attempts >= EXTRACTION_MAX_ATTEMPTS,
+        )
+        .with_for_update(skip_locked=True)
+    )
+    result = session.exec(
+        update(Resume)
+        .where(Resume.id.in_(exhausted.scalar_subquery()))
+        .values(
+            extraction_status=FAILED,
+            extraction_due_at=None,
+            extraction_error=f"Extraction did not finish in {EXTRACTION_MAX_ATTEMPTS} attempts",
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Shut a pool down and terminate its worker processes. shutdown() alone leaves a
+    child that is still running a task (a file the parser is stuck on) alive for good.
+    """
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+            process.join(timeout=5)
+
+
+def claim_due_resumes(session: Session, limit: int) -> list[dict]:
+    """Lease up to `limit` due resumes to this worker and return what extraction needs."""
+    now = datetime.utcnow()
+    failed = fail_exhausted_leases(session, now)
+    if failed:
+        logger.warning(f"[RESUME_EXTRACT] {failed} resumes failed after their last lease expired")
+    resumes = session.exec(
+        select(Resume)
+        .where(
+            Resume.extraction_status.in_((PENDING, PROCESSING)),
+            or_(Resume.extraction_due_at.is_(None), Resume.extraction_due_at <= now),
+            Resume.extraction_attempts < EXTRACTION_MAX_ATTEMPTS,
+        )
+        .order_by(Resume.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    jobs = []
+    for resume in resumes:
+        resume.extraction_status = PROCESSING
+        resume.extraction_attempts = (resume.extraction_attempts or 0) + 1
+        resume.extraction_due_at = now + EXTRACTION_LEASE
+        session.add(resume)
+        jobs.append({
+            "id": resume.id,
+            "path": resume.storage_path,
+            "filename": resume.filename,
+            "content_type": resume.content_type,
+            "content_hash": resume.content_hash,
+            "attempts": resume.extraction_attempts,
+        })
+    session.commit()
+    return jobs
+
+
+def _already_extracted(session: Session, content_hashes: set[str]) -> dict[str, tuple[str, str]]:
+    """content_hash -> (text, stats JSON) for blobs some other resume already extracted."""
+    if not content_hashes:
+        return {}
+    rows = session.exec(
+        select(Resume.content_hash, Resume.extracted_text, Resume.text_stats)
+        .where(Resume.content_hash.in_(content_hashes), Resume.extraction_status == DONE)
+    ).all()
+    return {content_hash: (text, stats) for content_hash, text, stats in rows}
+
+
+def attach_skills(session: Session, candidate_id: int, skills) -> list[Skill]:
+    """
+    Add the canonical skills in `skills` that the candidate does not list yet.
+
+    Names are compared case-insensitively; categories come from the vocabulary.
+    Returns the new Skill rows. The caller commits.
+    """
+    existing = {
+        name.lower() for name in session.exec(select(Skill.name).where(Skill.candidate_id == candidate_id)).all()
+    }
+    matcher = get_skill_matcher()
+    created = []
+    for name in skills:
+        if name.lower() in existing:
+            continue
+        existing.add(name.lower())
+        skill = Skill(candidate_id=candidate_id, name=name, category=matcher.category(name))
+        session.add(skill)
+        created.append(skill)
+    return created
+
+
+def _store_success(session: Session, resume_id: int, text: str, stats_json: str) -> None:
+    resume = session.get(Resume, resume_id)
+    if resume is None:
+        return  # deleted meanwhile
+    if SKILL_AUTO_ATTACH:
+        attach_skills(session, resume.candidate_id, json.loads(stats_json).get("skills", {}))
+    resume.extracted_text = text
+    resume.text_stats = stats_json
+    resume.extraction_status = DONE
+    resume.extraction_error = None
+    resume.extraction_due_at = None
+    resume.extracted_at = datetime.utcnow()
+    session.add(resume)
+
+
+def _store_failure(session: Session, resume_id: int, attempts: int, error: str, retry: bool) -> None:
+    resume = session.get(Resume, resume_id)
+    if resume is None:
+        return
+    resume.extraction_error = error[:500]
+    if retry and attempts < EXTRACTION_MAX_ATTEMPTS:
+        resume.extraction_status = PENDING
+        resume.extraction_due_at = datetime.utcnow() + RETRY_BASE_DELAY * (2 ** (attempts - 1))
+    else:
+        resume.extraction_status = FAILED
+        resume.extraction_due_at = None
+    session.add(resume)
+
+
+class ResumeExtractionWorker:
+    """Background thread feeding claimed resumes to a bounded process pool."""
+
+    def __init__(self, batch_size: int = EXTRACTION_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._broken = False
+        self.stats = {"extracted": 0, "reused": 0, "retried": 0, "failed": 0}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._pool = _new_pool()
+        self._thread = threading.Thread(target=self._run, name="resume-extraction", daemon=True)
+        self._thread.start()
+        logger.info(f"[RESUME_EXTRACT] Worker started with {EXTRACTION_WORKERS} processes")
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=EXTRACTION_TIMEOUT_SECONDS)
+            self._thread = None
+        if self._pool is not None:
+            _discard_pool(self._pool)
+            self._pool = None
+
+    def notify(self) -> None:
+        """Wake the worker now (e.g. right after an upload)."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                claimed = self.process_batch()
+            except Exception as e:
+                logger.error(f"[RESUME_EXTRACT] Batch failed: {e}", exc_info=True)
+                if isinstance(e, BrokenProcessPool):
+                    _discard_pool(self._pool)
+                    self._pool = _new_pool()
+                claimed = 0
+            if not claimed:
+                self._wake.wait(EXTRACTION_POLL_SECONDS)
+                self._wake.clear()
+
+    def process_batch(self) -> int:
+        """Claim one batch, extract it and store the results. Returns how many were claimed."""
+        with Session(engine) as session:
+            jobs = claim_due_resumes(session, self.batch_size)
+            if not jobs:
+                return 0
+            reusable = _already_extracted(session, {job["content_hash"] for job in jobs if job["content_hash"]})
+
+        futures = {}
+        with Session(engine) as session:
+            for job in jobs:
+                if job["content_hash"] in reusable:
+                    _store_success(session, job["id"], *reusable[job["content_hash"]])
+                    self.stats["reused"] += 1
+                else:
+                    future = self._pool.submit(extract_resume_text_and_skills, job["path"], job["filename"], job["content_type"])
+                    futures[future] = job
+            session.commit()
+
+        if futures:
+            done, not_done = wait(futures, timeout=EXTRACTION_TIMEOUT_SECONDS * len(futures) / EXTRACTION_WORKERS)
+            with Session(engine) as session:
+                for future in done:
+                    self._record(session, futures[future], future)
+                for future in not_done:
+                    self._record_failure(session, futures[future], "Extraction timed out", retry=True)
+                session.commit()
+            if not_done or self._broken:
+                # A stuck or crashed process would block the pool for good; kill it and start afresh
+                _discard_pool(self._pool)
+                self._pool = _new_pool()
+                self._broken = False
+
+        logger.info(f"[RESUME_EXTRACT] Processed {len(jobs)} resumes ({len(jobs) - len(futures)} reused)")
+        return len(jobs)
+
+    def _record(self, session: Session, job: dict, future) -> None:
+        try:
+            text, stats = future.result()
+        except ExtractionError as e:
+            self._record_failure(session, job, str(e), retry=False)
+        except Exception as e:
+            # Missing file, crashed worker process (BrokenProcessPool), parser bug: try again later
+            self._record_failure(session, job, f"{type(e).__name__}: {e}", retry=True)
+            if isinstance(e, BrokenProcessPool):
+                self._broken = True
+        else:
+            _store_success(session, job["id"], text, json.dumps(stats))
+            self.stats["extracted"] += 1
+
+    def _record_failure(self, session: Session, job: dict, error: str, retry: bool) -> None:
+        _store_failure(session, job["id"], job["attempts"], error, retry)
+        will_retry = retry and job["attempts"] < EXTRACTION_MAX_ATTEMPTS
+        self.stats["retried" if will_retry else "failed"] += 1
+        logger.warning(
+            f"[RESUME_EXTRACT] Resume {job['id']} attempt {job['attempts']} failed: {error}"
+            f"{' (will retry)' if will_retry else ''}"
+        )
+
+
+_worker: Optional[ResumeExtractionWorker] = None
+
+
+def start_resume_extraction() -> None:
+    """Start this process's extraction worker (called on app startup)."""
+    global _worker
+    if not EXTRACTION_ENABLED or _worker is not None:
+        return
+    _worker = ResumeExtractionWorker()
+    _worker.start()
+
+
+def stop_resume_extraction() -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
+
+
+def notify_resume_extraction() -> None:
+    """Tell the worker a new resume is waiting (no-op when extraction is disabled)."""
+    if _worker is not None:
+        _worker.notify()
+
+
+def resume_extraction_stats() -> dict:
+    return {"enabled": _worker is not None, **(_worker.stats if _worker else {})}
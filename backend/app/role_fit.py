@@ -0,0 +1,257 @@
+"""
+Rule-based role-fit scoring, for one candidate or the whole pool at once.
+
+The rules are split per input (product, primary role, years of experience), and
+each rule depends on a single candidate column. For a batch that means a rule
+only has to be evaluated once per *distinct* value of its column (a handful of
+products and roles, a few dozen experience values), and a candidate's score is
+BASE plus three table lookups.
+
+The inputs live in a CandidateColumns snapshot: parallel lists loaded with one
+narrow SELECT, with text columns dictionary-encoded as integer codes. The
+snapshot is reused until the candidate table's version (count, sum of
+Candidate.version, max id) changes, so scoring 10k candidates touches no ORM
+objects and runs one cheap aggregate query per request.
+
+A candidate's product author is taken from the roles ontology (roles.json),
+since profiles store only the product.
+"""
+
+import heapq
+import threading
+from typing import Iterable, Optional
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from .models import Candidate
+from .routers.job_roles import load_roles_data, roles_file_version
+
+ROLE_FIT_BASE = 50
+PRODUCT_AUTHOR_POINTS = 20
+PRODUCT_POINTS = 15
+SENIOR_POINTS, SENIOR_YEARS = 10, 7
+MID_POINTS, MID_YEARS = 5, 3
+PRIMARY_ROLE_POINTS = 5
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    return value.strip().lower() if value else None
+
+
+_authors_cache: dict[tuple[int, int], dict[str, str]] = {}
+
+
+def product_authors() -> dict[str, str]:
+    """Lowercase product name -> lowercase product author, from roles.json."""
+    version = roles_file_version()
+    authors = _authors_cache.get(version)
+    if authors is None:
+        authors = {
+            product.lower(): author.lower()
+            for author, entry in load_roles_data().get("product_authors", {}).items()
+            for product in entry.get("products", {})
+        }
+        _authors_cache.clear()
+        _authors_cache[version] = authors
+    return authors
+
+
+class RoleSpec:
+    """The role being scored against, normalized once."""
+
+    def __init__(self, product_author: str, product: str, job_role: str):
+        self.product_author = _lower(product_author)
+        self.product = _lower(product)
+        self.job_role = _lower(job_role)
+
+
+# ----------------------------------------------------------------------------
+# Rules: (points, factors) from one candidate column each
+# ----------------------------------------------------------------------------
+
+def product_rule(product: Optional[str], role: RoleSpec, authors: dict[str, str]) -> tuple[int, dict]:
+    product = _lower(product)
+    author_match = bool(product) and authors.get(product) == role.product_author
+    product_match = bool(product) and product == role.product
+    points = (PRODUCT_AUTHOR_POINTS if author_match else 0) + (PRODUCT_POINTS if product_match else 0)
+    return points, {"product_author_match": author_match, "product_match": product_match}
+
+
+def experience_rule(years: Optional[int]) -> tuple[int, dict]:
+    if not years:
+        return 0, {}
+    if years >= SENIOR_YEARS:
+        return SENIOR_POINTS, {"experience_level": "senior"}
+    if years >= MID_YEARS:
+        return MID_POINTS, {"experience_level": "mid"}
+    return 0, {"experience_level": "junior"}
+
+
+def primary_role_rule(primary_role: Optional[str], role: RoleSpec) -> tuple[int, dict]:
+    # preference boost if role matches primary_role text (very rough)
+    aligned = bool(primary_role) and bool(role.job_role) and role.job_role in primary_role.lower()
+    return (PRIMARY_ROLE_POINTS if aligned else 0), {"primary_role_alignment": aligned}
+
+
+def role_fit(
+    product: Optional[str],
+    primary_role: Optional[str],
+    years_experience: Optional[int],
+    role: RoleSpec,
+) -> tuple[int, dict]:
+    """Score (0-100) and factor breakdown for one candidate."""
+    authors = product_authors()
+    score, factors = ROLE_FIT_BASE, {}
+    for points, rule_factors in (
+        product_rule(product, role, authors),
+        experience_rule(years_experience),
+        primary_role_rule(primary_role, role),
+    ):
+        score += points
+        factors.update(rule_factors)
+    return max(0, min(100, score)), factors
+
+
+# ----------------------------------------------------------------------------
+# Column snapshot of the candidate pool
+# ----------------------------------------------------------------------------
+
+class _Dictionary:
+    """Dictionary encoding for a text column: code 0 is None/empty."""
+
+    def __init__(self):
+        self.values: list[Optional[str]] = [None]
+        self._codes: dict[str, int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        if not value:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class CandidateColumns:
+    """Role-fit inputs and filter columns for every candidate, as parallel lists."""
+
+    def __init__(self, rows: Iterable[tuple]):
+        products, roles, locations, work_types = _Dictionary(), _Dictionary(), _Dictionary(), _Dictionary()
+        self.ids: list[int] = []
+        self.names: list[str] = []
+        self.product_codes: list[int] = []
+        self.role_codes: list[int] = []
+        self.years: list[Optional[int]] = []
+        self.location_codes: list[int] = []
+        self.work_type_codes: list[int] = []
+        for candidate_id, name, product, primary_role, years, location, work_type in rows:
+            self.ids.append(candidate_id)
+            self.names.append(name)
+            self.product_codes.append(products.encode(product))
+            self.role_codes.append(roles.encode(primary_role))
+            self.years.append(years)
+            self.location_codes.append(locations.encode(_lower(location)))
+            self.work_type_codes.append(work_types.encode(_lower(work_type)))
+        self.products = products.values
+        self.roles = roles.values
+        self.locations = locations.values
+        self.work_types = work_types.values
+        self.position = {candidate_id: index for index, candidate_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def select_rows(
+        self,
+        candidate_ids: Optional[list[int]] = None,
+        location: Optional[str] = None,
+        work_type: Optional[str] = None,
+        min_years_experience: Optional[int] = None,
+    ) -> list[int]:
+        """Row indexes passing the filters (each text filter is decided once per distinct value)."""
+        if candidate_ids is not None:
+            rows = sorted({self.position[cid] for cid in candidate_ids if cid in self.position})
+        else:
+            rows = range(len(self.ids))
+        if location:
+            wanted = _lower(location)
+            allowed = [bool(value) and wanted in value for value in self.locations]
+            codes = self.location_codes
+            rows = [row for row in rows if allowed[codes[row]]]
+        if work_type:
+            wanted = _lower(work_type)
+            allowed = [value == wanted for value in self.work_types]
+            codes = self.work_type_codes
+            rows = [row for row in rows if allowed[codes[row]]]
+        if min_years_experience is not None:
+            years = self.years
+            rows = [row for row in rows if (years[row] or 0) >= min_years_experience]
+        return list(rows)
+
+    def scores(self, rows: list[int], role: RoleSpec) -> list[int]:
+        """Role-fit score of each selected row, equal to role_fit() for that candidate."""
+        authors = product_authors()
+        product_points = [product_rule(value, role, authors)[0] for value in self.products]
+        role_points = [primary_role_rule(value, role)[0] for value in self.roles]
+        experience_points = {value: experience_rule(value)[0] for value in set(self.years)}
+        product_codes, role_codes, years = self.product_codes, self.role_codes, self.years
+        return [
+            min(100, ROLE_FIT_BASE + product_points[product_codes[row]] + role_points[role_codes[row]]
+                + experience_points[years[row]])
+            for row in rows
+        ]
+
+
+_snapshot: Optional[tuple[tuple, CandidateColumns]] = None
+_snapshot_lock = threading.Lock()
+
+
+def load_candidate_columns(session: Session) -> CandidateColumns:
+    """The current candidate pool snapshot, reloaded only when a candidate changed."""
+    global _snapshot
+    version = tuple(session.exec(
+        select(func.count(), func.coalesce(func.sum(Candidate.version), 0), func.max(Candidate.id))
+    ).one())
+    cached = _snapshot
+    if cached and cached[0] == version:
+        return cached[1]
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot[0] != version:
+            rows = session.exec(
+                select(
+                    Candidate.id, Candidate.name, Candidate.product, Candidate.primary_role,
+                    Candidate.years_experience, Candidate.location, Candidate.work_type,
+                ).order_by(Candidate.id)
+            ).all()
+            _snapshot = (version, CandidateColumns(rows))
+        return _snapshot[1]
+
+
+def rank_role_fit(
+    columns: CandidateColumns,
+    rows: list[int],
+    role: RoleSpec,
+    limit: int,
+    after: Optional[tuple[float, int]] = None,
+    min_score: Optional[float] = None,
+) -> tuple[list[tuple[int, int]], int, bool]:
+    """
+    Rank rows by (score desc, candidate id asc).
+
+    Returns (page of (row, score), number of rows ranked, whether more follow).
+    `after` is the (score, candidate id) of the previous page's last item.
+    """
+    ids = columns.ids
+    ranked = [
+        (-score, ids[row], row)
+        for row, score in zip(rows, columns.scores(rows, role))
+        if min_score is None or score >= min_score
+    ]
+    total = len(ranked)
+    if after is not None:
+        after_key = (-after[0], after[1])
+        ranked = [entry for entry in ranked if (entry[0], entry[1]) > after_key]
+    top = heapq.nsmallest(limit + 1, ranked)
+    return [(row, -negative) for negative, _, row in top[:limit]], total, len(top) > limit
@@ -0,0 +1,130 @@
+"""
+Analytics endpoints: time series of match activity per job, company or recruiter.
+
+Served from the hourly/daily rollups (app/analytics.py), so a request reads at
+most MAX_BUCKETS buckets per metric whatever the size of the history.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session, select
+
+from ..analytics import WATERMARK, bucket_start
+from ..database import get_session
+from ..match_events import FUNNEL_STAGES
+from ..models import AnalyticsRollup, CompanyUser, JobPost, RollupWatermark
+from ..security import require_company_user
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+GRAIN_STEP = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}
+# Rollup table grain each requested grain is read from
+STORED_GRAIN = {"hour": "hour", "day": "day", "week": "day"}
+DEFAULT_BUCKETS = {"hour": 48, "day": 30, "week": 12}
+MAX_BUCKETS = {"hour": 24 * 31, "day": 366, "week": 104}
+
+
+def naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """Query datetimes may carry an offset; rollups are stored as naive UTC."""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def authorize_scope(session: Session, current_user: dict, scope: str, scope_id: Optional[int]) -> int:
+    """Resolve scope_id and check it belongs to the caller's company."""
+    company_id = current_user.get("company_id")
+    if scope == "company":
+        if scope_id is not None and scope_id != company_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your company")
+        return company_id
+    if scope_id is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"scope_id is required for scope={scope}")
+    owner = session.exec(
+        select(JobPost.company_id).where(JobPost.id == scope_id) if scope == "job"
+        else select(CompanyUser.company_id).where(CompanyUser.id == scope_id)
+    ).first()
+    if owner is None or owner != company_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{scope.title()} not found")
+    return scope_id
+
+
+@router.get("/timeseries")
+def get_timeseries(
+    scope: str = Query("company", pattern="^(job|company|recruiter)$"),
+    scope_id: Optional[int] = None,
+    grain: str = Query("day", pattern="^(hour|day|week)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    metrics: Optional[str] = Query(None, description="Comma-separated funnel stages (default: all)"),
+    current_user: dict = Depends(require_company_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Counts of funnel events per hour, day or week for a job, the caller's company
+    or one of its recruiters (company_user id), oldest bucket first.
+
+    Metrics are the funnel stages (applied, shortlisted, asked_to_apply, ...);
+    conversion rates are ratios of two series, e.g. ask_accepted / asked_to_apply
+    by week. Buckets are UTC, weeks start on Monday. Events reach the rollups
+    about a minute after they happen; `as_of` is when the rollups last advanced.
+    """
+    scope_id = authorize_scope(session, current_user, scope, scope_id)
+
+    selected = metrics.split(",") if metrics else list(FUNNEL_STAGES)
+    unknown = [metric for metric in selected if metric not in FUNNEL_STAGES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown metrics {unknown}. Must be among {list(FUNNEL_STAGES)}"
+        )
+
+    since, until = naive_utc(since), naive_utc(until)
+    step = GRAIN_STEP[grain]
+    end = bucket_start(until or datetime.utcnow(), grain) + step
+    start = bucket_start(since, grain) if since else end - DEFAULT_BUCKETS[grain] * step
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="since must be before until")
+    if (end - start) / step > MAX_BUCKETS[grain]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too long: at most {MAX_BUCKETS[grain]} {grain} buckets per request"
+        )
+
+    rows = session.exec(
+        select(AnalyticsRollup.bucket_start, AnalyticsRollup.metric, AnalyticsRollup.count)
+        .where(
+            AnalyticsRollup.grain == STORED_GRAIN[grain],
+            AnalyticsRollup.scope == scope,
+            AnalyticsRollup.scope_id == scope_id,
+            AnalyticsRollup.metric.in_(selected),
+            AnalyticsRollup.bucket_start >= start,
+            AnalyticsRollup.bucket_start < end,
+        )
+    ).all()
+
+    # Dense series: every bucket in range, zero-filled
+    buckets = {}
+    moment = start
+    while moment < end:
+        buckets[moment] = dict.fromkeys(selected, 0)
+        moment += step
+    totals = dict.fromkeys(selected, 0)
+    for stored_bucket, metric, count in rows:
+        buckets[bucket_start(stored_bucket, grain)][metric] += count
+        totals[metric] += count
+
+    as_of = session.exec(select(RollupWatermark.updated_at).where(RollupWatermark.name == WATERMARK)).first()
+
+    return {
+        "scope": scope,
+        "scope_id": scope_id,
+        "grain": grain,
+        "since": start.isoformat(),
+        "until": end.isoformat(),
+        "as_of": as_of.isoformat() if as_of else None,
+        "totals": totals,
+        "buckets": [{"bucket_start": moment.isoformat(), "counts": counts} for moment, counts in buckets.items()],
+    }
@@ -28,8 +28,8 @@ Authentication endpoints: signup, login.
 
 6. Security:
 
- - hash_password() - converts raw password to stored hash
- - verify_password() - checks raw password vs stored hash
+ - hash_password_async() - converts raw password to stored hash (dedicated pool)
+ - verify_and_update_password_async() - checks raw password vs stored hash, rehashing outdated ones
  - create_access_token() - generates JWT
 
 
@@ -37,41 +37,33 @@ Authentication endpoints: signup, login.
 
 import logging
 from datetime import timedelta
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Header, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 from ..database import get_session
 from ..models import User, Candidate, CompanyAccount, CompanyUser
+from ..push import publish_feed_candidate
 from ..schemas import SignUpRequest, LoginRequest, LoginResponse
-from ..security import hash_password, verify_password, create_access_token
+from ..security import (
+    hash_password_async, verify_and_update_password_async, create_access_token, bearer_token,
+    decode_token_cached, revoke_token
+)
 
 logger = logging.getLogger(__name__)
 # All endpoints start with /auth
 router = APIRouter(prefix="/auth", tags=["auth"])
 logger.info("Auth router initialized")
 
-#creates a new user for candidate or the company 
-@router.post("/signup", response_model=dict)
-def signup(req: SignUpRequest, session: Session = Depends(get_session)):
-    """
-    Sign up a new user (candidate or company).
-    Returns success message - user can immediately login.
-    """
-    email_lower = req.email.lower()
-    logger.info(f"[SIGNUP] Starting signup for email: {email_lower}, type: {req.user_type}")
-    
-    # Check if user already exists
-    existing_user = session.exec(
-        select(User).where(User.email == email_lower)
-    ).first()
-    
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
+def find_user_by_email(session: Session, email: str) -> User | None:
+    return session.exec(select(User).where(User.email == email)).first()
+
+
+def validate_signup_request(req: SignUpRequest) -> None:
+    """Reject invalid user types / company roles before any hashing or writes."""
     # Validate user type
     if req.user_type not in ["candidate", "company"]:
         raise HTTPException(
@@ -93,76 +85,160 @@ def signup(req: SignUpRequest, session: Session = Depends(get_session)):
                 detail="company_role must be ADMIN, HR, or RECRUITER"
             )
 
-    # Hash password
-    password_hash = hash_password(req.password)
 
-    # Create user
-    new_user = User(
-        email=email_lower,
-        password_hash=password_hash,
-        user_type=req.user_type
-    )
-    session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
-
-    logger.info(f"[SIGNUP] Created User ID {new_user.id} for {email_lower}")
-
-    # Create candidate profile
-    if req.user_type == "candidate":
-        candidate = Candidate(
-            user_id=new_user.id,
-            name="",
+def create_user_records(session: Session, req: SignUpRequest, email_lower: str, password_hash: str) -> int:
+    """
+    Create the User and its candidate or company profile in one transaction.
+    
+    Rows are flushed to obtain their ids and committed once, so a failure midway
+    leaves nothing behind. A concurrent signup for the same email is reported as
+    "Email already registered". Returns the new user's id.
+    """
+    try:
+        # Create user
+        new_user = User(
             email=email_lower,
-            is_general_info_complete=False
+            password_hash=password_hash,
+            user_type=req.user_type
         )
-        session.add(candidate)
+        session.add(new_user)
+        session.flush()
+        user_id = new_user.id
+
+        # Create candidate profile
+        candidate = None
+        if req.user_type == "candidate":
+            candidate = Candidate(
+                user_id=user_id,
+                name="",
+                email=email_lower,
+                is_general_info_complete=False
+            )
+            session.add(candidate)
+        
+        # Create company profile
+        elif req.user_type == "company":
+            # Create company account
+            company_account = CompanyAccount(
+                company_name="",
+                domain="",
+                hq_location=""
+            )
+            session.add(company_account)
+            session.flush()
+            
+            # Create company user
+            session.add(CompanyUser(
+                user_id=user_id,
+                company_id=company_account.id,
+                first_name="",
+                last_name="",
+                role=req.company_role
+            ))
+        
         session.commit()
-        logger.info(f"[SIGNUP] Created Candidate profile for User ID {new_user.id}")
-    
-    # Create company profile
-    elif req.user_type == "company":
-        # Create company account
-        company_account = CompanyAccount(
-            company_name="",
-            domain="",
-            hq_location=""
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
         )
-        session.add(company_account)
-        session.commit()
-        session.refresh(company_account)
-        
-        # Create company user
-        company_user = CompanyUser(
-            user_id=new_user.id,
-            company_id=company_account.id,
-            first_name="",
-            last_name="",
-            role=req.company_role
+    
+    # A new candidate can show up in company feeds as soon as it has a product
+    if candidate is not None:
+        publish_feed_candidate(session, candidate.id, candidate.product)
+    logger.info(f"[SIGNUP] Created User ID {user_id} ({req.user_type}) for {email_lower}")
+    return user_id
+
+
+#creates a new user for candidate or the company 
+@router.post("/signup", response_model=dict)
+async def signup(req: SignUpRequest, session: Session = Depends(get_session)):
+    """
+    Sign up a new user (candidate or company).
+    Returns success message - user can immediately login.
+    
+    Runs as a coroutine: the password is hashed on the dedicated hashing pool and the
+    short DB steps in the threadpool, so a signup burst cannot starve other routes.
+    """
+    email_lower = req.email.lower()
+    logger.info(f"[SIGNUP] Starting signup for email: {email_lower}, type: {req.user_type}")
+    
+    validate_signup_request(req)
+    
+    # Check if user already exists
+    existing_user = await run_in_threadpool(find_user_by_email, session, email_lower)
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
         )
-        session.add(company_user)
-        session.commit()
-        logger.info(f"[SIGNUP] Created Company Account ID {company_account.id} and CompanyUser for User ID {new_user.id}")
+    
+    # Hash password
+    password_hash = await hash_password_async(req.password)
+    
+    user_id = await run_in_threadpool(create_user_records, session, req, email_lower, password_hash)
     
     return {
         "ok": True,
         "message": f"Signup successful! You can now login with {email_lower}",
-        "user_id": new_user.id,
-        "user_type": new_user.user_type
+        "user_id": user_id,
+        "user_type": req.user_type
     }
 
+
+def build_login_claims(session: Session, user: User, upgraded_hash: str | None) -> dict:
+    """JWT claims for a verified user; also stores a rehashed password if parameters changed."""
+    # Create JWT token with user claims
+    token_data = {
+        "sub": user.email,
+        "user_id": user.id,
+        "user_type": user.user_type
+    }
+    
+    # Principal ids ride along in the token so requests skip the profile lookup
+    if user.user_type == "candidate":
+        candidate_id = session.exec(
+            select(Candidate.id).where(Candidate.user_id == user.id)
+        ).first()
+        if candidate_id is not None:
+            token_data["candidate_id"] = candidate_id
+    
+    # Add company role if company user
+    if user.user_type == "company":
+        company_user = session.exec(
+            select(CompanyUser).where(CompanyUser.user_id == user.id)
+        ).first()
+        if company_user:
+            token_data["company_role"] = company_user.role
+            token_data["company_id"] = company_user.company_id
+            token_data["company_user_id"] = company_user.id
+    
+    # Transparent rehash when the Argon2 parameters have changed
+    if upgraded_hash:
+        user.password_hash = upgraded_hash
+        session.add(user)
+        session.commit()
+        logger.info(f"[LOGIN] Upgraded password hash parameters for user_id: {token_data['user_id']}")
+    
+    return token_data
+
+
 #verifies the credentials and returns a jwt token
 @router.post("/login", response_model=LoginResponse)
-def login(req: LoginRequest, session: Session = Depends(get_session)):
+async def login(req: LoginRequest, session: Session = Depends(get_session)):
     """
     Login with email and password.
     Returns JWT access token immediately.
+    
+    Password verification runs on the dedicated hashing pool (503 + Retry-After when
+    it is saturated); DB steps run in the threadpool.
     """
     email_lower = req.email.lower()
     logger.info(f"[LOGIN] Login attempt for: {email_lower}")
     
     # Find user from the database 
-    user = session.exec(select(User).where(User.email == email_lower)).first()
+    user = await run_in_threadpool(find_user_by_email, session, email_lower)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -170,7 +246,8 @@ def login(req: LoginRequest, session: Session = Depends(get_session)):
         )
     
     # Verify password
-    if not verify_password(req.password, user.password_hash):
+    valid, upgraded_hash = await verify_and_update_password_async(req.password, user.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -183,32 +260,29 @@ def login(req: LoginRequest, session: Session = Depends(get_session)):
             detail="Account is deactivated"
         )
     
-    # Create JWT token with user claims
-    token_data = {
-        "sub": user.email,
-        "user_id": user.id,
-        "user_type": user.user_type
-    }
-    
-    # Add company role if company user
-    if user.user_type == "company":
-        company_user = session.exec(
-            select(CompanyUser).where(CompanyUser.user_id == user.id)
-        ).first()
-        if company_user:
-            token_data["company_role"] = company_user.role
-            token_data["company_id"] = company_user.company_id
-    
+    token_data = await run_in_threadpool(build_login_claims, session, user, upgraded_hash)
     access_token = create_access_token(token_data)
     
     return LoginResponse(
         access_token=access_token,
         token_type="bearer",
-        user_id=user.id,
-        user_type=user.user_type,
+        user_id=token_data["user_id"],
+        user_type=token_data["user_type"],
         message=f"Login successful!"
     )
 
+#revokes the caller's token so it stops working before it expires
+@router.post("/logout", response_model=dict)
+def logout(authorization: Optional[str] = Header(None)):
+    """
+    Logout: revoke the bearer token used for this request.
+    """
+    token = bearer_token(authorization)
+    claims = decode_token_cached(token)
+    revoke_token(token)
+    logger.info(f"[LOGOUT] Token revoked for user_id: {claims.get('user_id')}")
+    return {"ok": True, "message": "Logged out"}
+
 #simple test endpoint to verify the auth router is working
 @router.get("/test")
 def test_auth():
@@ -1,12 +1,14 @@
 from pathlib import Path
 import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from fastapi.responses import FileResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import defer
 from sqlmodel import Session, select
 
-from ..database import get_session
-from ..models import Candidate, Skill, Certification, Resume, SocialLink, User, Application, JobPost, CandidateJobPreference
+from ..database import get_session, iter_with_session
+from ..models import Candidate, Skill, Certification, Resume, SocialLink, User, Application, JobPost, CandidateJobPreference, CompanyAccount
 from ..schemas import (
     CandidateCreate,
     CandidateRead,
@@ -19,15 +21,36 @@ from ..schemas import (
     SocialLinkRead,
     RoleFitRequest,
     RoleFitResponse,
+    RoleFitBatchRequest,
+    RoleFitBatchItem,
+    RoleFitBatchResponse,
     ResumeRead,
+    ResumeTextRead,
+    SkillSuggestion,
+    SkillSuggestionAccept,
     ApplicationListRead,
     MatchScoreDisplay,
     CandidateReadWithPreferences,
     CandidateJobPreferenceRead,
 )
-from ..security import get_current_user, get_current_user_email, require_candidate
+from ..security import get_current_user, get_current_user_email, require_candidate, require_company_user
+from ..principals import get_current_candidate, get_current_candidate_id, resolve_candidate_id
 from ..matching import calculate_match_score
+from ..admission import admit
+from ..uploads import FILE_UPLOAD_OPENAPI, RESUME_MAX_BYTES, stream_multipart_file_to_temp
+from ..blob_store import BLOB_TMP_DIR, add_blob_reference, is_blob, release_blob_reference, serve_file
+from ..resume_extraction import attach_skills, notify_resume_extraction
+from ..skill_extraction import extract_skills, get_skill_matcher
+from ..text_extraction import tokenize
 from ..recommendation_engine import RecommendationEngine
+from ..responses import FastJSONResponse, STREAM_MODE_PATTERN, stream_json
+from ..etags import etag_matches, make_etag, not_modified
+from ..fieldsets import CANDIDATE_FIELDS, candidate_columns, parse_fields, project_candidate
+from ..pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, keyset_paginate, split_page, with_next_cursor
+)
+from ..role_fit import RoleSpec, load_candidate_columns, rank_role_fit, role_fit
+from ..push import publish_feed_candidate
 
 router = APIRouter(prefix="/candidates", tags=["candidates"])
 logger = logging.getLogger(__name__)
@@ -43,17 +66,33 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 
 @router.get("/me", response_model=CandidateRead)
 def get_my_profile(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(require_candidate),
     session: Session = Depends(get_session)
 ):
-    """Get authenticated candidate's profile."""
+    """
+    Get authenticated candidate's profile.
+    
+    Sends an ETag derived from the candidate's version; a matching If-None-Match
+    gets 304 after a single version lookup.
+    """
     try:
         user_id = current_user.get("user_id")
         logger.info(f"[CANDIDATES] GET /me called for user_id: {user_id}")
         
-        candidate = session.exec(
-            select(Candidate).where(Candidate.user_id == user_id)
-        ).first()
+        candidate_id = resolve_candidate_id(session, current_user)
+        candidate = None
+        if candidate_id is not None:
+            if if_none_match:
+                version = session.exec(
+                    select(Candidate.version).where(Candidate.id == candidate_id)
+                ).first()
+                if version is not None:
+                    etag = make_etag("candidate", candidate_id, version)
+                    if etag_matches(if_none_match, etag):
+                        return not_modified(etag)
+            candidate = session.get(Candidate, candidate_id)
         
         if not candidate:
             logger.info(f"[CANDIDATES] No candidate found for user_id {user_id}, creating one")
@@ -77,8 +116,10 @@ def get_my_profile(
             session.commit()
             session.refresh(candidate)
             logger.info(f"[CANDIDATES] Candidate created for user_id: {user_id}")
+            publish_feed_candidate(session, candidate.id, candidate.product)
         
         logger.info(f"[CANDIDATES] Returning candidate profile for user_id: {user_id}")
+        response.headers["ETag"] = make_etag("candidate", candidate.id, candidate.version)
         return candidate
     except Exception as e:
         logger.error(f"[CANDIDATES] Error in GET /me: {str(e)}", exc_info=True)
@@ -88,22 +129,11 @@ def get_my_profile(
 @router.put("/me", response_model=CandidateRead)
 def update_my_profile(
     update: CandidateProfileUpdate,
-    current_user: dict = Depends(require_candidate),
+    candidate: Candidate = Depends(get_current_candidate),
     session: Session = Depends(get_session)
 ):
     """Update authenticated candidate's profile."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
+    previous_product = candidate.product
     # Update only provided fields
     for field, value in update.model_dump(exclude_unset=True).items():
         setattr(candidate, field, value)
@@ -112,6 +142,10 @@ def update_my_profile(
     session.commit()
     session.refresh(candidate)
     
+    # A new product can put the candidate in other companies' feeds
+    if candidate.product != previous_product:
+        publish_feed_candidate(session, candidate.id, candidate.product)
+    
     return candidate
 
 
@@ -129,87 +163,177 @@ def get_candidate(candidate_id: int, session: Session = Depends(get_session)):
     return candidate
 
 
+# Candidates are loaded (and streamed) in batches of this size
+CANDIDATE_BATCH_SIZE = 500
+
+
+def load_candidate_collections(
+    session: Session,
+    candidate_ids: list[int],
+    include_skills: bool = True,
+    include_preferences: bool = True
+) -> tuple[dict[int, list[SkillRead]], dict[int, list[CandidateJobPreferenceRead]]]:
+    """
+    Load skills and job preferences for a batch of candidates.
+    
+    Each collection is fetched with a single IN query for the whole batch (and
+    skipped entirely when not needed) instead of two queries per candidate.
+    """
+    skills_by_candidate: dict[int, list[SkillRead]] = {}
+    if include_skills:
+        for skill in session.exec(
+            select(Skill).where(Skill.candidate_id.in_(candidate_ids))
+        ).all():
+            skills_by_candidate.setdefault(skill.candidate_id, []).append(SkillRead(
+                id=skill.id,
+                name=skill.name,
+                rating=skill.rating,
+                level=skill.level,
+                category=skill.category
+            ))
+    
+    preferences_by_candidate: dict[int, list[CandidateJobPreferenceRead]] = {}
+    if include_preferences:
+        for pref in session.exec(
+            select(CandidateJobPreference).where(
+                CandidateJobPreference.candidate_id.in_(candidate_ids)
+            )
+        ).all():
+            preferences_by_candidate.setdefault(pref.candidate_id, []).append(CandidateJobPreferenceRead(
+                id=pref.id,
+                candidate_id=pref.candidate_id,
+                preference_name=pref.preference_name or "",
+                product=pref.product or "",
+                primary_role=pref.primary_role or "",
+                years_experience=pref.years_experience or 0,
+                rate_min=pref.rate_min,
+                rate_max=pref.rate_max,
+                work_type=pref.work_type or "",
+                location=pref.location or "",
+                availability=pref.availability or "",
+                summary=pref.summary or "",
+                required_skills=pref.required_skills or "",  # Keep as string (JSON)
+                is_active=pref.is_active or False,
+                created_at=pref.created_at,
+                updated_at=pref.updated_at,
+            ))
+    
+    return skills_by_candidate, preferences_by_candidate
+
+
+def build_candidates_with_preferences(session: Session, batch: list[Candidate]) -> list[CandidateReadWithPreferences]:
+    """Build CandidateReadWithPreferences for a batch of candidates."""
+    skills_by_candidate, preferences_by_candidate = load_candidate_collections(
+        session, [candidate.id for candidate in batch]
+    )
+    
+    return [
+        CandidateReadWithPreferences(
+            id=candidate.id,
+            user_id=candidate.user_id,
+            name=candidate.name or "",
+            email=candidate.email or "",
+            location=candidate.location or "",
+            profile_picture_path=candidate.profile_picture_path,
+            summary=candidate.summary or "",
+            years_experience=candidate.years_experience or 0,
+            rate_min=candidate.rate_min,
+            rate_max=candidate.rate_max,
+            work_type=candidate.work_type or "",
+            availability=candidate.availability or "",
+            status="active",
+            created_at=candidate.created_at,
+            updated_at=candidate.updated_at,
+            skills=skills_by_candidate.get(candidate.id, []),
+            job_preferences=preferences_by_candidate.get(candidate.id, [])
+        )
+        for candidate in batch
+    ]
+
+
+def project_candidates(session: Session, rows: list, fields: list[str]) -> list[dict]:
+    """Render projected candidate rows, loading only the nested collections named in fields."""
+    skills_by_candidate, preferences_by_candidate = load_candidate_collections(
+        session,
+        [row.id for row in rows],
+        include_skills="skills" in fields,
+        include_preferences="job_preferences" in fields
+    )
+    
+    result = []
+    for row in rows:
+        item = project_candidate(row, fields)
+        if "skills" in fields:
+            item["skills"] = skills_by_candidate.get(row.id, [])
+        if "job_preferences" in fields:
+            item["job_preferences"] = preferences_by_candidate.get(row.id, [])
+        result.append(item)
+    return result
+
+
+def build_candidate_page(session: Session, rows: list, fields: Optional[list[str]]) -> list:
+    """Build full objects, or projections when a fieldset was requested."""
+    if fields:
+        return project_candidates(session, rows, fields)
+    return build_candidates_with_preferences(session, rows)
+
+
+def iter_candidates_with_preferences(
+    session: Session,
+    fields: Optional[list[str]] = None,
+    batch_size: int = CANDIDATE_BATCH_SIZE
+):
+    """Yield every candidate, newest first, via a server-side cursor (projected when fields are given)."""
+    statement = select(*candidate_columns(fields)) if fields else select(Candidate)
+    candidates = session.exec(
+        statement
+        .order_by(Candidate.created_at.desc(), Candidate.id.desc())
+        .execution_options(yield_per=batch_size)
+    )
+    for batch in candidates.partitions():
+        yield from build_candidate_page(session, batch, fields)
+        # Release the batch so memory stays flat while streaming
+        session.expunge_all()
+
+
 @router.get("/list/all", response_model=list[CandidateReadWithPreferences])
 def list_all_candidates(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: Optional[str] = Query(None, pattern=STREAM_MODE_PATTERN),
+    fields: Optional[str] = None,
     session: Session = Depends(get_session)
 ):
-    """List all candidates with their job preferences (for company users to browse)."""
+    """
+    List candidates with their job preferences (for company users to browse), newest first.
+    
+    Paged by (created_at, id): pass the X-Next-Cursor response header back as `cursor`
+    to fetch the next page. stream=array or stream=ndjson instead streams every
+    candidate in one response and ignores cursor/limit.
+    fields=id,name,skills,... returns only those fields; skills and job_preferences
+    are only loaded when named.
+    """
     try:
-        logger.info("[CANDIDATES] GET /list/all called")
+        logger.info(f"[CANDIDATES] GET /list/all called (stream={stream}, limit={limit}, fields={fields})")
+        fieldset = parse_fields(fields, CANDIDATE_FIELDS)
         
-        # Get all candidates
-        candidates = session.exec(select(Candidate)).all()
+        if stream:
+            return stream_json(iter_with_session(iter_candidates_with_preferences, fields=fieldset), stream)
         
-        result = []
-        for candidate in candidates:
-            # Get job preferences for this candidate
-            preferences = session.exec(
-                select(CandidateJobPreference).where(
-                    CandidateJobPreference.candidate_id == candidate.id
-                )
-            ).all()
-            
-            # Format preferences
-            preferences_data = []
-            for pref in preferences:
-                preferences_data.append(CandidateJobPreferenceRead(
-                    id=pref.id,
-                    candidate_id=pref.candidate_id,
-                    preference_name=pref.preference_name or "",
-                    product=pref.product or "",
-                    primary_role=pref.primary_role or "",
-                    years_experience=pref.years_experience or 0,
-                    rate_min=pref.rate_min,
-                    rate_max=pref.rate_max,
-                    work_type=pref.work_type or "",
-                    location=pref.location or "",
-                    availability=pref.availability or "",
-                    summary=pref.summary or "",
-                    required_skills=pref.required_skills or "",  # Keep as string (JSON)
-                    is_active=pref.is_active or False,
-                    created_at=pref.created_at,
-                    updated_at=pref.updated_at,
-                ))
-            
-            # Get skills for this candidate
-            skills = session.exec(
-                select(Skill).where(Skill.candidate_id == candidate.id)
-            ).all()
-            
-            skills_data = [
-                SkillRead(
-                    id=skill.id,
-                    name=skill.name,
-                    rating=skill.rating,
-                    level=skill.level,
-                    category=skill.category
-                ) for skill in skills
-            ]
-            
-            # Create candidate with preferences
-            result.append(CandidateReadWithPreferences(
-                id=candidate.id,
-                user_id=candidate.user_id,
-                name=candidate.name or "",
-                email=candidate.email or "",
-                location=candidate.location or "",
-                profile_picture_path=candidate.profile_picture_path,
-                summary=candidate.summary or "",
-                years_experience=candidate.years_experience or 0,
-                rate_min=candidate.rate_min,
-                rate_max=candidate.rate_max,
-                work_type=candidate.work_type or "",
-                availability=candidate.availability or "",
-                status="active",
-                created_at=candidate.created_at,
-                updated_at=candidate.updated_at,
-                skills=skills_data,
-                job_preferences=preferences_data
-            ))
+        statement = select(*candidate_columns(fieldset)) if fieldset else select(Candidate)
+        key_columns = (Candidate.created_at, Candidate.id)
+        candidates = session.exec(
+            keyset_paginate(statement, key_columns, cursor, limit)
+        ).all()
+        page, next_cursor = split_page(candidates, limit, lambda c: (c.created_at, c.id))
+        
+        result = build_candidate_page(session, page, fieldset)
         
         logger.info(f"[CANDIDATES] Returning {len(result)} candidates with preferences")
-        return result
+        return with_next_cursor(FastJSONResponse(result), next_cursor)
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[CANDIDATES] Error in GET /list/all: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -218,7 +342,7 @@ def list_all_candidates(
         )
 
 
-@router.get("/me/recommendations", tags=["candidates"])
+@router.get("/me/recommendations", tags=["candidates"], dependencies=[Depends(admit("candidates.recommendations"))])
 def get_candidate_recommendations(
     top_n: int = 10,
     current_user: dict = Depends(get_current_user),
@@ -234,13 +358,11 @@ def get_candidate_recommendations(
     """
     try:
         user_email = current_user.get("email")
-        user_id = current_user.get("user_id")
         logger.info(f"[CANDIDATES] GET /me/recommendations for user {user_email}")
         
         # Get candidate profile
-        candidate = session.exec(
-            select(Candidate).where(Candidate.user_id == user_id)
-        ).first()
+        candidate_id = resolve_candidate_id(session, current_user)
+        candidate = session.get(Candidate, candidate_id) if candidate_id is not None else None
         
         if not candidate:
             raise HTTPException(
@@ -312,12 +434,12 @@ def get_candidate_recommendations(
         )
         
         logger.info(f"[CANDIDATES] Returning {len(recommendations)} job recommendations")
-        return {
+        return FastJSONResponse({
             'candidate_id': candidate.id,
             'candidate_name': candidate.name,
             'total_recommendations': len(recommendations),
             'recommendations': recommendations
-        }
+        })
         
     except HTTPException:
         raise
@@ -331,22 +453,10 @@ def get_candidate_recommendations(
 
 @router.get("/me/general-info-status", tags=["candidates"])
 def check_general_info_status(
-    current_user: dict = Depends(require_candidate),
+    candidate: Candidate = Depends(get_current_candidate),
     session: Session = Depends(get_session)
 ):
     """Check if candidate has completed general information setup."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     return {
         "is_general_info_complete": candidate.is_general_info_complete,
         "has_required_fields": bool(candidate.name and candidate.email and candidate.phone),
@@ -361,24 +471,12 @@ def check_general_info_status(
 @router.post("/me/skills", response_model=SkillRead)
 def add_skill(
     skill: SkillCreate,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Add a skill to candidate profile."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     new_skill = Skill(
-        candidate_id=candidate.id,
+        candidate_id=candidate_id,
         name=skill.name,
         level=skill.level,
         category=skill.category
@@ -392,51 +490,85 @@ def add_skill(
 
 @router.get("/me/skills", response_model=list[SkillRead])
 def list_my_skills(
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Get all skills for authenticated candidate."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     skills = session.exec(
-        select(Skill).where(Skill.candidate_id == candidate.id)
+        select(Skill).where(Skill.candidate_id == candidate_id)
     ).all()
     
     return [SkillRead(id=s.id, name=s.name, level=s.level, category=s.category) for s in skills]
 
 
+@router.get("/me/skills/suggestions", response_model=list[SkillSuggestion])
+def suggest_skills(
+    resume_id: Optional[int] = None,
+    candidate_id: int = Depends(get_current_candidate_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Skills mentioned in a resume (default: the latest extracted one) that are not on the profile yet.
+    
+    The skills were found when the resume text was extracted in the background.
+    """
+    if resume_id is not None:
+        resume = get_own_resume(session, resume_id, candidate_id)
+    else:
+        resume = session.exec(
+            select(Resume)
+            .where((Resume.candidate_id == candidate_id) & (Resume.extraction_status == "done"))
+            .order_by(Resume.created_at.desc())
+        ).first()
+    if resume is None or resume.extraction_status != "done":
+        return []
+
+    stats = json.loads(resume.text_stats or "{}")
+    # Resumes extracted before skill extraction existed have no "skills" entry yet
+    mentions = stats["skills"] if "skills" in stats else extract_skills(resume.extracted_text)
+    existing = {
+        name.lower() for name in session.exec(select(Skill.name).where(Skill.candidate_id == candidate_id)).all()
+    }
+    matcher = get_skill_matcher()
+    return [
+        SkillSuggestion(name=name, category=matcher.category(name), mentions=count)
+        for name, count in mentions.items()
+        if name.lower() not in existing
+    ]
+
+
+@router.post("/me/skills/suggestions/accept", response_model=list[SkillRead])
+def accept_skill_suggestions(
+    req: SkillSuggestionAccept,
+    candidate_id: int = Depends(get_current_candidate_id),
+    session: Session = Depends(get_session)
+):
+    """Add suggested skills to the profile in one call (names or aliases from the vocabulary)."""
+    matcher = get_skill_matcher()
+    canonical = [matcher.canonical(name) for name in req.names]
+    unknown = [name for name, skill in zip(req.names, canonical) if skill is None]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown skills: {', '.join(unknown[:10])}"
+        )
+    created = attach_skills(session, candidate_id, canonical)
+    session.commit()
+    return [
+        SkillRead(id=s.id, name=s.name, level=s.level, category=s.category) for s in created
+    ]
+
+
 @router.delete("/me/skills/{skill_id}")
 def remove_skill(
     skill_id: int,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Delete a skill from candidate profile."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     skill = session.exec(
         select(Skill).where(
-            (Skill.id == skill_id) & (Skill.candidate_id == candidate.id)
+            (Skill.id == skill_id) & (Skill.candidate_id == candidate_id)
         )
     ).first()
     
@@ -459,24 +591,12 @@ def remove_skill(
 @router.post("/me/certifications", response_model=CertificationRead)
 def add_certification(
     cert: CertificationCreate,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Add a certification to candidate profile."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     new_cert = Certification(
-        candidate_id=candidate.id,
+        candidate_id=candidate_id,
         name=cert.name,
         issuer=cert.issuer,
         year=cert.year
@@ -490,24 +610,12 @@ def add_certification(
 
 @router.get("/me/certifications", response_model=list[CertificationRead])
 def list_my_certifications(
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Get all certifications for authenticated candidate."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     certs = session.exec(
-        select(Certification).where(Certification.candidate_id == candidate.id)
+        select(Certification).where(Certification.candidate_id == candidate_id)
     ).all()
     
     return [CertificationRead(id=c.id, name=c.name, issuer=c.issuer, year=c.year) for c in certs]
@@ -520,24 +628,12 @@ def list_my_certifications(
 @router.post("/me/social-links", response_model=SocialLinkRead)
 def add_social_link(
     social_link: SocialLinkCreate,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Add a social media or portfolio link."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found"
-        )
-    
     new_link = SocialLink(
-        candidate_id=candidate.id,
+        candidate_id=candidate_id,
         platform=social_link.platform,
         url=social_link.url,
         display_name=social_link.display_name
@@ -557,24 +653,12 @@ def add_social_link(
 
 @router.get("/me/social-links", response_model=list[SocialLinkRead])
 def list_my_social_links(
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Get all social links for authenticated candidate."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found"
-        )
-    
     links = session.exec(
-        select(SocialLink).where(SocialLink.candidate_id == candidate.id)
+        select(SocialLink).where(SocialLink.candidate_id == candidate_id)
     ).all()
     
     return [
@@ -593,26 +677,14 @@ def list_my_social_links(
 def update_social_link(
     social_link_id: int,
     update: SocialLinkCreate,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Update a social link."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found"
-        )
-    
     link = session.exec(
         select(SocialLink).where(
             (SocialLink.id == social_link_id) &
-            (SocialLink.candidate_id == candidate.id)
+            (SocialLink.candidate_id == candidate_id)
         )
     ).first()
     
@@ -642,26 +714,14 @@ def update_social_link(
 @router.delete("/me/social-links/{social_link_id}", status_code=204)
 def delete_social_link(
     social_link_id: int,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Delete a social link."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found"
-        )
-    
     link = session.exec(
         select(SocialLink).where(
             (SocialLink.id == social_link_id) &
-            (SocialLink.candidate_id == candidate.id)
+            (SocialLink.candidate_id == candidate_id)
         )
     ).first()
     
@@ -679,153 +739,206 @@ def delete_social_link(
 # RESUME MANAGEMENT
 # ============================================================================
 
-@router.post("/me/resumes", response_model=ResumeRead)
-async def upload_resume(
-    file: UploadFile = File(...),
-    current_user: dict = Depends(require_candidate),
-    session: Session = Depends(get_session)
-):
-    """Upload a resume file."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
+def store_resume(
+    session: Session,
+    candidate_id: int,
+    filename: str,
+    content_type: Optional[str],
+    temp_path: str,
+    size: int,
+    content_hash: str
+) -> Resume:
+    """Move a finished upload into the blob store and record the Resume, in one transaction."""
+    try:
+        path = add_blob_reference(session, temp_path, content_hash, size)
+        resume = Resume(
+            candidate_id=candidate_id,
+            filename=filename,
+            content_type=content_type,
+            storage_path=str(path),
+            size_bytes=size,
+            content_hash=content_hash,
+        )
+        session.add(resume)
+        session.commit()
+    except Exception:
+        session.rollback()
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    session.refresh(resume)
+    return resume
+
+
+def resume_read(resume: Resume) -> ResumeRead:
+    return ResumeRead(
+        id=resume.id,
+        filename=resume.filename,
+        created_at=resume.created_at.isoformat(),
+        size_bytes=resume.size_bytes,
+        content_hash=resume.content_hash,
+        extraction_status=resume.extraction_status,
+    )
+
+
+def get_own_resume(session: Session, resume_id: int, candidate_id: int) -> Resume:
+    resume = session.exec(
+        select(Resume).where(
+            (Resume.id == resume_id) & (Resume.candidate_id == candidate_id)
+        )
     ).first()
     
-    if not candidate:
+    if not resume:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
+            detail="Resume not found"
         )
-    
-    contents = await file.read()
-    dest_path = UPLOAD_DIR / f"candidate_{candidate.id}_{file.filename}"
-    dest_path.write_bytes(contents)
+    return resume
 
-    resume = Resume(
-        candidate_id=candidate.id,
-        filename=file.filename,
-        content_type=file.content_type,
-        storage_path=str(dest_path),
+
+@router.post("/me/resumes", response_model=ResumeRead, openapi_extra=FILE_UPLOAD_OPENAPI)
+async def upload_resume(
+    request: Request,
+    candidate_id: int = Depends(get_current_candidate_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Upload a resume file (multipart form field `file`).
+    
+    The request body is parsed as it arrives and the file streamed into the blob
+    store's temp directory in chunks, its SHA-256 computed on the way; uploads over
+    APP_RESUME_MAX_BYTES get 413 from their Content-Length or as soon as they cross
+    the limit. Disk and DB work run off the event loop. Files are stored once per
+    content hash, so re-uploading the same bytes costs no disk. Text extraction
+    happens in the background (extraction_status starts "pending").
+    """
+    temp_path, client_filename, content_type, size, content_hash = await stream_multipart_file_to_temp(
+        request, "file", BLOB_TMP_DIR, RESUME_MAX_BYTES
     )
-    session.add(resume)
-    session.commit()
-    session.refresh(resume)
+    filename = Path(client_filename or "resume").name or "resume"
+    resume = await run_in_threadpool(
+        store_resume, session, candidate_id, filename, content_type, temp_path, size, content_hash
+    )
+    logger.info(f"[RESUME_UPLOAD] Candidate {candidate_id} uploaded {filename} ({size} bytes, {content_hash[:12]})")
+    notify_resume_extraction()
 
-    return ResumeRead(id=resume.id, filename=resume.filename, created_at=resume.created_at.isoformat())
+    return resume_read(resume)
 
 
 @router.get("/me/resumes", response_model=list[ResumeRead])
 def list_my_resumes(
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Get all resumes for authenticated candidate."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-
     resumes = session.exec(
-        select(Resume).where(Resume.candidate_id == candidate.id)
+        select(Resume)
+        .where(Resume.candidate_id == candidate_id)
+        .options(defer(Resume.extracted_text))  # can be large; fetched by /text only
     ).all()
     
-    return [ResumeRead(id=r.id, filename=r.filename, created_at=r.created_at.isoformat()) for r in resumes]
+    return [resume_read(r) for r in resumes]
 
 
 @router.get("/me/resumes/{resume_id}/download")
 def download_resume(
     resume_id: int,
-    current_user: dict = Depends(require_candidate),
+    range: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
-    """Download a resume file."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
-    resume = session.exec(
-        select(Resume).where(
-            (Resume.id == resume_id) & (Resume.candidate_id == candidate.id)
-        )
-    ).first()
+    """
+    Download a resume file.
     
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
+    Supports If-None-Match (304 on re-download; the ETag is the content hash) and
+    single byte ranges (206), so large PDFs can be resumed or viewed incrementally.
+    """
+    resume = get_own_resume(session, resume_id, candidate_id)
+    return serve_file(
+        Path(resume.storage_path),
+        filename=resume.filename,
+        media_type=resume.content_type,
+        content_hash=resume.content_hash if is_blob(Path(resume.storage_path)) else None,
+        range_header=range,
+        if_range=if_range,
+        if_none_match=if_none_match,
+    )
 
-    resume_path = Path(resume.storage_path)
-    if not resume_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume file not found on disk"
-        )
 
-    return FileResponse(
-        resume_path,
-        media_type=resume.content_type or "application/octet-stream",
-        filename=resume.filename
+@router.get("/me/resumes/{resume_id}/text", response_model=ResumeTextRead)
+def get_resume_text(
+    resume_id: int,
+    candidate_id: int = Depends(get_current_candidate_id),
+    session: Session = Depends(get_session)
+):
+    """Extracted text and token statistics of a resume (filled in by the background extractor)."""
+    resume = get_own_resume(session, resume_id, candidate_id)
+    return ResumeTextRead(
+        id=resume.id,
+        extraction_status=resume.extraction_status,
+        extracted_at=resume.extracted_at,
+        error=resume.extraction_error,
+        text=resume.extracted_text,
+        stats=json.loads(resume.text_stats) if resume.text_stats else None,
     )
 
 
+@router.delete("/me/resumes/{resume_id}", status_code=204)
+def delete_resume(
+    resume_id: int,
+    candidate_id: int = Depends(get_current_candidate_id),
+    session: Session = Depends(get_session)
+):
+    """Delete a resume; its stored file goes away with the last resume that shares it."""
+    resume = get_own_resume(session, resume_id, candidate_id)
+    if resume.content_hash and is_blob(Path(resume.storage_path)):
+        release_blob_reference(session, resume.content_hash)
+    session.delete(resume)
+    session.commit()
+
+
 # ============================================================================
 # APPLICATIONS MANAGEMENT
 # ============================================================================
 
 @router.get("/me/applications", response_model=list[ApplicationListRead])
 def list_my_applications(
-    current_user: dict = Depends(require_candidate),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
-    """Get all job applications for authenticated candidate."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
+    """
+    Get job applications for authenticated candidate, most recent first.
     
-    applications = session.exec(
-        select(Application).where(Application.candidate_id == candidate.id)
+    Paged by (applied_at, id); pass the X-Next-Cursor response header back as `cursor`.
+    """
+    # Join job and company so each page is a single query
+    statement = (
+        select(Application, JobPost.title, CompanyAccount.company_name)
+        .outerjoin(JobPost, JobPost.id == Application.job_post_id)
+        .outerjoin(CompanyAccount, CompanyAccount.id == JobPost.company_id)
+        .where(Application.candidate_id == candidate_id)
+    )
+    rows = session.exec(
+        keyset_paginate(statement, (Application.applied_at, Application.id), cursor, limit)
     ).all()
+    page, next_cursor = split_page(rows, limit, lambda row: (row[0].applied_at, row[0].id))
     
     result = []
-    for app in applications:
-        job = session.get(JobPost, app.job_post_id)
-        company = session.get(job.company) if job else None
+    for app, job_title, company_name in page:
         result.append(ApplicationListRead(
             id=app.id,
             job_post_id=app.job_post_id,
-            job_title=job.title if job else "Unknown",
-            company_name=company.company_name if company else "Unknown",
+            job_title=job_title or "Unknown",
+            company_name=company_name or "Unknown",
             status=app.status,
             match_score=app.match_score,
             applied_at=app.applied_at.isoformat()
         ))
     
-    return result
+    return with_next_cursor(FastJSONResponse(result), next_cursor)
 
 
 # ============================================================================
@@ -848,47 +961,41 @@ def compute_role_fit(
             detail="Candidate not found"
         )
 
-    # base score
-    score = 50
-    factors: dict[str, object] = {}
-
-    # vendor match
-    if candidate.product_author and candidate.product_author.lower() == req.product_author.lower():
-        score += 20
-        factors["product_author_match"] = True
-    else:
-        factors["product_author_match"] = False
+    score, factors = role_fit(
+        candidate.product,
+        candidate.primary_role,
+        candidate.years_experience,
+        RoleSpec(req.product_author, req.product, req.job_role),
+    )
 
-    # product match
-    if candidate.product and candidate.product.lower() == req.product.lower():
-        score += 15
-        factors["product_match"] = True
-    else:
-        factors["product_match"] = False
-
-    # experience
-    if candidate.years_experience:
-        if candidate.years_experience >= 7:
-            score += 10
-            factors["experience_level"] = "senior"
-        elif candidate.years_experience >= 3:
-            score += 5
-            factors["experience_level"] = "mid"
-        else:
-            factors["experience_level"] = "junior"
-
-    # preference boost if role matches primary_role text (very rough)
-    if candidate.primary_role and req.job_role.lower() in candidate.primary_role.lower():
-        score += 5
-        factors["primary_role_alignment"] = True
-    else:
-        factors["primary_role_alignment"] = False
+    # resume content, once the background extractor has produced it
+    resume_text = None
+    if req.resume_id is not None:
+        resume = session.exec(
+            select(Resume).where((Resume.id == req.resume_id) & (Resume.candidate_id == candidate.id))
+        ).first()
+        if not resume:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resume not found"
+            )
+        factors["resume_extraction_status"] = resume.extraction_status
+        resume_text = resume.extracted_text
+    if resume_text:
+        resume_tokens = set(tokenize(resume_text))
+        for key, phrase, points in (("resume_mentions_product", req.product, 5), ("resume_mentions_role", req.job_role, 5)):
+            phrase_tokens = set(tokenize(phrase))
+            mentioned = bool(phrase_tokens) and phrase_tokens <= resume_tokens
+            factors[key] = mentioned
+            if mentioned:
+                score += points
 
     score = max(0, min(100, score))
 
     notes = (
         "This is a rule-based placeholder fit score. "
-        "In a real implementation, this would use resume parsing + embeddings + ML/LLM-based scoring."
+        + ("Resume text was checked for the product and role. " if resume_text else "")
+        + "In a real implementation, this would use embeddings + ML/LLM-based scoring."
     )
 
     return RoleFitResponse(
@@ -901,3 +1008,46 @@ def compute_role_fit(
         factors=factors,
         notes=notes,
     )
+
+
+@router.post(
+    "/role-fit/batch",
+    response_model=RoleFitBatchResponse,
+    dependencies=[Depends(admit("candidates.role_fit_batch"))]
+)
+def compute_role_fit_batch(
+    req: RoleFitBatchRequest,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: dict = Depends(require_company_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Role-fit scores for many candidates in one call, best first (company users).
+    
+    Scores candidate_ids, or every candidate, narrowed by the optional filters, with the
+    same rules as /{candidate_id}/role-fit (without the resume factors). Ranked by
+    (score desc, candidate id); pass the X-Next-Cursor response header back as `cursor`.
+    """
+    role = RoleSpec(req.product_author, req.product, req.job_role)
+    columns = load_candidate_columns(session)
+    rows = columns.select_rows(req.candidate_ids, req.location, req.work_type, req.min_years_experience)
+    after = decode_cursor(cursor, (float, int)) if cursor else None
+    page, total, has_more = rank_role_fit(columns, rows, role, limit, after, req.min_score)
+
+    items = []
+    for row, score in page:
+        _, factors = role_fit(columns.products[columns.product_codes[row]], columns.roles[columns.role_codes[row]],
+                              columns.years[row], role)
+        items.append(RoleFitBatchItem(candidate_id=columns.ids[row], name=columns.names[row], score=score, factors=factors))
+    logger.info(f"[ROLE_FIT_BATCH] {req.product}/{req.job_role}: ranked {total} of {len(columns)} candidates")
+
+    response = FastJSONResponse(RoleFitBatchResponse(
+        product_author=req.product_author,
+        product=req.product,
+        job_role=req.job_role,
+        total=total,
+        items=items,
+    ))
+    next_cursor = encode_cursor(page[-1][1], columns.ids[page[-1][0]]) if has_more else None
+    return with_next_cursor(response, next_cursor)
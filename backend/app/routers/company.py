@@ -3,16 +3,20 @@ Company endpoints: profiles, employee management, job posting.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session, select
 
 from ..database import get_session
-from ..models import CompanyAccount, CompanyUser, User, JobPost
+from ..models import CompanyAccount, CompanyUser, JobPost
 from ..schemas import (
-    CompanyAccountCreate, CompanyAccountRead, CompanyProfileRead, CompanyUserRead
+    CompanyAccountCreate, CompanyAccountRead, CompanyProfileRead, CompanyUserRead,
+    EmployeeProvision, EmployeeProvisionRequest
 )
 from ..security import (
-    get_current_user, require_company_user, require_company_role
+    get_current_user, hash_passwords_async, require_company_user, require_company_role, revoke_user_tokens
 )
+from ..principals import forget_principal, get_current_company_user_id, resolve_company_user_id
+from ..provisioning import EmployeeProvisioning
 
 router = APIRouter(prefix="/company", tags=["company"])
 
@@ -76,11 +80,8 @@ def get_company_profile(
     """
     Get current user's company profile.
     """
-    user_id = current_user.get("user_id")
-    
-    company_user = session.exec(
-        select(CompanyUser).where(CompanyUser.user_id == user_id)
-    ).first()
+    company_user_id = resolve_company_user_id(session, current_user)
+    company_user = session.get(CompanyUser, company_user_id) if company_user_id is not None else None
     if not company_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -126,57 +127,69 @@ def invite_employee(
     
     Employee must first sign up, then admin invites them to company.
     """
-    user_id = current_user.get("user_id")
     company_id = current_user.get("company_id")
     
     # Check if inviter is admin/hr in company
-    inviter = session.exec(
-        select(CompanyUser).where(CompanyUser.user_id == user_id)
-    ).first()
-    if not inviter or inviter.company_id != company_id:
+    if resolve_company_user_id(session, current_user) is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User not authorized in this company"
         )
     
-    # Find employee user
-    emp_user = session.exec(
-        select(User).where(User.email == employee_email.lower())
-    ).first()
-    if not emp_user or emp_user.user_type != "company":
+    try:
+        entry = EmployeeProvision(
+            email=employee_email, first_name=first_name, last_name=last_name, role=role
+        )
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Employee not found or not a company user type"
+            detail="Invalid employee email"
         )
     
-    # Check if already in company
-    existing = session.exec(
-        select(CompanyUser).where(CompanyUser.user_id == emp_user.id)
-    ).first()
-    if existing:
+    # Link the existing company-type user (no account creation here)
+    provisioning = EmployeeProvisioning(company_id, [entry], create_missing=False)
+    provisioning.plan(session)
+    error = provisioning.first_error()
+    if error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Employee already in a company"
+            detail=error
         )
-    
-    # Create company user record
-    company_user = CompanyUser(
-        user_id=emp_user.id,
-        company_id=company_id,
-        first_name=first_name,
-        last_name=last_name,
-        role=role
-    )
-    session.add(company_user)
-    session.commit()
+    result = provisioning.apply(session, [])["results"][0]
     
     return {
         "ok": True,
-        "company_user_id": company_user.id,
+        "company_user_id": result["company_user_id"],
         "message": f"Employee {employee_email} added with role {role}"
     }
 
 
+@router.post("/employees/bulk", response_model=dict)
+async def provision_employees(
+    req: EmployeeProvisionRequest,
+    current_user: dict = Depends(require_company_role(["HR", "ADMIN"])),
+    company_user_id: int = Depends(get_current_company_user_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Create or link up to 500 employee accounts in one request (HR/ADMIN only).
+    
+    Unknown emails get a new company User (with the given password, or a temporary
+    one returned once in the result); existing company users without a company are
+    linked. Everything is written in one transaction with multi-row inserts, and
+    passwords are hashed in a few chunks on the dedicated hashing pool.
+    
+    Returns one result per entry in request order; invalid entries get ok=False
+    and an error without failing the rest.
+    """
+    company_id = current_user.get("company_id")
+    provisioning = EmployeeProvisioning(company_id, req.employees)
+    
+    await run_in_threadpool(provisioning.plan, session)
+    password_hashes = await hash_passwords_async(provisioning.passwords)
+    return await run_in_threadpool(provisioning.apply, session, password_hashes)
+
+
 @router.get("/employees", response_model=list[CompanyUserRead])
 def list_employees(
     current_user: dict = Depends(require_company_user),
@@ -202,3 +215,44 @@ def list_employees(
         )
         for emp in employees
     ]
+
+
+@router.put("/employees/{employee_id}/deactivate", response_model=CompanyUserRead)
+def deactivate_employee(
+    employee_id: int,
+    current_user: dict = Depends(require_company_role(["ADMIN"])),
+    company_user_id: int = Depends(get_current_company_user_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Deactivate an employee (ADMIN only).
+    
+    They can no longer sign in, and the tokens they already hold stop working at once.
+    """
+    employee = session.get(CompanyUser, employee_id)
+    if not employee or employee.company_id != current_user.get("company_id"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee not found"
+        )
+    if employee.id == company_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You cannot deactivate yourself"
+        )
+    
+    employee.is_active = False
+    employee.user.is_active = False
+    session.add(employee)
+    session.commit()
+    # Their token claims and cached principal ids must not outlive the deactivation
+    revoke_user_tokens(employee.user_id)
+    forget_principal(employee.user_id)
+    
+    return CompanyUserRead(
+        id=employee.id,
+        first_name=employee.first_name,
+        last_name=employee.last_name,
+        role=employee.role,
+        is_active=employee.is_active
+    )
@@ -0,0 +1,97 @@
+"""
+Server-sent events: one stream per signed-in user, fed by app/push.py.
+
+Candidates receive match_updated and ask_received; company users receive
+match_updated for their company's jobs and feed_candidate when a candidate
+starts qualifying for one of their active jobs. Clients refetch the affected
+view on each event instead of polling it.
+"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from ..database import engine
+from ..principals import resolve_candidate_id
+from ..push import candidate_topic, company_topic, push_hub, sse_message
+from ..security import (
+    STREAM_TICKET_SECONDS, bearer_token, create_stream_ticket, decode_token_cached, get_current_user,
+    redeem_stream_ticket
+)
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Comment line sent when idle so proxies keep the connection open
+HEARTBEAT_SECONDS = 25
+# Client reconnect delay (SSE retry field)
+RETRY_MILLISECONDS = 5000
+
+
+def user_topics(claims: dict) -> list[str]:
+    """Topics a user's stream subscribes to."""
+    if claims.get("user_type") == "company":
+        company_id = claims.get("company_id")
+        return [company_topic(company_id)] if company_id else []
+    with Session(engine) as session:
+        candidate_id = resolve_candidate_id(session, claims)
+    return [candidate_topic(candidate_id)] if candidate_id else []
+
+
+@router.post("/ticket")
+def create_ticket(current_user: dict = Depends(get_current_user)):
+    """
+    Issue a single-use ticket for opening the event stream with ?ticket=.
+
+    EventSource cannot send headers, and access tokens must not end up in URLs
+    (server logs, proxies, browser history); a ticket expires within seconds and
+    works once.
+    """
+    return {"ticket": create_stream_ticket(current_user), "expires_in": STREAM_TICKET_SECONDS}
+
+
+@router.get("/stream")
+async def event_stream(
+    request: Request,
+    ticket: Optional[str] = Query(None, description="From POST /events/ticket, for EventSource"),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Open the caller's event stream (text/event-stream).
+
+    Authenticate with the usual Authorization header or a ?ticket= from
+    POST /events/ticket. The stream starts with a "ready" event (refetch then);
+    "resync" means updates were dropped because the client fell behind.
+    """
+    claims = redeem_stream_ticket(ticket) if ticket else decode_token_cached(bearer_token(authorization))
+    topics = await run_in_threadpool(user_topics, claims)
+    if not topics:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No candidate or company profile")
+
+    subscription = push_hub.subscribe(topics)
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open event streams",
+            headers={"Retry-After": str(RETRY_MILLISECONDS // 1000)},
+        )
+
+    async def stream():
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n".encode() + sse_message("ready", {"topics": topics})
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            push_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
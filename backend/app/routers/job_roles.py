@@ -2,7 +2,9 @@ from pathlib import Path
 import json
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Response
+
+from ..etags import etag_matches, make_etag, not_modified
 
 router = APIRouter(prefix="/job-roles", tags=["job-roles"])
 
@@ -11,11 +13,27 @@ ROLES_FILE = BASE_DIR / "data" / "roles.json"
 SKILLS_FILE = BASE_DIR / "data" / "skills.json"
 
 
-def load_roles_data():
+# (mtime_ns, size) -> parsed roles.json, so unchanged files are not re-parsed per request
+_roles_cache: dict[tuple[int, int], dict] = {}
+
+
+def roles_file_version() -> tuple[int, int]:
+    """Cheap version of roles.json: its modification time and size."""
     if not ROLES_FILE.exists():
         raise FileNotFoundError(f"roles.json not found at {ROLES_FILE}")
-    with ROLES_FILE.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    stat = ROLES_FILE.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_roles_data():
+    version = roles_file_version()
+    data = _roles_cache.get(version)
+    if data is None:
+        with ROLES_FILE.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        _roles_cache.clear()
+        _roles_cache[version] = data
+    return data
 
 
 def load_skills_data():
@@ -26,12 +44,22 @@ def load_skills_data():
 
 
 @router.get("/")
-def get_all_job_roles():
+def get_all_job_roles(
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Returns the full product_author -> product -> roles structure.
     Frontend can use this to build dynamic dropdowns.
+    
+    Sends an ETag derived from roles.json's stat; a matching If-None-Match gets 304.
     """
+    etag = make_etag("roles", *roles_file_version())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
     data = load_roles_data()
+    response.headers["ETag"] = etag
     return data
 
 
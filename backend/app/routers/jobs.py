@@ -2,17 +2,31 @@
 Job posting endpoints: create, list, update, delete jobs.
 """
 
+import io
 import json
 import logging
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile, status
+from sqlalchemy import func, literal, union_all
 from sqlmodel import Session, select
 
-from ..database import get_session
-from ..models import JobPost, CompanyUser, MatchState
+from ..database import get_session, iter_with_session
+from ..models import ChangeSequence, JobPost, CompanyUser, MatchState
 from ..schemas import JobPostCreate, JobPostRead, JobPostUpdate
 from ..security import get_current_user, require_company_role
+from ..principals import get_current_company_user_id
+from ..admission import admit
 from ..recommendation_engine import RecommendationEngine
+from ..responses import FastJSONResponse, STREAM_MODE_PATTERN, stream_json
+from ..etags import etag_matches, make_etag, not_modified, with_etag
+from ..fieldsets import JOB_POST_FIELDS, job_post_columns, job_post_fields, parse_fields, project_job_post
+from ..projections import invalidate_job_projection, job_post_read
+from ..job_import import IMPORT_FORMAT_PATTERN, JobImport, detect_format
+from ..skill_extraction import skills_json
+from ..pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_paginate, split_page, with_next_cursor
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/jobs", tags=["jobs"])
@@ -24,6 +38,7 @@ logger.info("Jobs router initialized")
 def create_job(
     req: JobPostCreate,
     current_user: dict = Depends(require_company_role(["HR", "ADMIN"])),
+    company_user_id: int = Depends(get_current_company_user_id),
     session: Session = Depends(get_session)
 ):
     """
@@ -33,23 +48,7 @@ def create_job(
     company_id = current_user.get("company_id")
     logger.info(f"[JOB_CREATE] Creating job: title={req.title}, user_id={user_id}, company_id={company_id}")
     logger.info(f"[JOB_CREATE] Job details - author={req.product_author}, product={req.product}, role={req.role}")
-    
-    # Verify user is in company
-    logger.info(f"[JOB_CREATE] Verifying CompanyUser for user {user_id} in company {company_id}")
-    company_user = session.exec(
-        select(CompanyUser).where(
-            CompanyUser.user_id == user_id,
-            CompanyUser.company_id == company_id
-        )
-    ).first()
-    if not company_user:
-        logger.error(f"[JOB_CREATE] CompanyUser not found for user {user_id} in company {company_id}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User not in this company"
-        )
-    
-    logger.info(f"[JOB_CREATE] CompanyUser verified: role={company_user.role}")
+    # Membership in the company is checked by the company_user_id dependency
     
     # Serialize skills to JSON strings
     required_skills_json = json.dumps(req.required_skills or [])
@@ -82,83 +81,101 @@ def create_job(
         salary_max=req.salary_max,
         required_skills=required_skills_json,
         nice_to_have_skills=nice_to_have_json,
+        description_skills=skills_json(req.description),
         status="active"
     )
     session.add(job)
     session.commit()
     session.refresh(job)
+    invalidate_job_projection(job.id)
     logger.info(f"[JOB_CREATE] JobPost created successfully with ID: {job.id}")
     
     logger.info(f"[JOB_CREATE] Building JobPostRead response for job {job.id}")
-    return JobPostRead(
-        id=job.id,
-        company_id=job.company_id,
-        title=job.title,
-        description=job.description,
-        product_author=job.product_author,
-        product=job.product,
-        role=job.role,
-        seniority=job.seniority,
-        job_type=job.job_type,
-        duration=job.duration,
-        start_date=job.start_date.isoformat() if job.start_date else None,
-        currency=job.currency,
-        location=job.location,
-        work_type=job.work_type,
-        min_rate=job.min_rate,
-        max_rate=job.max_rate,
-        salary_min=job.salary_min,
-        salary_max=job.salary_max,
-        required_skills=req.required_skills or [],
-        nice_to_have_skills=req.nice_to_have_skills or [],
-        status=job.status,
-        created_at=job.created_at.isoformat(),
-        updated_at=job.updated_at.isoformat()
+    return job_post_read(job)
+
+
+# Active jobs are read (and streamed) in batches of this size
+JOB_BATCH_SIZE = 1000
+
+
+def iter_available_jobs(session: Session, fields: Optional[list[str]] = None, batch_size: int = JOB_BATCH_SIZE):
+    """Yield every active job, newest first, via a server-side cursor (projected when fields are given)."""
+    statement = select(*job_post_columns(fields)) if fields else select(JobPost)
+    jobs = session.exec(
+        statement
+        .where(JobPost.status == "active")
+        .order_by(JobPost.created_at.desc(), JobPost.id.desc())
+        .execution_options(yield_per=batch_size)
     )
+    for batch in jobs.partitions():
+        for job in batch:
+            yield project_job_post(job, fields) if fields else job_post_read(job)
+        session.expunge_all()
+
+
+def job_page_response(
+    session: Session,
+    criteria: list,
+    cursor: Optional[str],
+    limit: int,
+    build=None,
+    fields: Optional[list[str]] = None
+):
+    """
+    Select the jobs matching `criteria` as one keyset page ordered by (created_at, id), newest first.
+    
+    With a fieldset only the requested columns are selected and rendered.
+    """
+    statement = select(JobPost)
+    build = build or job_post_read
+    if fields:
+        statement = select(*job_post_columns(fields))
+        build = lambda row: project_job_post(row, fields)
+    statement = statement.where(*criteria)
+    jobs = session.exec(
+        keyset_paginate(statement, (JobPost.created_at, JobPost.id), cursor, limit)
+    ).all()
+    page, next_cursor = split_page(jobs, limit, lambda job: (job.created_at, job.id))
+    return with_next_cursor(FastJSONResponse([build(job) for job in page]), next_cursor)
 
 
 @router.get("/available", response_model=list[JobPostRead])
 def list_available_jobs(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: Optional[str] = Query(None, pattern=STREAM_MODE_PATTERN),
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """
-    List all available jobs (for candidates).
-    Returns all active jobs from all companies.
+    List available jobs (for candidates), newest first.
+    Returns active jobs from all companies.
+    
+    Paged by (created_at, id): pass the X-Next-Cursor response header back as `cursor`.
+    stream=array or stream=ndjson instead streams every active job and ignores cursor/limit.
+    fields=id,title,... returns only those JobPostRead fields.
+    Sends an ETag over the job change sequence; a matching If-None-Match gets 304.
     """
-    # Get all active jobs (any company, any user can see)
-    jobs = session.exec(
-        select(JobPost).where(JobPost.status == "active")
-    ).all()
+    fieldset = parse_fields(fields, JOB_POST_FIELDS)
+    
+    # Collection version: every committed job insert, update or delete moves it
+    job_changes = session.exec(
+        select(ChangeSequence.value).where(ChangeSequence.name == "jobpost")
+    ).first() or 0
+    etag = make_etag("jobs-available", job_changes, cursor, limit, stream, fieldset)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
-    return [
-        JobPostRead(
-            id=job.id,
-            company_id=job.company_id,
-            title=job.title,
-            description=job.description,
-            product_author=job.product_author,
-            product=job.product,
-            role=job.role,
-            seniority=job.seniority,
-            job_type=job.job_type,
-            duration=job.duration,
-            start_date=job.start_date.isoformat() if job.start_date else None,
-            currency=job.currency,
-            location=job.location,
-            work_type=job.work_type,
-            min_rate=job.min_rate,
-            max_rate=job.max_rate,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            required_skills=json.loads(job.required_skills or "[]"),
-            nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-            status=job.status,
-            created_at=job.created_at.isoformat(),
-            updated_at=job.updated_at.isoformat()
+    # Get all active jobs (any company, any user can see)
+    if stream:
+        response = stream_json(iter_with_session(iter_available_jobs, fields=fieldset), stream)
+    else:
+        response = job_page_response(
+            session, [JobPost.status == "active"], cursor, limit, fields=fieldset
         )
-        for job in jobs
-    ]
+    return with_etag(response, etag)
 
 
 @router.get("/", response_model=list[JobPostRead])
@@ -180,131 +197,71 @@ def list_company_jobs(
         select(JobPost).where(JobPost.company_id == company_id)
     ).all()
     
-    return [
-        JobPostRead(
-            id=job.id,
-            company_id=job.company_id,
-            title=job.title,
-            description=job.description,
-            product_author=job.product_author,
-            product=job.product,
-            role=job.role,
-            seniority=job.seniority,
-            job_type=job.job_type,
-            duration=job.duration,
-            start_date=job.start_date.isoformat() if job.start_date else None,
-            currency=job.currency,
-            location=job.location,
-            work_type=job.work_type,
-            min_rate=job.min_rate,
-            max_rate=job.max_rate,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            required_skills=json.loads(job.required_skills or "[]"),
-            nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-            status=job.status,
-            created_at=job.created_at.isoformat(),
-            updated_at=job.updated_at.isoformat()
-        )
-        for job in jobs
-    ]
+    return [job_post_read(job) for job in jobs]
 
 
 @router.get("/company/all-postings", response_model=list[JobPostRead])
 def get_company_all_postings(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
     current_user: dict = Depends(require_company_role(["ADMIN", "HR"])),
     session: Session = Depends(get_session)
 ):
     """
-    Get ALL job postings for the company (Admin/HR only).
-    Shows all jobs created by anyone in the company, grouped by creator.
+    Get job postings for the company (Admin/HR only), newest first.
+    Shows all jobs created by anyone in the company, with their creator.
+    
+    Paged by (created_at, id); pass the X-Next-Cursor response header back as `cursor`.
+    fields=id,title,... returns only those JobPostRead fields.
     """
+    fieldset = parse_fields(fields, job_post_fields(with_creator=True))
     company_id = current_user.get("company_id")
     user_id = current_user.get("user_id")
     user_email = current_user.get("email")
     
-    logger.info(f"[COMPANY_ALL_POSTINGS] User {user_id} ({user_email}) requesting all company jobs for company {company_id}")
+    logger.info(f"[COMPANY_ALL_POSTINGS] User {user_id} ({user_email}) requesting company jobs for company {company_id} (limit={limit})")
     
-    # Debug: Get all jobs in the database for this company
-    all_jobs = session.exec(
-        select(JobPost).where(JobPost.company_id == company_id).order_by(JobPost.created_at.desc())
-    ).all()
-    
-    logger.info(f"[COMPANY_ALL_POSTINGS] Found {len(all_jobs)} total jobs for company_id={company_id}")
-    for job in all_jobs:
-        logger.info(f"[COMPANY_ALL_POSTINGS]   - Job ID {job.id}: '{job.title}' (created_by_user_id={job.created_by_user_id}, company_id={job.company_id})")
-    
-    return [
-        JobPostRead(
-            id=job.id,
-            company_id=job.company_id,
-            title=job.title,
-            description=job.description,
-            product_author=job.product_author,
-            product=job.product,
-            role=job.role,
-            seniority=job.seniority,
-            job_type=job.job_type,
-            duration=job.duration,
-            start_date=job.start_date.isoformat() if job.start_date else None,
-            currency=job.currency,
-            location=job.location,
-            work_type=job.work_type,
-            min_rate=job.min_rate,
-            max_rate=job.max_rate,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            required_skills=json.loads(job.required_skills or "[]"),
-            nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-            status=job.status,
-            created_at=job.created_at.isoformat(),
-            updated_at=job.updated_at.isoformat(),
-            created_by_user_id=job.created_by_user_id
-        )
-        for job in all_jobs
-    ]
+    return job_page_response(
+        session,
+        [JobPost.company_id == company_id],
+        cursor,
+        limit,
+        build=lambda job: job_post_read(job, with_creator=True),
+        fields=fieldset
+    )
 
 
 @router.get("/{job_id}", response_model=JobPostRead)
 def get_job(
     job_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     session: Session = Depends(get_session)
 ):
     """
     Get a specific job by ID.
+    
+    Sends an ETag derived from the job's version; a matching If-None-Match gets 304
+    after a single version lookup.
     """
-    job = session.get(JobPost, job_id)
-    if not job:
+    version = session.exec(
+        select(JobPost.version).where(JobPost.id == job_id)
+    ).first()
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
     
-    return JobPostRead(
-        id=job.id,
-        company_id=job.company_id,
-        title=job.title,
-        description=job.description,
-        product_author=job.product_author,
-        product=job.product,
-        role=job.role,
-        seniority=job.seniority,
-        job_type=job.job_type,
-        duration=job.duration,
-        start_date=job.start_date.isoformat() if job.start_date else None,
-        currency=job.currency,
-        location=job.location,
-        work_type=job.work_type,
-        min_rate=job.min_rate,
-        max_rate=job.max_rate,
-        salary_min=job.salary_min,
-        salary_max=job.salary_max,
-        required_skills=json.loads(job.required_skills or "[]"),
-        nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-        status=job.status,
-        created_at=job.created_at.isoformat(),
-        updated_at=job.updated_at.isoformat()
-    )
+    etag = make_etag("job", job_id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    job = session.get(JobPost, job_id)
+    response.headers["ETag"] = etag
+    
+    return job_post_read(job)
 
 
 @router.patch("/{job_id}", response_model=JobPostRead)
@@ -331,6 +288,7 @@ def update_job(
         job.title = req.title
     if req.description is not None:
         job.description = req.description
+        job.description_skills = skills_json(req.description)
     if req.location is not None:
         job.location = req.location
     if req.work_type is not None:
@@ -345,26 +303,9 @@ def update_job(
     session.add(job)
     session.commit()
     session.refresh(job)
+    invalidate_job_projection(job_id)
     
-    return JobPostRead(
-        id=job.id,
-        company_id=job.company_id,
-        title=job.title,
-        description=job.description,
-        product_author=job.product_author,
-        product=job.product,
-        role=job.role,
-        seniority=job.seniority,
-        location=job.location,
-        work_type=job.work_type,
-        min_rate=job.min_rate,
-        max_rate=job.max_rate,
-        required_skills=json.loads(job.required_skills or "[]"),
-        nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-        status=job.status,
-        created_at=job.created_at.isoformat(),
-        updated_at=job.updated_at.isoformat()
-    )
+    return job_post_read(job)
 
 
 @router.delete("/{job_id}", response_model=dict)
@@ -387,6 +328,7 @@ def delete_job(
     
     session.delete(job)
     session.commit()
+    invalidate_job_projection(job_id)
     
     return {"ok": True, "message": "Job deleted"}
 
@@ -398,6 +340,7 @@ def delete_job(
 @router.get("/recruiter/my-accessible-postings", response_model=list[JobPostRead])
 def get_recruiter_accessible_postings(
     current_user: dict = Depends(require_company_role(["RECRUITER", "HR", "ADMIN"])),
+    company_user_id: int = Depends(get_current_company_user_id),
     session: Session = Depends(get_session)
 ):
     """
@@ -410,28 +353,11 @@ def get_recruiter_accessible_postings(
     
     logger.info(f"[RECRUITER_ACCESSIBLE] User {user_id} requesting accessible postings for company {company_id}")
     
-    # Get the CompanyUser to match against created_by_user_id
-    company_user = session.exec(
-        select(CompanyUser).where(
-            CompanyUser.user_id == user_id,
-            CompanyUser.company_id == company_id
-        )
-    ).first()
-    
-    if not company_user:
-        logger.error(f"[RECRUITER_ACCESSIBLE] CompanyUser not found for user {user_id} in company {company_id}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User not found in this company"
-        )
-    
-    logger.info(f"[RECRUITER_ACCESSIBLE] CompanyUser found: {company_user.id}")
-    
     # Get jobs created by this specific user
     jobs = session.exec(
         select(JobPost).where(
             JobPost.company_id == company_id,
-            JobPost.created_by_user_id == company_user.id
+            JobPost.created_by_user_id == company_user_id
         ).order_by(JobPost.created_at.desc())
     ).all()
     
@@ -439,32 +365,7 @@ def get_recruiter_accessible_postings(
     
     result = []
     for job in jobs:
-        result.append(JobPostRead(
-            id=job.id,
-            company_id=job.company_id,
-            title=job.title,
-            description=job.description,
-            product_author=job.product_author,
-            product=job.product,
-            role=job.role,
-            seniority=job.seniority,
-            job_type=job.job_type,
-            duration=job.duration,
-            start_date=job.start_date.isoformat() if job.start_date else None,
-            currency=job.currency,
-            location=job.location,
-            work_type=job.work_type,
-            min_rate=job.min_rate,
-            max_rate=job.max_rate,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            required_skills=json.loads(job.required_skills or "[]"),
-            nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-            status=job.status,
-            created_at=job.created_at.isoformat(),
-            updated_at=job.updated_at.isoformat(),
-            created_by_user_id=job.created_by_user_id
-        ))
+        result.append(job_post_read(job, with_creator=True))
     
     return result
 
@@ -472,6 +373,7 @@ def get_recruiter_accessible_postings(
 @router.get("/assigned-to-me", response_model=list[JobPostRead])
 def get_jobs_assigned_to_me(
     current_user: dict = Depends(require_company_role(["RECRUITER", "HR", "ADMIN"])),
+    company_user_id: int = Depends(get_current_company_user_id),
     session: Session = Depends(get_session)
 ):
     """
@@ -483,26 +385,11 @@ def get_jobs_assigned_to_me(
     
     logger.info(f"[ASSIGNED_TO_ME] User {user_id} requesting assigned jobs for company {company_id}")
     
-    # Get the CompanyUser
-    company_user = session.exec(
-        select(CompanyUser).where(
-            CompanyUser.user_id == user_id,
-            CompanyUser.company_id == company_id
-        )
-    ).first()
-    
-    if not company_user:
-        logger.error(f"[ASSIGNED_TO_ME] CompanyUser not found for user {user_id} in company {company_id}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User not found in this company"
-        )
-    
     # Get jobs assigned to this user
     jobs = session.exec(
         select(JobPost).where(
             JobPost.company_id == company_id,
-            JobPost.assigned_to_user_id == company_user.id
+            JobPost.assigned_to_user_id == company_user_id
         ).order_by(JobPost.created_at.desc())
     ).all()
     
@@ -510,33 +397,7 @@ def get_jobs_assigned_to_me(
     
     result = []
     for job in jobs:
-        result.append(JobPostRead(
-            id=job.id,
-            company_id=job.company_id,
-            title=job.title,
-            description=job.description,
-            product_author=job.product_author,
-            product=job.product,
-            role=job.role,
-            seniority=job.seniority,
-            job_type=job.job_type,
-            duration=job.duration,
-            start_date=job.start_date.isoformat() if job.start_date else None,
-            currency=job.currency,
-            location=job.location,
-            work_type=job.work_type,
-            min_rate=job.min_rate,
-            max_rate=job.max_rate,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            required_skills=json.loads(job.required_skills or "[]"),
-            nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-            status=job.status,
-            created_at=job.created_at.isoformat(),
-            updated_at=job.updated_at.isoformat(),
-            created_by_user_id=job.created_by_user_id,
-            assigned_to_user_id=job.assigned_to_user_id
-        ))
+        result.append(job_post_read(job, with_creator=True, with_assignee=True))
     
     return result
 
@@ -594,34 +455,11 @@ def assign_job_to_recruiter(
     session.add(job)
     session.commit()
     session.refresh(job)
+    invalidate_job_projection(job_id)
     
     logger.info(f"[ASSIGN_JOB] Job {job_id} assigned to recruiter {assigned_to_user_id} ({target_recruiter.first_name})")
     
-    return JobPostRead(
-        id=job.id,
-        company_id=job.company_id,
-        title=job.title,
-        description=job.description,
-        product_author=job.product_author,
-        product=job.product,
-        role=job.role,
-        seniority=job.seniority,
-        job_type=job.job_type,
-        duration=job.duration,
-        start_date=job.start_date.isoformat() if job.start_date else None,
-        currency=job.currency,
-        location=job.location,
-        work_type=job.work_type,
-        min_rate=job.min_rate,
-        max_rate=job.max_rate,
-        required_skills=json.loads(job.required_skills or "[]"),
-        nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-        status=job.status,
-        created_at=job.created_at.isoformat(),
-        updated_at=job.updated_at.isoformat(),
-        created_by_user_id=job.created_by_user_id,
-        assigned_to_user_id=job.assigned_to_user_id
-    )
+    return job_post_read(job, with_creator=True, with_assignee=True)
 
 
 @router.get("/team/workload", response_model=list[dict])
@@ -631,7 +469,10 @@ def get_team_workload(
 ):
     """
     Get job distribution across the team (Admin/HR only).
-    Shows count of jobs created and assigned to each recruiter.
+    Shows count of jobs created and assigned to each recruiter, with a per-status breakdown.
+
+    Counts come from a single grouped aggregate over (recruiter, relation, status),
+    served by the company/creator/status and company/assignee/status indexes on JobPost.
     """
     company_id = current_user.get("company_id")
     
@@ -644,23 +485,40 @@ def get_team_workload(
     
     logger.info(f"[TEAM_WORKLOAD] Found {len(recruiters)} team members")
     
+    # One row per (recruiter, relation, status) link; a job contributes to both its creator and assignee
+    created_links = select(
+        JobPost.created_by_user_id.label("recruiter_id"),
+        literal("created").label("relation"),
+        JobPost.status.label("status"),
+    ).where(
+        JobPost.company_id == company_id,
+        JobPost.created_by_user_id.is_not(None)
+    )
+    assigned_links = select(
+        JobPost.assigned_to_user_id.label("recruiter_id"),
+        literal("assigned").label("relation"),
+        JobPost.status.label("status"),
+    ).where(
+        JobPost.company_id == company_id,
+        JobPost.assigned_to_user_id.is_not(None)
+    )
+    links = union_all(created_links, assigned_links).subquery()
+    
+    rows = session.exec(
+        select(links.c.recruiter_id, links.c.relation, links.c.status, func.count())
+        .group_by(links.c.recruiter_id, links.c.relation, links.c.status)
+    ).all()
+    
+    # recruiter_id -> relation -> status -> count
+    rollup: dict[int, dict[str, dict[str, int]]] = {}
+    for recruiter_id, relation, job_status, count in rows:
+        rollup.setdefault(recruiter_id, {"created": {}, "assigned": {}})[relation][job_status] = count
+    
     workload = []
     for recruiter in recruiters:
-        # Count jobs created by this recruiter
-        created_count = len(session.exec(
-            select(JobPost).where(
-                JobPost.company_id == company_id,
-                JobPost.created_by_user_id == recruiter.id
-            )
-        ).all())
-        
-        # Count jobs assigned to this recruiter
-        assigned_count = len(session.exec(
-            select(JobPost).where(
-                JobPost.company_id == company_id,
-                JobPost.assigned_to_user_id == recruiter.id
-            )
-        ).all())
+        counts = rollup.get(recruiter.id, {"created": {}, "assigned": {}})
+        created_count = sum(counts["created"].values())
+        assigned_count = sum(counts["assigned"].values())
         
         workload.append({
             "recruiter_id": recruiter.id,
@@ -668,7 +526,9 @@ def get_team_workload(
             "role": recruiter.role,
             "jobs_created": created_count,
             "jobs_assigned": assigned_count,
-            "total_jobs": created_count + assigned_count
+            "total_jobs": created_count + assigned_count,
+            "created_by_status": counts["created"],
+            "assigned_by_status": counts["assigned"]
         })
     
     logger.info(f"[TEAM_WORKLOAD] Workload distribution: {len(workload)} team members")
@@ -677,56 +537,32 @@ def get_team_workload(
 
 @router.get("/recruiter/my-postings", response_model=list[JobPostRead])
 def get_recruiter_job_postings(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
     current_user: dict = Depends(require_company_role(["RECRUITER", "HR", "ADMIN"])),
     session: Session = Depends(get_session)
 ):
     """
-    Get all job postings for the current company (Recruiter/HR/Admin).
+    Get job postings for the current company (Recruiter/HR/Admin), newest first.
+    
+    Paged by (created_at, id); pass the X-Next-Cursor response header back as `cursor`.
+    fields=id,title,... returns only those JobPostRead fields.
     """
+    fieldset = parse_fields(fields, JOB_POST_FIELDS)
     company_id = current_user.get("company_id")
-    logger.info(f"[RECRUITER] Fetching job postings for company_id: {company_id}")
-    
-    jobs = session.exec(
-        select(JobPost).where(JobPost.company_id == company_id).order_by(JobPost.created_at.desc())
-    ).all()
+    logger.info(f"[RECRUITER] Fetching job postings for company_id: {company_id} (limit={limit})")
     
-    logger.info(f"[RECRUITER] Found {len(jobs)} job postings")
-    
-    result = []
-    for job in jobs:
-        result.append(JobPostRead(
-            id=job.id,
-            company_id=job.company_id,
-            title=job.title,
-            description=job.description,
-            product_author=job.product_author,
-            product=job.product,
-            role=job.role,
-            seniority=job.seniority,
-            job_type=job.job_type,
-            duration=job.duration,
-            start_date=job.start_date.isoformat() if job.start_date else None,
-            currency=job.currency,
-            location=job.location,
-            work_type=job.work_type,
-            min_rate=job.min_rate,
-            max_rate=job.max_rate,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            required_skills=json.loads(job.required_skills or "[]"),
-            nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-            status=job.status,
-            created_at=job.created_at.isoformat(),
-            updated_at=job.updated_at.isoformat()
-        ))
-    
-    return result
+    return job_page_response(
+        session, [JobPost.company_id == company_id], cursor, limit, fields=fieldset
+    )
 
 
 @router.post("/recruiter/create", response_model=JobPostRead)
 def recruiter_create_job(
     req: JobPostCreate,
     current_user: dict = Depends(require_company_role(["HR", "ADMIN"])),
+    company_user_id: int = Depends(get_current_company_user_id),
     session: Session = Depends(get_session)
 ):
     """
@@ -735,24 +571,7 @@ def recruiter_create_job(
     """
     company_id = current_user.get("company_id")
     user_id = current_user.get("user_id")
-    logger.info(f"[RECRUITER_CREATE] Creating job by user {user_id} for company {company_id}")
-    
-    # Get the CompanyUser record to capture created_by_user_id
-    company_user = session.exec(
-        select(CompanyUser).where(
-            CompanyUser.user_id == user_id,
-            CompanyUser.company_id == company_id
-        )
-    ).first()
-    
-    if not company_user:
-        logger.error(f"[RECRUITER_CREATE] CompanyUser not found for user {user_id} in company {company_id}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User not found in company"
-        )
-    
-    logger.info(f"[RECRUITER_CREATE] CompanyUser found: id={company_user.id}, role={company_user.role}")
+    logger.info(f"[RECRUITER_CREATE] Creating job by user {user_id} (CompanyUser {company_user_id}) for company {company_id}")
     
     required_skills_json = json.dumps(req.required_skills or [])
     nice_to_have_json = json.dumps(req.nice_to_have_skills or [])
@@ -771,7 +590,7 @@ def recruiter_create_job(
     
     job = JobPost(
         company_id=company_id,
-        created_by_user_id=company_user.id,  # Track who created the job
+        created_by_user_id=company_user_id,  # Track who created the job
         title=job_title,
         description=req.description,
         product_author=req.product_author,
@@ -790,39 +609,51 @@ def recruiter_create_job(
         salary_max=req.salary_max,
         required_skills=required_skills_json,
         nice_to_have_skills=nice_to_have_json,
+        description_skills=skills_json(req.description),
         status="active"
     )
     session.add(job)
     session.commit()
     session.refresh(job)
-    logger.info(f"[RECRUITER_CREATE] Job created with ID: {job.id}, created_by_user_id: {company_user.id}")
-    
-    return JobPostRead(
-        id=job.id,
-        company_id=job.company_id,
-        title=job.title,
-        description=job.description,
-        product_author=job.product_author,
-        product=job.product,
-        role=job.role,
-        seniority=job.seniority,
-        job_type=job.job_type,
-        duration=job.duration,
-        start_date=job.start_date.isoformat() if job.start_date else None,
-        currency=job.currency,
-        location=job.location,
-        work_type=job.work_type,
-        min_rate=job.min_rate,
-        max_rate=job.max_rate,
-        salary_min=job.salary_min,
-        salary_max=job.salary_max,
-        required_skills=req.required_skills or [],
-        nice_to_have_skills=req.nice_to_have_skills or [],
-        status=job.status,
-        created_at=job.created_at.isoformat(),
-        updated_at=job.updated_at.isoformat(),
-        created_by_user_id=job.created_by_user_id
-    )
+    invalidate_job_projection(job.id)
+    logger.info(f"[RECRUITER_CREATE] Job created with ID: {job.id}, created_by_user_id: {company_user_id}")
+    
+    return job_post_read(job, with_creator=True)
+
+
+@router.post("/import", response_model=dict)
+def import_jobs(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern=IMPORT_FORMAT_PATTERN),
+    dry_run: bool = False,
+    current_user: dict = Depends(require_company_role(["HR", "ADMIN"])),
+    company_user_id: int = Depends(get_current_company_user_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Bulk-import job postings from a CSV or JSONL file (HR/Admin only).
+    
+    Rows are validated against the roles.json ontology while streaming and loaded
+    with a single COPY in one transaction. Invalid lines are skipped and reported
+    by line number. format defaults to the file extension; dry_run only validates.
+    Columns/keys match JobPostCreate; skills may be a JSON list or ';'-separated.
+    """
+    company_id = current_user.get("company_id")
+    user_id = current_user.get("user_id")
+    
+    fmt = detect_format(file.filename, format)
+    logger.info(f"[JOB_IMPORT] User {user_id} importing {fmt} file '{file.filename}' for company {company_id} (dry_run={dry_run})")
+    
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return JobImport(company_id, company_user_id).run(session, stream, fmt, dry_run=dry_run)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded"
+        )
+    finally:
+        stream.detach()
 
 
 @router.put("/recruiter/{job_id}", response_model=JobPostRead)
@@ -853,6 +684,7 @@ def recruiter_update_job(
         job.title = req.role
     if req.description:
         job.description = req.description
+        job.description_skills = skills_json(req.description)
     if req.job_type:
         job.job_type = req.job_type
     if req.duration:
@@ -896,31 +728,10 @@ def recruiter_update_job(
     session.add(job)
     session.commit()
     session.refresh(job)
+    invalidate_job_projection(job_id)
     logger.info(f"[RECRUITER_UPDATE] Job {job_id} updated successfully")
     
-    return JobPostRead(
-        id=job.id,
-        company_id=job.company_id,
-        title=job.title,
-        description=job.description,
-        product_author=job.product_author,
-        product=job.product,
-        role=job.role,
-        seniority=job.seniority,
-        job_type=job.job_type,
-        duration=job.duration,
-        start_date=job.start_date.isoformat() if job.start_date else None,
-        currency=job.currency,
-        location=job.location,
-        work_type=job.work_type,
-        min_rate=job.min_rate,
-        max_rate=job.max_rate,
-        required_skills=json.loads(job.required_skills or "[]"),
-        nice_to_have_skills=json.loads(job.nice_to_have_skills or "[]"),
-        status=job.status,
-        created_at=job.created_at.isoformat(),
-        updated_at=job.updated_at.isoformat()
-    )
+    return job_post_read(job)
 
 
 @router.delete("/recruiter/{job_id}", response_model=dict)
@@ -945,12 +756,13 @@ def recruiter_delete_job(
     
     session.delete(job)
     session.commit()
+    invalidate_job_projection(job_id)
     logger.info(f"[RECRUITER_DELETE] Job {job_id} deleted successfully")
     
     return {"ok": True, "message": "Job posting deleted"}
 
 
-@router.get("/recommendations/all")
+@router.get("/recommendations/all", dependencies=[Depends(admit("jobs.recommendations_all"))])
 def get_all_candidate_recommendations(
     top_n: int = 10,
     offset: int = 0,
@@ -1109,7 +921,7 @@ def get_all_candidate_recommendations(
         total_exclusions = sum(len(excl) for excl in job_exclusions.values())
         
         logger.info(f"[ALL_RECOMMENDATIONS] Returning {len(final_recommendations)} candidate recommendations")
-        return {
+        return FastJSONResponse({
             'company_id': company_id,
             'total_jobs': len(jobs),
             'total_recommendations': len(final_recommendations),
@@ -1117,7 +929,7 @@ def get_all_candidate_recommendations(
             'offset': offset,
             'excluded_count': total_exclusions,
             'recommendations': final_recommendations
-        }
+        })
         
     except HTTPException:
         raise
@@ -1129,7 +941,7 @@ def get_all_candidate_recommendations(
         )
 
 
-@router.get("/recommendations/{job_id}")
+@router.get("/recommendations/{job_id}", dependencies=[Depends(admit("jobs.recommendations_job"))])
 def get_candidate_recommendations_for_job(
     job_id: int,
     top_n: int = 10,
@@ -1265,14 +1077,14 @@ def get_candidate_recommendations_for_job(
         )
         
         logger.info(f"[JOB_RECOMMENDATIONS] Returning {len(recommendations)} candidate recommendations for job {job_id}")
-        return {
+        return FastJSONResponse({
             'job_id': job.id,
             'job_title': job.title,
             'total_recommendations': len(recommendations),
             'offset': offset,
             'excluded_count': len(excluded_candidate_ids),
             'recommendations': recommendations
-        }
+        })
         
     except HTTPException:
         raise
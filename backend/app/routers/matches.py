@@ -2,15 +2,23 @@
 Dating-app-style match state management with swipe mechanics.
 Handles Like/Pass/Apply actions from candidates and Like/Pass/Ask-to-Apply from recruiters.
 """
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, case, func, insert, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import Session, select
 from typing import List, Optional
 from datetime import datetime, timedelta
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from ..database import get_session
-from ..models import MatchState, Candidate, JobPost, Application, CompanyUser, User
-from ..security import get_current_user
+from ..models import MatchState, Candidate, CompanyAccount, JobPost, Application, User, Swipe
+from ..security import get_current_user, require_company_user
+from ..principals import resolve_company_user_id
+from ..matching import calculate_match_scores
+from ..match_events import funnel_counts, match_event, record_match_events
+from ..ask_expiry import expire_due_asks
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, count_rows, keyset_paginate, split_page
 
 import logging
 logger = logging.getLogger(__name__)
@@ -35,15 +43,47 @@ class RecruiterActionRequest(BaseModel):
     message: Optional[str] = None  # Optional message for ASK_TO_APPLY
 
 
+# Upper bound on items accepted by /matches/recruiter/bulk-action
+BULK_ACTION_MAX_ITEMS = 200
+
+
+class BulkActionItem(BaseModel):
+    candidate_id: int
+    job_id: int
+    action: str  # "LIKE", "PASS", "ASK_TO_APPLY"
+    message: Optional[str] = None  # Optional message for ASK_TO_APPLY
+
+
+class BulkRecruiterActionRequest(BaseModel):
+    items: List[BulkActionItem] = Field(..., min_length=1, max_length=BULK_ACTION_MAX_ITEMS)
+
+
 class RespondToAskRequest(BaseModel):
     match_state_id: int
     accept: bool  # True = accept and apply, False = decline
 
 
+# `sort` values accepted by the shortlist/likes and pending-asks listings
+LIKE_SORT_PATTERN = "^(liked_at|score)$"
+ASK_SORT_PATTERN = "^(asked_at|score)$"
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def listing_sort_key(sort: str, action_at) -> tuple:
+    """
+    Keyset key (descending) for match listings: the match score, or when the action happened.
+    
+    Missing values are coalesced (score -1, action time = created_at) so every row
+    has a comparable key and paging never skips rows.
+    """
+    if sort == "score":
+        return (func.coalesce(MatchState.initial_match_score, -1.0), MatchState.id)
+    return (func.coalesce(action_at, MatchState.created_at), MatchState.id)
+
+
 def update_unlock_level(match: MatchState) -> str:
     """
     Calculate unlock level based on current match state.
@@ -75,29 +115,193 @@ def update_unlock_level(match: MatchState) -> str:
     return "PREVIEW"
 
 
-def get_or_create_match_state(
+def _fold_and(*conditions):
+    """AND together conditions, folding the ones already known in Python."""
+    if any(condition is False for condition in conditions):
+        return False
+    pending = [condition for condition in conditions if condition is not True]
+    if not pending:
+        return True
+    return and_(*pending) if len(pending) > 1 else pending[0]
+
+
+def _fold_or(*conditions):
+    """OR together conditions, folding the ones already known in Python."""
+    if any(condition is True for condition in conditions):
+        return True
+    pending = [condition for condition in conditions if condition is not False]
+    if not pending:
+        return False
+    return or_(*pending) if len(pending) > 1 else pending[0]
+
+
+def _fold_case(whens, default):
+    """Build a CASE from (condition, value) pairs, skipping branches known in Python."""
+    pending = []
+    for condition, value in whens:
+        if condition is False:
+            continue
+        if condition is True:
+            default = value
+            break
+        pending.append((condition, value))
+    return case(*pending, else_=default) if pending else default
+
+
+def unlock_level_expression(candidate_action, recruiter_action, ask_to_apply_accepted):
+    """
+    SQL mirror of update_unlock_level() for single-statement upserts.
+    
+    Each argument is either the Python value being written by the acting party,
+    or the MatchState column holding what is already stored on the row.
+    """
+    return _fold_case([
+        (candidate_action == "APPLY", "FULL"),
+        (ask_to_apply_accepted == True, "FULL"),
+        (_fold_and(candidate_action == "LIKE", recruiter_action == "LIKE"), "PARTIAL"),
+    ], "PREVIEW")
+
+
+def transition_status_expression(action: str, other_action):
+    """
+    SQL mirror of the status rules applied when one party acts on an existing match.
+    
+    Any PASS rejects the match, a mutual LIKE matches it, otherwise the status is kept.
+    """
+    return _fold_case([
+        (_fold_or(action == "PASS", other_action == "PASS"), "REJECTED"),
+        (_fold_and(action == "LIKE", other_action == "LIKE"), "MATCHED"),
+    ], MatchState.status)
+
+
+# How a still-PENDING invitation is settled when either party acts on the match otherwise
+CANDIDATE_ASK_OUTCOMES = {"APPLY": "ACCEPTED", "PASS": "DECLINED"}
+RECRUITER_ASK_OUTCOMES = {"LIKE": "WITHDRAWN", "PASS": "WITHDRAWN"}
+
+
+def settle_pending_ask(outcome: Optional[str]) -> dict:
+    """
+    SET clauses closing a PENDING ask-to-apply with `outcome` (answered rows are kept).
+    
+    Keeps the PENDING set to live invitations only, so the inbox and the expiry
+    sweep never see a match that has moved on.
+    """
+    if outcome is None:
+        return {}
+    pending = MatchState.ask_to_apply_status == "PENDING"
+    changes = {"ask_to_apply_status": case((pending, outcome), else_=MatchState.ask_to_apply_status)}
+    if outcome == "ACCEPTED":
+        changes["ask_to_apply_accepted"] = case((pending, True), else_=MatchState.ask_to_apply_accepted)
+    return changes
+
+
+def upsert_match_state(
     session: Session,
     candidate_id: int,
-    job_id: int
+    job_id: int,
+    insert_values: dict,
+    update_values: dict
 ) -> MatchState:
-    """Get existing match state or create new one."""
-    statement = select(MatchState).where(
-        MatchState.candidate_id == candidate_id,
-        MatchState.job_post_id == job_id
-    )
-    match = session.exec(statement).first()
+    """
+    Create or transition a match state in one round trip.
     
-    if not match:
-        match = MatchState(
+    Runs INSERT ... ON CONFLICT (candidate_id, job_post_id) DO UPDATE ... RETURNING,
+    so concurrent actions from the candidate and the recruiter serialize on the
+    unique constraint instead of racing to create duplicate rows.
+    """
+    now = datetime.utcnow()
+    statement = (
+        pg_insert(MatchState)
+        .values(
             candidate_id=candidate_id,
             job_post_id=job_id,
-            status="OPEN",
-            unlock_level="PREVIEW"
+            created_at=now,
+            updated_at=now,
+            **insert_values
         )
-        session.add(match)
-        session.commit()
-        session.refresh(match)
+        .on_conflict_do_update(
+            constraint="uq_matchstate_candidate_job",
+            set_={**update_values, "updated_at": now}
+        )
+        .returning(MatchState)
+        .execution_options(populate_existing=True)
+    )
+    return session.exec(statement).scalars().one()
+
+
+def upsert_match_states(
+    session: Session,
+    rows: List[dict],
+    update_columns: List[str],
+    update_values: dict
+) -> List[MatchState]:
+    """
+    Multi-row variant of upsert_match_state(): one INSERT ... ON CONFLICT DO UPDATE for many pairs.
     
+    Columns named in update_columns are overwritten with each row's own inserted
+    value (EXCLUDED.column); update_values holds expressions shared by every row.
+    Rows must carry the same keys and distinct (candidate_id, job_post_id) pairs.
+    """
+    now = datetime.utcnow()
+    statement = pg_insert(MatchState).values([
+        {**row, "created_at": now, "updated_at": now} for row in rows
+    ])
+    statement = (
+        statement
+        .on_conflict_do_update(
+            constraint="uq_matchstate_candidate_job",
+            set_={
+                **{column: statement.excluded[column] for column in update_columns},
+                **update_values,
+                "updated_at": now,
+            }
+        )
+        .returning(MatchState)
+        .execution_options(populate_existing=True)
+    )
+    return session.exec(statement).scalars().all()
+
+
+def create_application_if_missing(session: Session, candidate_id: int, job_id: int) -> None:
+    """Insert a submitted application unless one already exists for this candidate and job."""
+    statement = (
+        pg_insert(Application)
+        .values(
+            candidate_id=candidate_id,
+            job_post_id=job_id,
+            status="submitted"
+        )
+        .on_conflict_do_nothing(constraint="uq_application_candidate_job")
+    )
+    session.exec(statement)
+
+
+# Swipe rows recorded alongside recruiter match actions (ASK_TO_APPLY has no swipe equivalent)
+RECRUITER_SWIPE_ACTIONS = {"LIKE": "like", "PASS": "pass"}
+
+
+def recruiter_action_changes(action: str, message: Optional[str], now: datetime) -> dict:
+    """MatchState columns written by a recruiter action."""
+    changes = {
+        "recruiter_action": action,
+        "recruiter_action_at": now,
+    }
+    # Handle ASK_TO_APPLY special case
+    if action == "ASK_TO_APPLY":
+        changes.update({
+            "ask_to_apply_message": message,
+            "ask_to_apply_sent_at": now,
+            # Set expiry (e.g., 30 days from now)
+            "ask_to_apply_expires_at": now + timedelta(days=30),
+            "ask_to_apply_status": "PENDING",
+            "ask_to_apply_accepted": False,  # Not accepted yet
+        })
+    return changes
+
+
+def detach(session: Session, match: MatchState) -> MatchState:
+    """Detach a RETURNING row so commit does not expire it and trigger a reload on serialization."""
+    session.expunge(match)
     return match
 
 
@@ -131,43 +335,52 @@ def candidate_action(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get or create match state
-    match = get_or_create_match_state(session, request.candidate_id, request.job_id)
+    now = datetime.utcnow()
+    action = request.action
     
-    # Update candidate action
-    match.candidate_action = request.action
-    match.candidate_action_at = datetime.utcnow()
+    # First interaction: the recruiter has not acted yet
+    fresh = MatchState(
+        candidate_id=request.candidate_id,
+        job_post_id=request.job_id,
+        candidate_action=action,
+        candidate_action_at=now,
+        status="REJECTED" if action == "PASS" else "OPEN"
+    )
+    fresh.unlock_level = update_unlock_level(fresh)
     
-    # If applying, create application record
-    if request.action == "APPLY":
-        # Check if application already exists
-        existing_app = session.exec(
-            select(Application).where(
-                Application.candidate_id == request.candidate_id,
-                Application.job_post_id == request.job_id
-            )
-        ).first()
-        
-        if not existing_app:
-            application = Application(
-                candidate_id=request.candidate_id,
-                job_post_id=request.job_id,
-                status="submitted"
-            )
-            session.add(application)
+    # Create or transition the match state in a single statement
+    match = upsert_match_state(
+        session,
+        request.candidate_id,
+        request.job_id,
+        insert_values={
+            "candidate_action": fresh.candidate_action,
+            "candidate_action_at": fresh.candidate_action_at,
+            "status": fresh.status,
+            "unlock_level": fresh.unlock_level,
+        },
+        update_values={
+            "candidate_action": action,
+            "candidate_action_at": now,
+            "status": transition_status_expression(action, MatchState.recruiter_action),
+            "unlock_level": unlock_level_expression(
+                action, MatchState.recruiter_action, MatchState.ask_to_apply_accepted
+            ),
+            **settle_pending_ask(CANDIDATE_ASK_OUTCOMES.get(action)),
+        }
+    )
     
-    # Update status based on actions
-    if request.action == "PASS" or match.recruiter_action == "PASS":
-        match.status = "REJECTED"
-    elif request.action == "LIKE" and match.recruiter_action == "LIKE":
-        match.status = "MATCHED"
+    # If applying, create application record
+    if action == "APPLY":
+        create_application_if_missing(session, request.candidate_id, request.job_id)
     
-    # Update unlock level
-    match.unlock_level = update_unlock_level(match)
+    record_match_events(session, [match_event(
+        "candidate", action, request.candidate_id, request.job_id,
+        company_id=job.company_id, match_status=match.status
+    )])
     
-    session.add(match)
+    match = detach(session, match)
     session.commit()
-    session.refresh(match)
     
     logger.info(f"Candidate {request.candidate_id} {request.action} job {request.job_id}")
     
@@ -224,21 +437,45 @@ def recruiter_action(
         logger.error(f"Recruiter {recruiter_email} not found or not associated with a company")
         raise HTTPException(status_code=403, detail="User not authorized")
     
-    # Get or create match state
-    match = get_or_create_match_state(session, request.candidate_id, request.job_id)
+    now = datetime.utcnow()
+    action = request.action
     
-    # Update recruiter action
-    match.recruiter_action = request.action
-    match.recruiter_action_at = datetime.utcnow()
+    changes = recruiter_action_changes(action, request.message, now)
     
-    # Handle ASK_TO_APPLY special case
-    if request.action == "ASK_TO_APPLY":
-        match.ask_to_apply_message = request.message
-        match.ask_to_apply_sent_at = datetime.utcnow()
-        # Set expiry (e.g., 30 days from now)
-        match.ask_to_apply_expires_at = datetime.utcnow() + timedelta(days=30)
-        match.ask_to_apply_accepted = False  # Not accepted yet
-        
+    # First interaction: the candidate has not acted yet
+    fresh = MatchState(
+        candidate_id=request.candidate_id,
+        job_post_id=request.job_id,
+        status="REJECTED" if action == "PASS" else "OPEN",
+        **changes
+    )
+    fresh.unlock_level = update_unlock_level(fresh)
+    
+    # Create or transition the match state in a single statement
+    match = upsert_match_state(
+        session,
+        request.candidate_id,
+        request.job_id,
+        insert_values={**changes, "status": fresh.status, "unlock_level": fresh.unlock_level},
+        update_values={
+            **changes,
+            "status": transition_status_expression(action, MatchState.candidate_action),
+            "unlock_level": unlock_level_expression(
+                MatchState.candidate_action,
+                action,
+                False if action == "ASK_TO_APPLY" else MatchState.ask_to_apply_accepted
+            ),
+            **settle_pending_ask(RECRUITER_ASK_OUTCOMES.get(action)),
+        }
+    )
+    record_match_events(session, [match_event(
+        "recruiter", action, request.candidate_id, request.job_id,
+        company_id=job.company_id, company_user_id=user.company_user.id, match_status=match.status
+    )])
+    match = detach(session, match)
+    session.commit()
+    
+    if action == "ASK_TO_APPLY":
         # AUDIT LOG: Track invitation details
         logger.info(
             f"INVITATION SENT | Recruiter: {current_user.get('sub')} | "
@@ -249,22 +486,203 @@ def recruiter_action(
             f"Expires: {match.ask_to_apply_expires_at}"
         )
     
-    # Update status based on actions
-    if request.action == "PASS" or match.candidate_action == "PASS":
-        match.status = "REJECTED"
-    elif request.action == "LIKE" and match.candidate_action == "LIKE":
-        match.status = "MATCHED"
+    logger.info(f"Recruiter {request.action} candidate {request.candidate_id} for job {request.job_id}")
     
-    # Update unlock level
-    match.unlock_level = update_unlock_level(match)
+    return match
+
+
+@router.post("/recruiter/bulk-action")
+def recruiter_bulk_action(
+    request: BulkRecruiterActionRequest,
+    session: Session = Depends(get_session),
+    current_user: dict = Depends(require_company_user)
+):
+    """
+    Apply many recruiter actions (LIKE/PASS/ASK_TO_APPLY) in one request.
+    
+    Items are validated with one query per table, LIKEs are scored in one batch,
+    and all MatchState upserts and Swipe inserts (LIKE/PASS, unless already swiped)
+    are written with multi-row statements in a single transaction.
+    
+    Returns one result per item in request order. Invalid items get ok=False and an
+    error without failing the rest of the batch.
+    """
+    company_id = current_user.get("company_id")
+    items = request.items
+    
+    company_user_id = resolve_company_user_id(session, current_user)
+    if company_user_id is None:
+        logger.error(f"Recruiter {current_user.get('sub')} not found or not associated with a company")
+        raise HTTPException(status_code=403, detail="User not authorized")
+    
+    # Set-based lookups: one query per table for the whole batch
+    candidate_ids = {item.candidate_id for item in items}
+    job_ids = {item.job_id for item in items}
+    candidates = {
+        candidate.id: candidate
+        for candidate in session.exec(select(Candidate).where(Candidate.id.in_(candidate_ids))).all()
+    }
+    jobs = {
+        job.id: job
+        for job in session.exec(select(JobPost).where(JobPost.id.in_(job_ids))).all()
+    }
+    swipe_pairs = {
+        (item.candidate_id, item.job_id) for item in items if item.action in RECRUITER_SWIPE_ACTIONS
+    }
+    already_swiped = set()
+    if swipe_pairs:
+        already_swiped = {
+            tuple(row) for row in session.exec(
+                select(Swipe.candidate_id, Swipe.job_post_id)
+                .where(tuple_(Swipe.candidate_id, Swipe.job_post_id).in_(swipe_pairs))
+            ).all()
+        }
+    
+    results = []
+    valid = []
+    seen_pairs = set()
+    for item in items:
+        result = {
+            "candidate_id": item.candidate_id,
+            "job_id": item.job_id,
+            "action": item.action,
+            "ok": False,
+            "error": None,
+        }
+        results.append(result)
+        pair = (item.candidate_id, item.job_id)
+        job = jobs.get(item.job_id)
+        
+        if item.action not in ["LIKE", "PASS", "ASK_TO_APPLY"]:
+            result["error"] = "Invalid action. Must be LIKE, PASS, or ASK_TO_APPLY"
+        elif item.candidate_id not in candidates:
+            result["error"] = "Candidate not found"
+        elif not job:
+            result["error"] = "Job not found"
+        elif job.company_id != company_id:
+            logger.error(f"SECURITY VIOLATION: Recruiter {current_user.get('sub')} (Company {company_id}) attempted bulk {item.action} candidate {item.candidate_id} for job {item.job_id} belonging to Company {job.company_id}")
+            result["error"] = "You can only take actions on candidates for your own company's jobs"
+        elif pair in seen_pairs:
+            result["error"] = "Duplicate candidate/job pair in batch"
+        else:
+            seen_pairs.add(pair)
+            valid.append((item, result))
+    
+    # Score only the likes, in one batch
+    likes = [(item, result) for item, result in valid if item.action == "LIKE"]
+    scores = calculate_match_scores(
+        [(candidates[item.candidate_id], jobs[item.job_id]) for item, _ in likes],
+        session
+    )
+    score_data = {
+        (item.candidate_id, item.job_id): score for (item, _), score in zip(likes, scores)
+    }
+    
+    now = datetime.utcnow()
+    
+    # One multi-row upsert per action, since status/unlock rules depend on the action
+    matches = {}
+    for action in ["LIKE", "PASS", "ASK_TO_APPLY"]:
+        group = [item for item, _ in valid if item.action == action]
+        if not group:
+            continue
+        rows = []
+        for item in group:
+            changes = recruiter_action_changes(action, item.message, now)
+            # First interaction: the candidate has not acted yet
+            fresh = MatchState(
+                candidate_id=item.candidate_id,
+                job_post_id=item.job_id,
+                status="REJECTED" if action == "PASS" else "OPEN",
+                **changes
+            )
+            row = {
+                **changes,
+                "candidate_id": item.candidate_id,
+                "job_post_id": item.job_id,
+                "status": fresh.status,
+                "unlock_level": update_unlock_level(fresh),
+            }
+            if action == "LIKE":
+                row["initial_match_score"] = score_data[(item.candidate_id, item.job_id)].get("overall_score")
+            rows.append(row)
+        
+        upserted = upsert_match_states(
+            session,
+            rows,
+            update_columns=list(changes),
+            update_values={
+                "status": transition_status_expression(action, MatchState.candidate_action),
+                "unlock_level": unlock_level_expression(
+                    MatchState.candidate_action,
+                    action,
+                    False if action == "ASK_TO_APPLY" else MatchState.ask_to_apply_accepted
+                ),
+                **settle_pending_ask(RECRUITER_ASK_OUTCOMES.get(action)),
+            }
+        )
+        for match in upserted:
+            matches[(match.candidate_id, match.job_post_id)] = detach(session, match)
+    
+    # Swipe history for likes/passes not already recorded, in one multi-row insert
+    swipe_rows = []
+    for item, _ in valid:
+        pair = (item.candidate_id, item.job_id)
+        if item.action not in RECRUITER_SWIPE_ACTIONS or pair in already_swiped:
+            continue
+        score = score_data.get(pair)
+        swipe_rows.append({
+            "candidate_id": item.candidate_id,
+            "job_post_id": item.job_id,
+            "company_user_id": company_user_id,
+            "action": RECRUITER_SWIPE_ACTIONS[item.action],
+            "match_score": score.get("overall_score") if score else None,
+            "match_explanation": json.dumps(score) if score else None,
+            "created_at": now,
+        })
+    swipe_ids = {}
+    if swipe_rows:
+        inserted = session.exec(
+            insert(Swipe)
+            .values(swipe_rows)
+            .returning(Swipe.id, Swipe.candidate_id, Swipe.job_post_id)
+        ).all()
+        swipe_ids = {(candidate_id, job_id): swipe_id for swipe_id, candidate_id, job_id in inserted}
+    
+    record_match_events(session, [
+        match_event(
+            "recruiter", item.action, item.candidate_id, item.job_id,
+            company_id=company_id, company_user_id=company_user_id,
+            match_status=matches[(item.candidate_id, item.job_id)].status
+        )
+        for item, _ in valid
+    ])
     
-    session.add(match)
     session.commit()
-    session.refresh(match)
     
-    logger.info(f"Recruiter {request.action} candidate {request.candidate_id} for job {request.job_id}")
+    for item, result in valid:
+        pair = (item.candidate_id, item.job_id)
+        match = matches[pair]
+        score = score_data.get(pair)
+        result.update({
+            "ok": True,
+            "match_state_id": match.id,
+            "status": match.status,
+            "unlock_level": match.unlock_level,
+            "swipe_id": swipe_ids.get(pair),
+            "match_score": score.get("overall_score") if score else None,
+        })
     
-    return match
+    logger.info(
+        f"Recruiter {current_user.get('sub')} bulk action: "
+        f"{len(valid)} applied, {len(items) - len(valid)} rejected"
+    )
+    
+    return {
+        "applied": len(valid),
+        "failed": len(items) - len(valid),
+        "results": results,
+    }
 
 
 # ============================================================================
@@ -274,51 +692,80 @@ def recruiter_action(
 @router.get("/candidate/pending-asks/{candidate_id}")
 def get_pending_asks(
     candidate_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: str = Query("asked_at", pattern=ASK_SORT_PATTERN),
     session: Session = Depends(get_session)
 ):
     """
-    Get all pending recruiter invitations (ASK_TO_APPLY) for a candidate.
+    Get pending recruiter invitations (ASK_TO_APPLY) for a candidate.
     Returns invitations that haven't expired and haven't been responded to.
+    
+    Reads the PENDING partial index; the expiry sweeper (ask_expiry) moves due
+    invitations out of it, and ones due since the last sweep are filtered here.
+    
+    One joined query selecting only the rendered fields. sort=asked_at (newest first)
+    or sort=score (best first); pass `next_cursor` back as `cursor`. `total` covers all pages.
     """
     # Verify candidate exists
     candidate = session.get(Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Query pending asks
+    sort_key = listing_sort_key(sort, MatchState.ask_to_apply_sent_at)
     now = datetime.utcnow()
-    statement = select(MatchState).where(
-        MatchState.candidate_id == candidate_id,
-        MatchState.recruiter_action == "ASK_TO_APPLY",
-        MatchState.ask_to_apply_accepted == False,
-        MatchState.ask_to_apply_expires_at > now  # Not expired
+    statement = (
+        select(
+            MatchState.id.label("match_state_id"),
+            MatchState.ask_to_apply_message,
+            MatchState.ask_to_apply_sent_at,
+            MatchState.ask_to_apply_expires_at,
+            MatchState.initial_match_score,
+            JobPost.id.label("job_id"),
+            JobPost.title,
+            JobPost.location,
+            JobPost.work_type,
+            JobPost.role,
+            JobPost.seniority,
+            JobPost.min_rate,
+            JobPost.max_rate,
+            CompanyAccount.company_name,
+            sort_key[0].label("sort_key"),
+        )
+        .join(JobPost, JobPost.id == MatchState.job_post_id)
+        .outerjoin(CompanyAccount, CompanyAccount.id == JobPost.company_id)
+        .where(
+            MatchState.candidate_id == candidate_id,
+            MatchState.recruiter_action == "ASK_TO_APPLY",
+            MatchState.ask_to_apply_status == "PENDING",
+            MatchState.ask_to_apply_expires_at > now  # Not expired
+        )
     )
+    total = count_rows(session, statement)
+    rows = session.exec(keyset_paginate(statement, sort_key, cursor, limit)).all()
+    rows, next_cursor = split_page(rows, limit, lambda row: (row.sort_key, row.match_state_id))
     
-    pending_asks = session.exec(statement).all()
-    
-    # Enrich with job details
-    result = []
-    for match in pending_asks:
-        job = session.get(JobPost, match.job_post_id)
-        if job:
-            result.append({
-                "match_state_id": match.id,
-                "job": {
-                    "id": job.id,
-                    "title": job.title,
-                    "company_name": job.company.company_name if job.company else "Unknown",
-                    "location": job.location,
-                    "work_type": job.work_type,
-                    "role": job.role,
-                    "seniority": job.seniority,
-                    "min_rate": job.min_rate,
-                    "max_rate": job.max_rate
-                },
-                "message": match.ask_to_apply_message,
-                "asked_at": match.ask_to_apply_sent_at,
-                "expires_at": match.ask_to_apply_expires_at,
-                "match_score": match.initial_match_score
-            })
+    result = [
+        {
+            "match_state_id": row.match_state_id,
+            "job": {
+                "id": row.job_id,
+                "title": row.title,
+                "company_name": row.company_name or "Unknown",
+                "location": row.location,
+                "work_type": row.work_type,
+                "role": row.role,
+                "seniority": row.seniority,
+                "min_rate": row.min_rate,
+                "max_rate": row.max_rate
+            },
+            "message": row.ask_to_apply_message,
+            "asked_at": row.ask_to_apply_sent_at,
+            "expires_at": row.ask_to_apply_expires_at,
+            "match_score": row.initial_match_score
+        }
+        for row in rows
+    ]
     
     # AUDIT LOG: Track when candidates view their invitations
     logger.info(
@@ -329,7 +776,8 @@ def get_pending_asks(
     
     return {
         "pending_asks": result,
-        "total": len(result)
+        "total": total,
+        "next_cursor": next_cursor
     }
 
 
@@ -348,55 +796,82 @@ def respond_to_ask(
     - accept=True: Accept invitation and auto-create application
     - accept=False: Decline invitation
     """
-    # Get match state
-    match = session.get(MatchState, request.match_state_id)
-    if not match:
-        raise HTTPException(status_code=404, detail="Match state not found")
+    now = datetime.utcnow()
     
-    # Verify it's an ask-to-apply
-    if match.recruiter_action != "ASK_TO_APPLY":
-        raise HTTPException(status_code=400, detail="This is not an ask-to-apply invitation")
+    if request.accept:
+        # Accepting applies on the candidate's behalf and unlocks the full profile
+        changes = {
+            "ask_to_apply_accepted": True,
+            "ask_to_apply_status": "ACCEPTED",
+            "candidate_action": "APPLY",
+            "candidate_action_at": now,
+            "status": "MATCHED",
+            "unlock_level": "FULL",
+        }
+    else:
+        changes = {
+            "ask_to_apply_accepted": False,
+            "ask_to_apply_status": "DECLINED",
+            "status": "REJECTED",
+            "unlock_level": unlock_level_expression(
+                MatchState.candidate_action, "ASK_TO_APPLY", False
+            ),
+        }
+    
+    # Guarded transition: only a pending, unexpired invitation is updated, in one statement
+    statement = (
+        update(MatchState)
+        .where(
+            MatchState.id == request.match_state_id,
+            MatchState.recruiter_action == "ASK_TO_APPLY",
+            MatchState.ask_to_apply_status == "PENDING",
+            or_(
+                MatchState.ask_to_apply_expires_at.is_(None),
+                MatchState.ask_to_apply_expires_at >= now
+            )
+        )
+        .values(**changes, updated_at=now)
+        .returning(MatchState)
+        .execution_options(populate_existing=True)
+    )
+    match = session.exec(statement).scalars().first()
     
-    # Check if already responded
-    if match.ask_to_apply_accepted is not None:
+    if not match:
+        # Slow path: work out why the guarded update did not apply
+        match = session.get(MatchState, request.match_state_id)
+        if not match:
+            raise HTTPException(status_code=404, detail="Match state not found")
+        
+        # Verify it's an ask-to-apply
+        if match.recruiter_action != "ASK_TO_APPLY":
+            raise HTTPException(status_code=400, detail="This is not an ask-to-apply invitation")
+        
+        # Check if expired (expire it now if the sweeper has not got to it yet)
+        if expire_due_asks(session, now, match_state_ids=[match.id]):
+            session.commit()
+            raise HTTPException(status_code=400, detail="This invitation has expired")
+        if match.ask_to_apply_status in ("EXPIRED", "PENDING"):  # PENDING: being expired by the sweeper
+            raise HTTPException(status_code=400, detail="This invitation has expired")
+        
         raise HTTPException(status_code=400, detail="Already responded to this invitation")
     
-    # Check if expired
-    if match.ask_to_apply_expires_at and datetime.utcnow() > match.ask_to_apply_expires_at:
-        match.status = "EXPIRED"
-        session.add(match)
-        session.commit()
-        raise HTTPException(status_code=400, detail="This invitation has expired")
+    if request.accept:
+        # Create application
+        create_application_if_missing(session, match.candidate_id, match.job_post_id)
+    
+    record_match_events(session, [match_event(
+        "candidate", "ACCEPT_ASK" if request.accept else "DECLINE_ASK",
+        match.candidate_id, match.job_post_id, match_status=match.status
+    )])
+    
+    match = detach(session, match)
+    session.commit()
     
     # Get candidate and job details for audit log
     candidate = session.get(Candidate, match.candidate_id)
     job = session.get(JobPost, match.job_post_id)
     
-    # Update match state
-    match.ask_to_apply_accepted = request.accept
-    
     if request.accept:
-        # Auto-set candidate action to APPLY
-        match.candidate_action = "APPLY"
-        match.candidate_action_at = datetime.utcnow()
-        match.status = "MATCHED"
-        
-        # Create application
-        existing_app = session.exec(
-            select(Application).where(
-                Application.candidate_id == match.candidate_id,
-                Application.job_post_id == match.job_post_id
-            )
-        ).first()
-        
-        if not existing_app:
-            application = Application(
-                candidate_id=match.candidate_id,
-                job_post_id=match.job_post_id,
-                status="submitted"
-            )
-            session.add(application)
-        
         # AUDIT LOG: Track acceptance
         logger.info(
             f"INVITATION ACCEPTED | Candidate: {candidate.email if candidate else 'Unknown'} (ID: {match.candidate_id}) | "
@@ -404,9 +879,6 @@ def respond_to_ask(
             f"Application Created | Source: RECRUITER_INVITE"
         )
     else:
-        # Declined
-        match.status = "REJECTED"
-        
         # AUDIT LOG: Track rejection
         logger.info(
             f"INVITATION DECLINED | Candidate: {candidate.email if candidate else 'Unknown'} (ID: {match.candidate_id}) | "
@@ -414,13 +886,6 @@ def respond_to_ask(
             f"Status: REJECTED"
         )
     
-    # Update unlock level
-    match.unlock_level = update_unlock_level(match)
-    
-    session.add(match)
-    session.commit()
-    session.refresh(match)
-    
     return match
 
 
@@ -457,54 +922,80 @@ def get_match_state(
 @router.get("/recruiter/shortlist/{company_id}")
 def get_recruiter_shortlist(
     company_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: str = Query("liked_at", pattern=LIKE_SORT_PATTERN),
     session: Session = Depends(get_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get all candidates that recruiters from this company have liked.
+    Get candidates that recruiters from this company have liked.
     Returns candidates with LIKE action from recruiter side.
+    
+    One joined query selecting only the rendered fields. sort=liked_at (newest first)
+    or sort=score (best first); pass `next_cursor` back as `cursor`. `total` covers all pages.
     """
-    # Query all matches where recruiter liked the candidate
-    statement = select(MatchState).join(
-        JobPost, MatchState.job_post_id == JobPost.id
-    ).where(
-        JobPost.company_id == company_id,
-        MatchState.recruiter_action == "LIKE"
+    sort_key = listing_sort_key(sort, MatchState.recruiter_action_at)
+    statement = (
+        select(
+            MatchState.id.label("match_state_id"),
+            MatchState.initial_match_score,
+            MatchState.recruiter_action_at,
+            MatchState.status,
+            Candidate.id.label("candidate_id"),
+            Candidate.name,
+            Candidate.email,
+            Candidate.location,
+            Candidate.primary_role,
+            Candidate.years_experience,
+            Candidate.rate_min,
+            Candidate.rate_max,
+            Candidate.work_type,
+            Candidate.availability,
+            Candidate.summary,
+            JobPost.id.label("job_id"),
+            JobPost.title.label("job_title"),
+            JobPost.role.label("job_role"),
+            sort_key[0].label("sort_key"),
+        )
+        .join(JobPost, JobPost.id == MatchState.job_post_id)
+        .join(Candidate, Candidate.id == MatchState.candidate_id)
+        .where(
+            JobPost.company_id == company_id,
+            MatchState.recruiter_action == "LIKE"
+        )
     )
+    total = count_rows(session, statement)
+    rows = session.exec(keyset_paginate(statement, sort_key, cursor, limit)).all()
+    rows, next_cursor = split_page(rows, limit, lambda row: (row.sort_key, row.match_state_id))
     
-    liked_matches = session.exec(statement).all()
-    
-    # Enrich with candidate and job details
-    result = []
-    for match in liked_matches:
-        candidate = session.get(Candidate, match.candidate_id)
-        job = session.get(JobPost, match.job_post_id)
-        
-        if candidate and job:
-            result.append({
-                "match_state_id": match.id,
-                "candidate": {
-                    "id": candidate.id,
-                    "name": candidate.name,
-                    "email": candidate.email,
-                    "location": candidate.location,
-                    "primary_role": candidate.primary_role,
-                    "years_experience": candidate.years_experience,
-                    "rate_min": candidate.rate_min,
-                    "rate_max": candidate.rate_max,
-                    "work_type": candidate.work_type,
-                    "availability": candidate.availability,
-                    "summary": candidate.summary
-                },
-                "job": {
-                    "id": job.id,
-                    "title": job.title,
-                    "role": job.role
-                },
-                "match_score": match.initial_match_score,
-                "liked_at": match.recruiter_action_at.isoformat() if match.recruiter_action_at else None,
-                "status": match.status
-            })
+    result = [
+        {
+            "match_state_id": row.match_state_id,
+            "candidate": {
+                "id": row.candidate_id,
+                "name": row.name,
+                "email": row.email,
+                "location": row.location,
+                "primary_role": row.primary_role,
+                "years_experience": row.years_experience,
+                "rate_min": row.rate_min,
+                "rate_max": row.rate_max,
+                "work_type": row.work_type,
+                "availability": row.availability,
+                "summary": row.summary
+            },
+            "job": {
+                "id": row.job_id,
+                "title": row.job_title,
+                "role": row.job_role
+            },
+            "match_score": row.initial_match_score,
+            "liked_at": row.recruiter_action_at.isoformat() if row.recruiter_action_at else None,
+            "status": row.status
+        }
+        for row in rows
+    ]
     
     logger.info(
         f"SHORTLIST VIEWED | Company ID: {company_id} | "
@@ -513,8 +1004,9 @@ def get_recruiter_shortlist(
     )
     
     return {
-        "total": len(result),
-        "shortlisted_candidates": result
+        "total": total,
+        "shortlisted_candidates": result,
+        "next_cursor": next_cursor
     }
 
 
@@ -525,60 +1017,88 @@ def get_recruiter_shortlist(
 @router.get("/candidate/likes/{candidate_id}")
 def get_candidate_likes(
     candidate_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: str = Query("liked_at", pattern=LIKE_SORT_PATTERN),
     session: Session = Depends(get_session)
 ):
     """
-    Get all jobs that the candidate has liked.
+    Get the jobs that the candidate has liked.
     Returns jobs with LIKE action from candidate side.
+    
+    One joined query selecting only the rendered fields. sort=liked_at (newest first)
+    or sort=score (best first); pass `next_cursor` back as `cursor`. `total` covers all pages.
     """
     # Verify candidate exists
     candidate = session.get(Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Query all matches where candidate liked the job
-    statement = select(MatchState).where(
-        MatchState.candidate_id == candidate_id,
-        MatchState.candidate_action == "LIKE"
+    sort_key = listing_sort_key(sort, MatchState.candidate_action_at)
+    statement = (
+        select(
+            MatchState.id.label("match_state_id"),
+            MatchState.initial_match_score,
+            MatchState.candidate_action_at,
+            MatchState.status,
+            MatchState.recruiter_action,
+            JobPost.id.label("job_id"),
+            JobPost.title,
+            JobPost.description,
+            JobPost.company_id,
+            JobPost.role,
+            JobPost.seniority,
+            JobPost.location,
+            JobPost.work_type,
+            JobPost.job_type,
+            JobPost.min_rate,
+            JobPost.max_rate,
+            JobPost.duration,
+            JobPost.start_date,
+            JobPost.required_skills,
+            JobPost.nice_to_have_skills,
+            CompanyAccount.company_name,
+            sort_key[0].label("sort_key"),
+        )
+        .join(JobPost, JobPost.id == MatchState.job_post_id)
+        .outerjoin(CompanyAccount, CompanyAccount.id == JobPost.company_id)
+        .where(
+            MatchState.candidate_id == candidate_id,
+            MatchState.candidate_action == "LIKE"
+        )
     )
+    total = count_rows(session, statement)
+    rows = session.exec(keyset_paginate(statement, sort_key, cursor, limit)).all()
+    rows, next_cursor = split_page(rows, limit, lambda row: (row.sort_key, row.match_state_id))
     
-    liked_matches = session.exec(statement).all()
-    
-    # Enrich with job details
-    result = []
-    for match in liked_matches:
-        job = session.get(JobPost, match.job_post_id)
-        
-        if job:
-            # Get company info
-            from ..models import CompanyAccount
-            company = session.get(CompanyAccount, job.company_id)
-            
-            result.append({
-                "match_state_id": match.id,
-                "job": {
-                    "id": job.id,
-                    "title": job.title,
-                    "description": job.description,
-                    "company_name": company.company_name if company else "Unknown Company",
-                    "company_id": job.company_id,
-                    "role": job.role,
-                    "seniority": job.seniority,
-                    "location": job.location,
-                    "work_type": job.work_type,
-                    "job_type": job.job_type,
-                    "min_rate": job.min_rate,
-                    "max_rate": job.max_rate,
-                    "duration": job.duration,
-                    "start_date": job.start_date,
-                    "required_skills": job.required_skills,
-                    "nice_to_have_skills": job.nice_to_have_skills
-                },
-                "match_score": match.initial_match_score,
-                "liked_at": match.candidate_action_at.isoformat() if match.candidate_action_at else None,
-                "status": match.status,
-                "recruiter_action": match.recruiter_action  # Show if recruiter also liked
-            })
+    result = [
+        {
+            "match_state_id": row.match_state_id,
+            "job": {
+                "id": row.job_id,
+                "title": row.title,
+                "description": row.description,
+                "company_name": row.company_name or "Unknown Company",
+                "company_id": row.company_id,
+                "role": row.role,
+                "seniority": row.seniority,
+                "location": row.location,
+                "work_type": row.work_type,
+                "job_type": row.job_type,
+                "min_rate": row.min_rate,
+                "max_rate": row.max_rate,
+                "duration": row.duration,
+                "start_date": row.start_date,
+                "required_skills": row.required_skills,
+                "nice_to_have_skills": row.nice_to_have_skills
+            },
+            "match_score": row.initial_match_score,
+            "liked_at": row.candidate_action_at.isoformat() if row.candidate_action_at else None,
+            "status": row.status,
+            "recruiter_action": row.recruiter_action  # Show if recruiter also liked
+        }
+        for row in rows
+    ]
     
     logger.info(
         f"LIKES VIEWED | Candidate: {candidate.email} (ID: {candidate_id}) | "
@@ -586,6 +1106,43 @@ def get_candidate_likes(
     )
     
     return {
-        "total": len(result),
-        "liked_jobs": result
+        "total": total,
+        "liked_jobs": result,
+        "next_cursor": next_cursor
+    }
+
+
+# ============================================================================
+# FUNNEL COUNTERS
+# ============================================================================
+
+@router.get("/funnel")
+def get_funnel(
+    job_id: Optional[int] = None,
+    session: Session = Depends(get_session),
+    current_user: dict = Depends(require_company_user)
+):
+    """
+    Candidates per funnel stage for the recruiter's company and each of its jobs
+    (or only the given job).
+    
+    Reads the counters kept up to date by every match action (see match_events),
+    so no match or application rows are aggregated.
+    """
+    company_id = current_user.get("company_id")
+    
+    if job_id is not None:
+        job = session.get(JobPost, job_id)
+        if not job or job.company_id != company_id:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return {"job_id": job_id, "stages": funnel_counts(session, "job", [job_id])[job_id]}
+    
+    job_ids = session.exec(
+        select(JobPost.id).where(JobPost.company_id == company_id).order_by(JobPost.id)
+    ).all()
+    jobs = funnel_counts(session, "job", job_ids)
+    return {
+        "company_id": company_id,
+        "stages": funnel_counts(session, "company", [company_id])[company_id],
+        "jobs": [{"job_id": job_id, "stages": jobs[job_id]} for job_id in job_ids],
     }
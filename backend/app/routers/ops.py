@@ -0,0 +1,31 @@
+"""
+Operational endpoints: in-process metrics of this worker's caches, pools and
+background threads.
+"""
+
+from fastapi import APIRouter, Depends
+
+from ..admission import admission_stats
+from ..analytics import analytics_rollup_stats
+from ..ask_expiry import ask_expiry_stats
+from ..projections import job_projection_cache_stats
+from ..push import push_stats
+from ..resume_extraction import resume_extraction_stats
+from ..security import password_pool_stats, require_company_role, token_cache_stats
+
+router = APIRouter(prefix="/ops", tags=["ops"])
+
+
+@router.get("/metrics", response_model=dict)
+def ops_metrics(current_user: dict = Depends(require_company_role(["ADMIN"]))):
+    """Metrics for this worker process (ADMIN only); each worker reports its own."""
+    return {
+        "token_cache": token_cache_stats(),
+        "password_pool": password_pool_stats(),
+        "admission": admission_stats(),
+        "job_projections": job_projection_cache_stats(),
+        "resume_extraction": resume_extraction_stats(),
+        "analytics_rollup": analytics_rollup_stats(),
+        "ask_expiry": ask_expiry_stats(),
+        "push": push_stats(),
+    }
@@ -6,7 +6,7 @@ import json
 from ..database import get_session
 from ..models import Candidate, CandidateJobPreference
 from ..schemas import JobPreferenceCreate, JobPreferenceUpdate, JobPreferenceRead, CandidateReadWithPreferences
-from ..security import require_candidate
+from ..principals import get_current_candidate, get_current_candidate_id
 
 
 router = APIRouter(prefix="/preferences", tags=["preferences"])
@@ -15,26 +15,13 @@ router = APIRouter(prefix="/preferences", tags=["preferences"])
 @router.post("/create", response_model=JobPreferenceRead)
 def create_job_preference(
     preference: JobPreferenceCreate,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Create a new job preference profile for the candidate."""
-    user_id = current_user.get("user_id")
-    
-    # Get candidate
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     # Create job preference
     new_preference = CandidateJobPreference(
-        candidate_id=candidate.id,
+        candidate_id=candidate_id,
         product=preference.product,
         primary_role=preference.primary_role,
         years_experience=preference.years_experience,
@@ -57,25 +44,13 @@ def create_job_preference(
 
 @router.get("/my-preferences", response_model=list[JobPreferenceRead])
 def get_my_preferences(
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Get all active job preferences for authenticated candidate."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     preferences = session.exec(
         select(CandidateJobPreference).where(
-            (CandidateJobPreference.candidate_id == candidate.id) &
+            (CandidateJobPreference.candidate_id == candidate_id) &
             (CandidateJobPreference.is_active == True)
         ).order_by(CandidateJobPreference.created_at.desc())
     ).all()
@@ -85,48 +60,24 @@ def get_my_preferences(
 
 @router.get("/my-profile", response_model=CandidateReadWithPreferences)
 def get_profile_with_preferences(
-    current_user: dict = Depends(require_candidate),
+    candidate: Candidate = Depends(get_current_candidate),
     session: Session = Depends(get_session)
 ):
     """Get candidate profile with all job preferences."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     return candidate
 
 
 @router.get("/{preference_id}", response_model=JobPreferenceRead)
 def get_preference(
     preference_id: int,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Get specific job preference."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     preference = session.exec(
         select(CandidateJobPreference).where(
             (CandidateJobPreference.id == preference_id) &
-            (CandidateJobPreference.candidate_id == candidate.id)
+            (CandidateJobPreference.candidate_id == candidate_id)
         )
     ).first()
     
@@ -143,26 +94,14 @@ def get_preference(
 def update_preference(
     preference_id: int,
     update: JobPreferenceUpdate,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Update existing job preference."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     preference = session.exec(
         select(CandidateJobPreference).where(
             (CandidateJobPreference.id == preference_id) &
-            (CandidateJobPreference.candidate_id == candidate.id)
+            (CandidateJobPreference.candidate_id == candidate_id)
         )
     ).first()
     
@@ -193,26 +132,14 @@ def update_preference(
 @router.delete("/{preference_id}", response_model=dict)
 def delete_preference(
     preference_id: int,
-    current_user: dict = Depends(require_candidate),
+    candidate_id: int = Depends(get_current_candidate_id),
     session: Session = Depends(get_session)
 ):
     """Delete a job preference (soft or hard delete)."""
-    user_id = current_user.get("user_id")
-    
-    candidate = session.exec(
-        select(Candidate).where(Candidate.user_id == user_id)
-    ).first()
-    
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate profile not found"
-        )
-    
     preference = session.exec(
         select(CandidateJobPreference).where(
             (CandidateJobPreference.id == preference_id) &
-            (CandidateJobPreference.candidate_id == candidate.id)
+            (CandidateJobPreference.candidate_id == candidate_id)
         )
     ).first()
     
@@ -9,18 +9,23 @@ from sqlmodel import Session, select
 
 from ..database import get_session
 from ..models import (
-    Candidate, JobPost, Swipe, User, CompanyUser, Skill
+    Candidate, JobPost, Swipe, User, Skill
 )
 from ..schemas import (
     CandidateMatchCard, CandidateFeedResponse, RankingResponse, SwipeResponse, MatchExplanation
 )
 from ..matching import calculate_match_score
+from ..match_events import match_event, record_match_events
 from ..security import get_current_user, require_company_user
+from ..principals import resolve_company_user_id
+from ..admission import admit
 
 router = APIRouter(prefix="/swipes", tags=["swipes"])
 
 
-@router.get("/feed/{job_id}", response_model=CandidateFeedResponse)
+@router.get(
+    "/feed/{job_id}", response_model=CandidateFeedResponse, dependencies=[Depends(admit("swipes.feed"))]
+)
 def get_candidate_feed(
     job_id: int,
     limit: int = Query(10, ge=1, le=100),
@@ -131,7 +136,6 @@ def like_candidate(
     """
     Like a candidate for a job.
     """
-    user_id = current_user.get("user_id")
     company_id = current_user.get("company_id")
     
     # Verify job and candidate exist
@@ -162,10 +166,8 @@ def like_candidate(
             detail="Already swiped on this candidate"
         )
     
-    # Get company user
-    company_user = session.exec(
-        select(CompanyUser).where(CompanyUser.user_id == user_id)
-    ).first()
+    # Get company user (from the token claim when present)
+    company_user_id = resolve_company_user_id(session, current_user)
     
     # Calculate match score
     score_data = calculate_match_score(candidate, job, session)
@@ -174,12 +176,16 @@ def like_candidate(
     swipe = Swipe(
         candidate_id=candidate_id,
         job_post_id=job_id,
-        company_user_id=company_user.id if company_user else None,
+        company_user_id=company_user_id,
         action="like",
         match_score=score_data.get("overall_score"),
         match_explanation=json.dumps(score_data)
     )
     session.add(swipe)
+    record_match_events(session, [match_event(
+        "recruiter", "LIKE", candidate_id, job_id,
+        company_id=company_id, company_user_id=company_user_id
+    )])
     session.commit()
     session.refresh(swipe)
     
@@ -201,7 +207,6 @@ def pass_candidate(
     """
     Pass on a candidate for a job.
     """
-    user_id = current_user.get("user_id")
     company_id = current_user.get("company_id")
     
     # Verify job exists
@@ -232,19 +237,21 @@ def pass_candidate(
             detail="Already swiped on this candidate"
         )
     
-    # Get company user
-    company_user = session.exec(
-        select(CompanyUser).where(CompanyUser.user_id == user_id)
-    ).first()
+    # Get company user (from the token claim when present)
+    company_user_id = resolve_company_user_id(session, current_user)
     
     # Create pass swipe
     swipe = Swipe(
         candidate_id=candidate_id,
         job_post_id=job_id,
-        company_user_id=company_user.id if company_user else None,
+        company_user_id=company_user_id,
         action="pass"
     )
     session.add(swipe)
+    record_match_events(session, [match_event(
+        "recruiter", "PASS", candidate_id, job_id,
+        company_id=company_id, company_user_id=company_user_id
+    )])
     session.commit()
     session.refresh(swipe)
     
@@ -5,7 +5,7 @@ Request/Response schemas for all endpoints.
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import json
-from pydantic import BaseModel, field_validator, EmailStr
+from pydantic import BaseModel, Field, field_validator, EmailStr
 
 
 # ============================================================================
@@ -60,6 +60,16 @@ class SkillRead(SkillCreate):
     id: int
 
 
+class SkillSuggestion(BaseModel):
+    name: str  # canonical name from the skills vocabulary
+    category: str
+    mentions: int  # times the resume mentions it
+
+
+class SkillSuggestionAccept(BaseModel):
+    names: List[str] = Field(min_length=1, max_length=200)
+
+
 class CertificationCreate(BaseModel):
     name: str
     issuer: Optional[str] = None
@@ -74,6 +84,18 @@ class ResumeRead(BaseModel):
     id: int
     filename: str
     created_at: str
+    size_bytes: Optional[int] = None
+    content_hash: Optional[str] = None  # SHA-256 hex of the file contents
+    extraction_status: Optional[str] = None  # "pending", "processing", "done", "failed"
+
+
+class ResumeTextRead(BaseModel):
+    id: int
+    extraction_status: str
+    extracted_at: Optional[datetime] = None
+    error: Optional[str] = None
+    text: Optional[str] = None
+    stats: Optional[Dict[str, Any]] = None  # words, unique_terms, top_terms, ...
 
 
 class SocialLinkCreate(BaseModel):
@@ -248,6 +270,27 @@ class CompanyProfileRead(CompanyAccountRead):
     company_users: List[CompanyUserRead] = []
 
 
+# Upper bound on accounts created or linked by one provisioning request
+EMPLOYEE_PROVISION_MAX_ITEMS = 500
+
+
+class EmployeeProvision(BaseModel):
+    email: EmailStr
+    first_name: str = ""
+    last_name: str = ""
+    role: str  # "ADMIN", "HR", or "RECRUITER"
+    password: Optional[str] = None  # New accounts only; omitted -> temporary password returned once
+
+    @field_validator('password')
+    @classmethod
+    def validate_password(cls, v):
+        return SignUpRequest.validate_password(v) if v is not None else v
+
+
+class EmployeeProvisionRequest(BaseModel):
+    employees: List[EmployeeProvision] = Field(..., min_length=1, max_length=EMPLOYEE_PROVISION_MAX_ITEMS)
+
+
 # ============================================================================
 # JOB POST SCHEMAS
 # ============================================================================
@@ -304,6 +347,7 @@ class JobPostUpdate(BaseModel):
 class JobPostRead(JobPostCreate):
     id: int
     company_id: int
+    description_skills: List[str] = []  # canonical skills mentioned in the description
     status: str
     created_at: str
     updated_at: str
@@ -417,6 +461,36 @@ class RoleFitResponse(BaseModel):
     notes: str  # Explanation of the score
 
 
+ROLE_FIT_BATCH_MAX_IDS = 10000
+
+
+class RoleFitBatchRequest(BaseModel):
+    product_author: str
+    product: str
+    job_role: str
+    # Candidates to score: these ids, else every candidate; the filters below narrow either
+    candidate_ids: Optional[List[int]] = Field(None, max_length=ROLE_FIT_BATCH_MAX_IDS)
+    location: Optional[str] = None  # substring, case-insensitive
+    work_type: Optional[str] = None
+    min_years_experience: Optional[int] = None
+    min_score: Optional[float] = None
+
+
+class RoleFitBatchItem(BaseModel):
+    candidate_id: int
+    name: str
+    score: float  # 0-100
+    factors: Dict[str, Any]
+
+
+class RoleFitBatchResponse(BaseModel):
+    product_author: str
+    product: str
+    job_role: str
+    total: int  # candidates ranked (after filters and min_score)
+    items: List[RoleFitBatchItem]  # best first
+
+
 # ============================================================================
 # APPLICATION SCHEMAS
 # ============================================================================
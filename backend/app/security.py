@@ -2,9 +2,15 @@
 Security utilities: JWT, password hashing, token validation.
 """
 
+import asyncio
+import hashlib
 import os
+import secrets
+import threading
 import time
 import jwt
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from passlib.context import CryptContext
@@ -20,9 +26,32 @@ if not JWT_SECRET:
         raise RuntimeError("APP_JWT_SECRET must be set in non-development environments")
 JWT_ALGORITHM = "HS256"
 JWT_EXP_HOURS = int(os.getenv("APP_JWT_EXP_HOURS", "24"))
+# Verified tokens kept in memory (see decode_token_cached)
+TOKEN_CACHE_SIZE = int(os.getenv("APP_TOKEN_CACHE_SIZE", "10000"))
+
+# Argon2 cost parameters (defaults match passlib's). Changing them upgrades existing
+# hashes transparently on each user's next successful login.
+ARGON2_TIME_COST = int(os.getenv("APP_ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("APP_ARGON2_MEMORY_COST", "102400"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("APP_ARGON2_PARALLELISM", "8"))
+
+# Dedicated password hashing pool: argon2 releases the GIL, so a few threads use the
+# CPU without occupying the threadpool that serves every other sync route
+PASSWORD_HASH_WORKERS = int(os.getenv("APP_PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Running + queued hashes allowed before new logins/signups are shed with 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("APP_PASSWORD_HASH_MAX_PENDING", "32"))
+# Bulk provisioning hashes in at most this many chunked jobs, so interactive
+# logins keep the remaining hashing workers
+PASSWORD_BULK_HASH_JOBS = max(1, PASSWORD_HASH_WORKERS // 2)
 
 # Password hashing - Using Argon2 which supports unlimited password length
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
 
 
 def hash_password(password: str) -> str:
@@ -39,6 +68,97 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password_truncated, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses outdated parameters, return a fresh hash.
+    
+    Returns (valid, new_hash); new_hash is None when the stored hash is current.
+    """
+    password_truncated = plain_password[:128]
+    return pwd_context.verify_and_update(password_truncated, hashed_password)
+
+
+# ============================================================================
+# NON-BLOCKING PASSWORD HASHING
+# ============================================================================
+
+_password_pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_password_slots = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+_password_lock = threading.Lock()
+_password_stats = {"completed": 0, "rejected": 0, "pending": 0}
+
+
+def _release_password_slot(_: Future) -> None:
+    with _password_lock:
+        _password_stats["pending"] -= 1
+        _password_stats["completed"] += 1
+    _password_slots.release()
+
+
+def _submit_password_job(fn, *args) -> Future:
+    """Queue a hashing job on the dedicated pool, or shed load with 503 when it is full."""
+    if not _password_slots.acquire(blocking=False):
+        with _password_lock:
+            _password_stats["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    with _password_lock:
+        _password_stats["pending"] += 1
+    future = _password_pool.submit(fn, *args)
+    future.add_done_callback(_release_password_slot)
+    return future
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() on the dedicated pool, without blocking the event loop."""
+    return await asyncio.wrap_future(_submit_password_job(hash_password, password))
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """verify_and_update_password() on the dedicated pool, without blocking the event loop."""
+    return await asyncio.wrap_future(
+        _submit_password_job(verify_and_update_password, plain_password, hashed_password)
+    )
+
+
+def _hash_passwords(passwords: list[str]) -> list[str]:
+    return [hash_password(password) for password in passwords]
+
+
+async def hash_passwords_async(passwords: list[str]) -> list[str]:
+    """
+    Hash many passwords (bulk provisioning) on the dedicated pool, in request order.
+    
+    The list is split into at most PASSWORD_BULK_HASH_JOBS contiguous chunks, each
+    taking a single pool slot, so a large batch cannot crowd out logins.
+    """
+    if not passwords:
+        return []
+    jobs = min(PASSWORD_BULK_HASH_JOBS, len(passwords))
+    size = -(-len(passwords) // jobs)
+    futures = [
+        asyncio.wrap_future(_submit_password_job(_hash_passwords, passwords[start:start + size]))
+        for start in range(0, len(passwords), size)
+    ]
+    hashed = []
+    for chunk in await asyncio.gather(*futures):
+        hashed.extend(chunk)
+    return hashed
+
+
+def password_pool_stats() -> dict:
+    """Queue depth and throughput counters of the password hashing pool."""
+    with _password_lock:
+        return {
+            **_password_stats,
+            "workers": PASSWORD_HASH_WORKERS,
+            "max_pending": PASSWORD_HASH_MAX_PENDING,
+        }
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -48,7 +168,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     else:
         expire = datetime.utcnow() + timedelta(hours=JWT_EXP_HOURS)
     
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+    # Sub-second iat so revoke_user_tokens() separates tokens issued just before and after it
+    to_encode.update({"exp": expire, "iat": time.time()})
     
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
     return encoded_jwt
@@ -73,8 +194,169 @@ def decode_token(token: str) -> dict:
         )
 
 
-async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
-    """Extract user info from JWT token from Authorization header."""
+# ============================================================================
+# VERIFIED TOKEN CACHE AND REVOCATION
+# ============================================================================
+
+# token digest -> (exp timestamp, claims), least recently used first
+_token_cache: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+# token digest -> exp timestamp; kept only until the token would have expired anyway
+_revoked_tokens: dict[bytes, float] = {}
+# user_id -> tokens issued at or before this timestamp are rejected
+_user_tokens_revoked_at: dict[int, float] = {}
+_token_lock = threading.Lock()
+_token_stats = {"hits": 0, "misses": 0, "evictions": 0, "revoked_rejections": 0}
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def _revoked_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def decode_token_cached(token: str) -> dict:
+    """
+    decode_token() behind a bounded LRU of verified claims, keyed by token digest.
+    
+    A cached entry is served until the token's exp, so repeat requests skip the
+    HMAC check and claim parsing. Revoked tokens are rejected before the cache.
+    """
+    digest = _token_digest(token)
+    now = time.time()
+    claims = None
+    with _token_lock:
+        if digest in _revoked_tokens:
+            _token_stats["revoked_rejections"] += 1
+            raise _revoked_error()
+        entry = _token_cache.get(digest)
+        if entry and entry[0] > now:
+            _token_cache.move_to_end(digest)
+            _token_stats["hits"] += 1
+            claims = entry[1]
+        elif entry:
+            del _token_cache[digest]
+    
+    if claims is None:
+        claims = decode_token(token)
+        with _token_lock:
+            _token_stats["misses"] += 1
+            _token_cache[digest] = (claims.get("exp", now), claims)
+            while len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+                _token_stats["evictions"] += 1
+    
+    if claims.get("purpose"):
+        # Stream tickets and the like are never accepted as access tokens
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    _reject_revoked_user(claims)
+    
+    # Callers get their own copy; the cached claims stay untouched
+    return dict(claims)
+
+
+def _reject_revoked_user(claims: dict) -> None:
+    revoked_at = _user_tokens_revoked_at.get(claims.get("user_id"))
+    if revoked_at is not None and claims.get("iat", 0) <= revoked_at:
+        with _token_lock:
+            _token_stats["revoked_rejections"] += 1
+        raise _revoked_error()
+
+
+def revoke_token(token: str) -> None:
+    """Revoke one token (logout): evict it from the cache and reject it until it expires."""
+    digest = _token_digest(token)
+    try:
+        exp = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM]).get("exp", 0)
+    except jwt.InvalidTokenError:
+        return  # Expired or invalid tokens are rejected anyway
+    now = time.time()
+    with _token_lock:
+        _token_cache.pop(digest, None)
+        _revoked_tokens[digest] = exp
+        # Drop revocations whose tokens have expired on their own
+        for expired in [key for key, until in _revoked_tokens.items() if until <= now]:
+            del _revoked_tokens[expired]
+
+
+def revoke_user_tokens(user_id: int) -> None:
+    """Revoke every token issued to a user so far (e.g. deactivation or password change)."""
+    with _token_lock:
+        _user_tokens_revoked_at[user_id] = time.time()
+        for digest in [key for key, (_, claims) in _token_cache.items() if claims.get("user_id") == user_id]:
+            del _token_cache[digest]
+
+
+# ============================================================================
+# STREAM TICKETS
+# ============================================================================
+
+# Lifetime of a stream ticket: long enough to open the EventSource right after fetching it
+STREAM_TICKET_SECONDS = int(os.getenv("APP_STREAM_TICKET_SECONDS", "30"))
+# ticket jti -> exp timestamp of redeemed tickets, kept until they expire anyway
+_redeemed_tickets: dict[str, float] = {}
+
+
+def create_stream_ticket(claims: dict) -> str:
+    """
+    Short-lived, single-use token for the event stream, which EventSource can only
+    authenticate through the URL. Carries the caller's claims, never the access token.
+    """
+    ticket = {key: value for key, value in claims.items() if key not in ("exp", "iat")}
+    ticket.update(purpose="stream", jti=secrets.token_urlsafe(16))
+    return create_access_token(ticket, timedelta(seconds=STREAM_TICKET_SECONDS))
+
+
+def redeem_stream_ticket(ticket: str) -> dict:
+    """
+    Claims of a stream ticket; 401 unless it is valid, unexpired and not used before.
+    Redemptions are remembered per process, like the other revocation state here.
+    """
+    claims = decode_token(ticket)
+    jti = claims.get("jti")
+    if claims.get("purpose") != "stream" or not jti:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid stream ticket",
+        )
+    now = time.time()
+    with _token_lock:
+        for expired in [key for key, until in _redeemed_tickets.items() if until <= now]:
+            del _redeemed_tickets[expired]
+        if jti in _redeemed_tickets:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Stream ticket already used",
+            )
+        _redeemed_tickets[jti] = claims.get("exp", now)
+    _reject_revoked_user(claims)
+    return claims
+
+
+def token_cache_stats() -> dict:
+    """Hit-rate metrics of the verified token cache."""
+    with _token_lock:
+        lookups = _token_stats["hits"] + _token_stats["misses"]
+        return {
+            **_token_stats,
+            "hit_rate": round(_token_stats["hits"] / lookups, 4) if lookups else 0.0,
+            "size": len(_token_cache),
+            "max_size": TOKEN_CACHE_SIZE,
+            "revoked_tokens": len(_revoked_tokens),
+        }
+
+
+def bearer_token(authorization: Optional[str]) -> str:
+    """Extract the token from an `Authorization: Bearer <token>` header."""
     if not authorization:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -93,7 +375,12 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return decode_token(token)
+    return token
+
+
+async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
+    """Extract user info from JWT token from Authorization header."""
+    return decode_token_cached(bearer_token(authorization))
 
 
 async def get_current_user_id(current_user: dict = Depends(get_current_user)) -> int:
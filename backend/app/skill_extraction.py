@@ -0,0 +1,197 @@
+"""
+Skill extraction from free text (resume text, job descriptions).
+
+The vocabulary is every skill in data/skills.json plus the alternative spellings
+in data/skill_aliases.json, each mapped to its canonical name. All of them are
+compiled once into an Aho-Corasick automaton, so a text is scanned in a single
+pass whatever the vocabulary size (instead of one regex per skill). Matches must
+sit on word boundaries, and overlapping matches keep the leftmost-longest one
+("Oracle Integration Cloud" wins over "Integration Cloud" and "Integration").
+
+The module has no app or database imports so it can run in worker processes
+(resume_extraction runs extract_resume_text_and_skills there). The automaton is
+rebuilt when either data file changes.
+"""
+
+import json
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from .text_extraction import extract_resume_text
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+SKILLS_FILE = DATA_DIR / "skills.json"
+ALIASES_FILE = DATA_DIR / "skill_aliases.json"
+
+# Category given to skills that only appear under role_skills
+DEFAULT_CATEGORY = "technical"
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace (both vocabulary and scanned text go through this)."""
+    return _SPACE_RE.sub(" ", text.lower())
+
+
+def _walk_role_skills(node, found: list[str]) -> None:
+    if isinstance(node, dict):
+        for child in node.values():
+            _walk_role_skills(child, found)
+    else:
+        found.extend(node)
+
+
+def load_vocabulary() -> tuple[dict[str, str], dict[str, str]]:
+    """(pattern -> canonical skill, canonical skill -> category) from the data files."""
+    with SKILLS_FILE.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    categories: dict[str, str] = {}
+    for category, skills in data.get("base_skills", {}).items():
+        for skill in skills:
+            categories.setdefault(skill, category)
+    role_skills: list[str] = []
+    _walk_role_skills(data.get("role_skills", {}), role_skills)
+    for skill in role_skills:
+        categories.setdefault(skill, DEFAULT_CATEGORY)
+
+    patterns = {normalize(skill): skill for skill in categories}
+    if ALIASES_FILE.exists():
+        with ALIASES_FILE.open("r", encoding="utf-8") as f:
+            for skill, aliases in json.load(f).items():
+                if skill not in categories:
+                    continue  # alias for a skill no longer in the vocabulary
+                for alias in aliases:
+                    patterns.setdefault(normalize(alias), skill)
+    return patterns, categories
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over the skill vocabulary."""
+
+    def __init__(self, patterns: dict[str, str], categories: Optional[dict[str, str]] = None):
+        self.categories = categories or {}
+        self.skills = sorted(set(patterns.values()))
+        skill_index = {skill: index for index, skill in enumerate(self.skills)}
+
+        # Trie: goto[state][char] -> state; out[state] = (pattern length, skill index) pairs
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[tuple[int, int]]] = [[]]
+        for pattern, skill in patterns.items():
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append((len(pattern), skill_index[skill]))
+
+        # Failure links, breadth first; each state also reports its suffixes' patterns.
+        # Transitions are then completed into a DFA (delta) so a scan never walks
+        # failure links: one dict lookup per character. Missing entries mean "root".
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        for state in queue:
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for char, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(char, 0) if state else 0
+                out[nxt].extend(out[fail[nxt]])
+                queue.append(nxt)
+        self._delta = delta
+        self._out = [tuple(entries) for entries in out]
+        self.pattern_count = len(patterns)
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Canonical skill for a name or alias typed by a user, if it is in the vocabulary."""
+        found = self.find(name)
+        return next(iter(found)) if len(found) == 1 and sum(found.values()) == 1 else None
+
+    def _matches(self, text: str) -> list[tuple[int, int, int]]:
+        """All (start, end, skill index) matches on word boundaries; `text` is normalized."""
+        delta, out = self._delta, self._out
+        size = len(text)
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if out[state]:
+                end = position + 1
+                if end < size and text[end].isalnum():
+                    continue
+                for length, skill in out[state]:
+                    start = end - length
+                    if start == 0 or not text[start - 1].isalnum():
+                        matches.append((start, end, skill))
+        return matches
+
+    def find(self, text: str) -> Counter:
+        """Canonical skill -> number of mentions in `text` (leftmost-longest, non-overlapping)."""
+        matches = self._matches(normalize(text))
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        counts: Counter = Counter()
+        covered = 0
+        for start, end, skill in matches:
+            if start >= covered:
+                counts[self.skills[skill]] += 1
+                covered = end
+        return counts
+
+    def category(self, skill: str) -> str:
+        return self.categories.get(skill, DEFAULT_CATEGORY)
+
+
+_matcher: Optional[tuple[tuple, SkillMatcher]] = None
+_matcher_lock = threading.Lock()
+
+
+def vocabulary_version() -> tuple:
+    """Cheap version of the vocabulary: modification time and size of both data files."""
+    version = []
+    for path in (SKILLS_FILE, ALIASES_FILE):
+        try:
+            stat = path.stat()
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """The process-wide matcher, rebuilt only when the vocabulary files change."""
+    global _matcher
+    version = vocabulary_version()
+    cached = _matcher
+    if cached and cached[0] == version:
+        return cached[1]
+    with _matcher_lock:
+        if _matcher is None or _matcher[0] != version:
+            _matcher = (version, SkillMatcher(*load_vocabulary()))
+        return _matcher[1]
+
+
+def extract_skills(text: Optional[str]) -> dict[str, int]:
+    """Canonical skill -> mentions, most mentioned first."""
+    if not text:
+        return {}
+    return dict(get_skill_matcher().find(text).most_common())
+
+
+def skills_json(text: Optional[str]) -> str:
+    """JSON array of the canonical skills mentioned in `text` (as stored on JobPost.description_skills)."""
+    return json.dumps(list(extract_skills(text)))
+
+
+def extract_resume_text_and_skills(path: str, filename: str, content_type: Optional[str]) -> tuple[str, dict]:
+    """extract_resume_text() plus the skills it mentions under stats["skills"]. Runs in a worker process."""
+    text, stats = extract_resume_text(path, filename, content_type)
+    stats["skills"] = extract_skills(text)
+    return text, stats
@@ -0,0 +1,302 @@
+"""
+Plain-text extraction for resume files (PDF, DOCX, TXT) plus token statistics.
+
+Pure functions with no app or database imports, so they can run in worker
+processes (see resume_extraction). PDFs use pypdf when it is installed and
+otherwise a small built-in reader that handles the common case: Flate-compressed
+content streams with literal/hex text strings and ToUnicode CMaps. DOCX is read
+straight from its XML. Nothing leaves the machine.
+"""
+
+import re
+import zipfile
+import zlib
+from collections import Counter
+from typing import Optional
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # optional; the built-in reader is used instead
+    PdfReader = None
+
+# Longest text kept per resume (characters)
+MAX_TEXT_CHARS = 200_000
+# Most frequent terms reported in the statistics
+TOP_TERMS = 25
+# Most bytes a file may inflate to (PDF content streams together, DOCX document.xml),
+# so a small compressed upload cannot exhaust the worker's memory
+MAX_INFLATED_BYTES = 64 * 1024 * 1024
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#.\-]*[a-z0-9+#]|[a-z]")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with "
+    "i me my we our you your he she they them their his her".split()
+)
+
+
+class ExtractionError(Exception):
+    """The file could not be turned into text (unsupported, corrupt or empty)."""
+
+
+def detect_kind(filename: str, content_type: Optional[str], head: bytes) -> str:
+    """'pdf', 'docx' or 'txt', from the file signature first, then type/extension."""
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    name = (filename or "").lower()
+    if head.startswith(b"PK") and (name.endswith(".docx") or "wordprocessingml" in (content_type or "")):
+        return "docx"
+    if name.endswith((".txt", ".text", ".md")) or (content_type or "").startswith("text/"):
+        return "txt"
+    raise ExtractionError(f"Unsupported file type: {filename} ({content_type or 'unknown'})")
+
+
+# ----------------------------------------------------------------------------
+# TXT / DOCX
+# ----------------------------------------------------------------------------
+
+def _extract_txt(data: bytes) -> str:
+    for encoding in ("utf-8-sig", "utf-16") if data[:2] in (b"\xff\xfe", b"\xfe\xff") else ("utf-8-sig",):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            pass
+    return data.decode("latin-1")
+
+
+def _extract_docx(path: str) -> str:
+    try:
+        with zipfile.ZipFile(path) as archive:
+            if archive.getinfo("word/document.xml").file_size > MAX_INFLATED_BYTES:
+                raise ExtractionError("DOCX document is too large to extract")
+            # Read at most the cap: file_size comes from the archive and may understate
+            with archive.open("word/document.xml") as member:
+                xml = member.read(MAX_INFLATED_BYTES + 1)
+            if len(xml) > MAX_INFLATED_BYTES:
+                raise ExtractionError("DOCX document is too large to extract")
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise ExtractionError(f"Invalid DOCX: {e}")
+    paragraphs = []
+    for paragraph in ElementTree.fromstring(xml).iter(f"{_WORD_NS}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{_WORD_NS}t" and node.text:
+                parts.append(node.text)
+            elif node.tag == f"{_WORD_NS}tab":
+                parts.append("\t")
+            elif node.tag in (f"{_WORD_NS}br", f"{_WORD_NS}cr"):
+                parts.append("\n")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+
+# ----------------------------------------------------------------------------
+# PDF (built-in fallback reader)
+# ----------------------------------------------------------------------------
+
+_STREAM_RE = re.compile(rb"<<(.{0,2000}?)>>\s*stream\r?\n(.*?)\r?\nendstream", re.S)
+_BFCHAR_RE = re.compile(rb"beginbfchar(.*?)endbfchar", re.S)
+_BFRANGE_RE = re.compile(rb"beginbfrange(.*?)endbfrange", re.S)
+_HEX_PAIR_RE = re.compile(rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>")
+_HEX_RANGE_RE = re.compile(rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>")
+_TEXT_TOKEN_RE = re.compile(
+    rb"\((?:\\.|[^\\)])*\)"      # literal string (nested parens are rare in text runs)
+    rb"|<[0-9A-Fa-f\s]*>"        # hex string
+    rb"|\[|\]"                   # TJ array brackets
+    rb"|-?\d*\.?\d+"             # numbers (TJ kerning, Td operands)
+    rb"|[A-Za-z'\"*]+"           # operators
+)
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+
+def _pdf_streams(data: bytes) -> list[bytes]:
+    streams = []
+    budget = MAX_INFLATED_BYTES
+    for header, body in _STREAM_RE.findall(data):
+        if b"/FlateDecode" in header:
+            inflater = zlib.decompressobj()
+            try:
+                body = inflater.decompress(body, budget + 1)
+            except zlib.error:
+                continue
+            if len(body) > budget:
+                raise ExtractionError("PDF content is too large to extract")
+            budget -= len(body)
+        elif b"/Filter" in header:
+            continue  # images and other encodings carry no text
+        streams.append(body)
+    return streams
+
+
+def _utf16(hex_value: bytes) -> str:
+    try:
+        return bytes.fromhex(hex_value.decode()).decode("utf-16-be")
+    except (ValueError, UnicodeDecodeError):
+        return ""
+
+
+def _to_unicode_map(streams: list[bytes]) -> dict[bytes, str]:
+    """Merge every ToUnicode CMap in the file (good enough for text search)."""
+    mapping = {}
+    for stream in streams:
+        if b"begincmap" not in stream:
+            continue
+        for block in _BFCHAR_RE.findall(stream):
+            for source, target in _HEX_PAIR_RE.findall(block):
+                mapping[bytes.fromhex(source.decode())] = _utf16(target)
+        for block in _BFRANGE_RE.findall(stream):
+            for low, high, target in _HEX_RANGE_RE.findall(block):
+                start, end, width = int(low, 16), int(high, 16), len(low) // 2
+                base = int(target, 16)
+                for offset in range(min(end - start + 1, 65536)):
+                    mapping[(start + offset).to_bytes(width, "big")] = chr(base + offset) if base + offset < 0x110000 else ""
+    return mapping
+
+
+def _literal_bytes(token: bytes) -> bytes:
+    out = bytearray()
+    body = token[1:-1]
+    i = 0
+    while i < len(body):
+        char = body[i:i + 1]
+        if char == b"\\" and i + 1 < len(body):
+            nxt = body[i + 1:i + 2]
+            if nxt in _ESCAPES:
+                out += _ESCAPES[nxt]
+                i += 2
+            elif nxt in b"01234567":
+                octal = re.match(rb"[0-7]{1,3}", body[i + 1:i + 4]).group()
+                out.append(int(octal, 8) & 0xFF)
+                i += 1 + len(octal)
+            elif nxt in (b"\n", b"\r"):
+                i += 2
+            else:
+                out += nxt  # other escaped characters stand for themselves
+                i += 2
+        else:
+            out += char
+            i += 1
+    return bytes(out)
+
+
+def _decode_pdf_string(raw: bytes, cmap: dict[bytes, str]) -> str:
+    if cmap:
+        for width in (2, 1):
+            if len(raw) % width == 0 and raw[:width] in cmap:
+                return "".join(cmap.get(raw[i:i + width], "") for i in range(0, len(raw), width))
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be", "ignore")
+    return raw.decode("latin-1")
+
+
+def _is_number(token: bytes) -> bool:
+    return token[:1].isdigit() or token[:1] in (b"-", b".")
+
+
+def _content_text(stream: bytes, cmap: dict[bytes, str]) -> str:
+    """Text shown by the BT ... ET blocks of one content stream, with rough line breaks."""
+    out = []
+    in_text = in_array = False
+    strings = []
+    for token in _TEXT_TOKEN_RE.findall(stream):
+        if token == b"BT":
+            in_text, strings = True, []
+        elif token == b"ET":
+            in_text = False
+            out.append("\n")
+        elif not in_text:
+            continue
+        elif token.startswith(b"("):
+            strings.append(_decode_pdf_string(_literal_bytes(token), cmap))
+        elif token.startswith(b"<"):
+            hex_value = re.sub(rb"\s", b"", token[1:-1])
+            if len(hex_value) % 2:
+                hex_value += b"0"
+            strings.append(_decode_pdf_string(bytes.fromhex(hex_value.decode()), cmap))
+        elif token == b"[":
+            in_array = True
+        elif token == b"]":
+            in_array = False
+        elif _is_number(token):
+            # A large negative adjustment inside a TJ array is a word gap
+            if in_array and float(token) < -200:
+                strings.append(" ")
+        elif token in (b"Tj", b"TJ", b"'", b'"'):
+            if token in (b"'", b'"'):
+                out.append("\n")
+            out.append("".join(strings))
+            strings = []
+        else:
+            if token in (b"Td", b"TD", b"T*"):
+                out.append("\n")
+            elif token == b"Tm":
+                out.append(" ")
+            strings = []
+    return "".join(out)
+
+
+def _extract_pdf(path: str, data: bytes) -> str:
+    if PdfReader is not None:
+        try:
+            reader = PdfReader(path)
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+        except Exception:
+            pass  # fall back to the built-in reader
+    streams = _pdf_streams(data)
+    cmap = _to_unicode_map(streams)
+    return "\n".join(
+        _content_text(stream, cmap) for stream in streams if b"BT" in stream and b"begincmap" not in stream
+    )
+
+
+# ----------------------------------------------------------------------------
+# Entry points
+# ----------------------------------------------------------------------------
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of spaces and blank lines; cap the length."""
+    text = text.replace("\x00", "")
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    text = re.sub(r" ?\n[ \n]*", "\n", text)
+    return text.strip()[:MAX_TEXT_CHARS]
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def token_stats(text: str) -> dict:
+    """Word and term counts for an extracted text."""
+    tokens = tokenize(text)
+    terms = Counter(token for token in tokens if token not in _STOPWORDS and len(token) > 1)
+    return {
+        "characters": len(text),
+        "lines": text.count("\n") + 1 if text else 0,
+        "words": len(tokens),
+        "unique_terms": len(terms),
+        "top_terms": terms.most_common(TOP_TERMS),
+    }
+
+
+def extract_resume_text(path: str, filename: str, content_type: Optional[str]) -> tuple[str, dict]:
+    """
+    Read a resume file and return (normalized text, token statistics).
+
+    Raises ExtractionError when the file is unsupported or yields no text.
+    Runs in a worker process.
+    """
+    with open(path, "rb") as handle:
+        data = handle.read()
+    kind = detect_kind(filename, content_type, data[:8])
+    if kind == "pdf":
+        text = _extract_pdf(path, data)
+    elif kind == "docx":
+        text = _extract_docx(path)
+    else:
+        text = _extract_txt(data)
+
+    text = normalize_text(text)
+    if not text:
+        raise ExtractionError(f"No text found in {kind.upper()} file")
+    return text, token_stats(text)
@@ -0,0 +1,202 @@
+"""
+Streaming file uploads.
+
+Upload endpoints read the multipart request body themselves instead of
+declaring File(...): FastAPI would otherwise spool the whole body into a
+temporary file before the handler runs, so an oversized upload would be fully
+received (and written to disk) before it could be refused. Here a declared
+Content-Length over the limit is refused before anything is read, and the body
+is parsed as it arrives: the file part is hashed and written in fixed-size
+chunks in the threadpool, and reading stops as soon as the limit is exceeded.
+The bytes land in a temporary file that is renamed into place only once
+complete, so a rejected or interrupted upload leaves nothing behind.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+# Bytes written to disk per step (parsed file data is buffered up to this)
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Largest resume accepted (the upload is cut off as soon as it exceeds this)
+RESUME_MAX_BYTES = int(os.getenv("APP_RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+# Room for multipart boundaries, part headers and small form fields around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# OpenAPI request body for endpoints taking one `file` form field this way
+FILE_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large (limit {max_bytes / (1024 * 1024):g} MB)"
+    )
+
+
+def _bad_upload(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _open_temp(directory: Path) -> tuple[BinaryIO, str]:
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    return os.fdopen(fd, "wb"), temp_path
+
+
+def _write_chunk(handle: BinaryIO, hasher, chunk: bytes) -> None:
+    # hashlib releases the GIL on large buffers, so this overlaps with other requests
+    hasher.update(chunk)
+    handle.write(chunk)
+
+
+def _finish(handle: BinaryIO) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+    handle.close()
+
+
+def _discard(handle: BinaryIO, temp_path: str) -> None:
+    handle.close()
+    try:
+        os.unlink(temp_path)
+    except FileNotFoundError:
+        pass
+
+
+class _FilePartCollector:
+    """MultipartParser callbacks keeping the data of the first file part named `field`."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.found = False
+        self.complete = False
+        self.size = 0
+        self.pending = bytearray()
+        self._in_file = False
+        self._headers: dict[bytes, bytes] = {}
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": lambda data, start, end: self._header_field.extend(data[start:end]),
+            "on_header_value": lambda data, start, end: self._header_value.extend(data[start:end]),
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_end": self.on_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+
+    def on_header_end(self) -> None:
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        filename = options.get(b"filename")
+        self._in_file = not self.found and name == self.field and filename is not None
+        if self._in_file:
+            self.found = True
+            self.filename = filename.decode("utf-8", "replace")
+            self.content_type = self._headers.get(b"content-type", b"").decode("latin-1") or None
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self.pending += data[start:end]
+            self.size += end - start
+
+    def on_part_end(self) -> None:
+        self._in_file = False
+
+    def on_end(self) -> None:
+        self.complete = True
+
+
+async def stream_multipart_file_to_temp(
+    request: Request, field: str, directory: Path, max_bytes: int
+) -> tuple[str, str, Optional[str], int, str]:
+    """
+    Stream the `field` file of a multipart/form-data request into a temporary file
+    in `directory`, parsing the body as it arrives.
+
+    Returns (temp path, client filename, content type, size in bytes, sha256 hex
+    digest). The caller renames the file into place or deletes it. Raises 413 as
+    soon as the upload is known to exceed max_bytes, 400 for a malformed body or
+    a missing file.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise _bad_upload("Expected a multipart/form-data upload")
+    body_limit = max_bytes + MULTIPART_OVERHEAD_BYTES
+    try:
+        declared = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        declared = 0
+    if declared > body_limit:
+        raise _too_large(max_bytes)
+
+    collector = _FilePartCollector(field)
+    parser = MultipartParser(boundary, collector.callbacks())
+    handle, temp_path = await run_in_threadpool(_open_temp, directory)
+    hasher = hashlib.sha256()
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise _too_large(max_bytes)
+            try:
+                parser.write(chunk)
+            except Exception as e:
+                raise _bad_upload(f"Malformed multipart body: {e}")
+            if collector.size > max_bytes:
+                raise _too_large(max_bytes)
+            if len(collector.pending) >= UPLOAD_CHUNK_BYTES:
+                data = bytes(collector.pending)
+                collector.pending.clear()
+                await run_in_threadpool(_write_chunk, handle, hasher, data)
+        parser.finalize()
+        if not collector.complete:
+            raise _bad_upload("Incomplete multipart body")
+        if not collector.found:
+            raise _bad_upload(f"Missing file field '{field}'")
+        if collector.pending:
+            await run_in_threadpool(_write_chunk, handle, hasher, bytes(collector.pending))
+        await run_in_threadpool(_finish, handle)
+    except BaseException:
+        await run_in_threadpool(_discard, handle, temp_path)
+        raise
+    return temp_path, collector.filename, collector.content_type, collector.size, hasher.hexdigest()
@@ -0,0 +1,125 @@
+"""
+Backfill the analytics rollups (app/analytics.py).
+
+By default recomputes every bucket from the MatchEvent log, e.g. after a new
+metric was added or the rollups were lost. --since/--until (dates, UTC) limit
+the rebuild to a range of days.
+
+--legacy also fills the days before the event log started from MatchState,
+Application and Swipe rows, taking each action at its timestamp. Those tables
+only keep a pair's latest action, so legacy history is an approximation:
+a candidate who liked and later applied counts as applied only. Buckets
+before the first event's day are replaced, so --legacy is safe to re-run.
+
+Both hold the rollup watermark lock, so the API's background roll-up waits
+and nothing is counted twice.
+
+Usage:
+    python backfill_analytics.py [--since 2026-01-01] [--until 2026-02-01] [--legacy]
+"""
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, text
+from sqlmodel import Session, select
+
+from app.analytics import (
+    ROLLUP_BATCH_SIZE, apply_increments, bucket_start, lock_watermark, rebuild_rollups, rollup_increments
+)
+from app.database import engine
+from app.models import AnalyticsRollup, MatchEvent, RollupWatermark
+
+# Pre-event-log actions shaped like MatchEvent rows (see match_events.EVENT_STAGES)
+LEGACY_EVENTS_SQL = """
+    SELECT m.candidate_action_at AS created_at, 'candidate' AS actor,
+           CASE WHEN m.candidate_action = 'APPLY' AND m.ask_to_apply_status = 'ACCEPTED'
+                THEN 'ACCEPT_ASK' ELSE m.candidate_action END AS action,
+           m.job_post_id, j.company_id, NULL::int AS company_user_id, NULL AS match_status
+    FROM matchstate m JOIN jobpost j ON j.id = m.job_post_id
+    WHERE m.candidate_action IN ('LIKE', 'PASS', 'APPLY') AND m.candidate_action_at < :cutoff
+  UNION ALL
+    SELECT m.recruiter_action_at, 'recruiter', m.recruiter_action, m.job_post_id, j.company_id, NULL, NULL
+    FROM matchstate m JOIN jobpost j ON j.id = m.job_post_id
+    WHERE m.recruiter_action IN ('LIKE', 'PASS', 'ASK_TO_APPLY') AND m.recruiter_action_at < :cutoff
+  UNION ALL
+    SELECT m.updated_at, 'candidate', 'DECLINE_ASK', m.job_post_id, j.company_id, NULL, NULL
+    FROM matchstate m JOIN jobpost j ON j.id = m.job_post_id
+    WHERE m.ask_to_apply_status = 'DECLINED' AND m.updated_at < :cutoff
+  UNION ALL
+    SELECT m.updated_at, 'system', 'EXPIRE_ASK', m.job_post_id, j.company_id, NULL, NULL
+    FROM matchstate m JOIN jobpost j ON j.id = m.job_post_id
+    WHERE m.status = 'EXPIRED' AND m.updated_at < :cutoff
+  UNION ALL
+    SELECT m.updated_at, 'system', 'MATCH', m.job_post_id, j.company_id, NULL, 'MATCHED'
+    FROM matchstate m JOIN jobpost j ON j.id = m.job_post_id
+    WHERE m.status = 'MATCHED' AND m.updated_at < :cutoff
+  UNION ALL
+    SELECT a.applied_at, 'candidate', 'APPLY', a.job_post_id, j.company_id, NULL, NULL
+    FROM application a JOIN jobpost j ON j.id = a.job_post_id
+    WHERE a.applied_at < :cutoff AND NOT EXISTS (
+        SELECT 1 FROM matchstate m
+        WHERE m.candidate_id = a.candidate_id AND m.job_post_id = a.job_post_id AND m.candidate_action = 'APPLY'
+    )
+  UNION ALL
+    SELECT s.created_at, 'recruiter', upper(s.action), s.job_post_id, j.company_id, s.company_user_id, NULL
+    FROM swipe s JOIN jobpost j ON j.id = s.job_post_id
+    WHERE s.action IN ('like', 'pass') AND s.created_at < :cutoff AND NOT EXISTS (
+        SELECT 1 FROM matchstate m
+        WHERE m.candidate_id = s.candidate_id AND m.job_post_id = s.job_post_id
+          AND m.recruiter_action IN ('LIKE', 'PASS')
+    )
+"""
+
+
+def parse_day(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def backfill_legacy(session: Session, cutoff: datetime) -> tuple[int, int]:
+    """Replace the buckets before `cutoff` with counts from the legacy tables. Commits."""
+    lock_watermark(session, skip_locked=False)
+    session.exec(delete(AnalyticsRollup).where(AnalyticsRollup.bucket_start < cutoff))
+    result = session.connection().execution_options(stream_results=True).execute(
+        text(LEGACY_EVENTS_SQL), {"cutoff": cutoff}
+    )
+    increments, events = Counter(), 0
+    for rows in result.mappings().partitions(ROLLUP_BATCH_SIZE):
+        increments.update(rollup_increments(rows))
+        events += len(rows)
+    written = apply_increments(session, increments)
+    session.commit()
+    return events, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill analytics rollups")
+    parser.add_argument("--since", type=parse_day, help="First day to rebuild (default: first event)")
+    parser.add_argument("--until", type=parse_day, help="Day after the last day to rebuild (default: tomorrow)")
+    parser.add_argument("--legacy", action="store_true", help="Also fill days before the event log from match tables")
+    args = parser.parse_args()
+
+    for model in (AnalyticsRollup, RollupWatermark):
+        model.__table__.create(engine, checkfirst=True)
+
+    with Session(engine) as session:
+        first_event = session.exec(select(func.min(MatchEvent.created_at))).one()
+        log_start = bucket_start(first_event, "day") if first_event else bucket_start(datetime.utcnow(), "day")
+
+        if args.legacy:
+            print(f"📜 Backfilling legacy history before {log_start:%Y-%m-%d}...")
+            events, written = backfill_legacy(session, log_start)
+            print(f"✅ Legacy: {events} actions folded into {written} rollup rows")
+
+        if first_event is None:
+            print("\n✅ No match events yet, nothing to rebuild")
+            return
+        since = args.since or log_start
+        until = args.until or bucket_start(datetime.utcnow(), "day") + timedelta(days=1)
+        print(f"📊 Rebuilding rollups for {since:%Y-%m-%d} .. {until:%Y-%m-%d} from match events...")
+        events, written = rebuild_rollups(session, max(since, log_start), until)
+        print(f"\n✅ Rebuilt {written} rollup rows from {events} events")
+
+
+if __name__ == "__main__":
+    main()
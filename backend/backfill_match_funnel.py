@@ -0,0 +1,116 @@
+"""
+Backfill the match funnel (app/match_events.py) from existing match data.
+
+Creates the matchevent, matchfunnelstage, companyfunnelstage and funnelcounter
+tables if needed, records the stages each candidate/job pair has already reached
+according to MatchState, Application and Swipe rows (and, per company, each
+candidate's first time across its jobs), then rebuilds every FunnelCounter from
+the recorded stages. Pairs keep only their current state, so a candidate who
+liked a job and later applied is backfilled as applied only. No MatchEvent rows
+are invented: the event log starts with the first action after the deploy.
+
+Runs in one transaction with the funnel tables locked against writers, so it is
+safe to run while the API is serving. Safe to re-run; --counters-only just
+recomputes the counters from the recorded stages.
+
+Usage:
+    python backfill_match_funnel.py [--counters-only]
+"""
+import argparse
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.models import CompanyFunnelStage, FunnelCounter, MatchEvent, MatchFunnelStage
+
+# stage -> (source table, condition, reached_at expression)
+STAGE_SOURCES = {
+    "candidate_liked": ("matchstate", "candidate_action = 'LIKE'", "coalesce(candidate_action_at, updated_at)"),
+    "candidate_passed": ("matchstate", "candidate_action = 'PASS'", "coalesce(candidate_action_at, updated_at)"),
+    "applied": ("matchstate", "candidate_action = 'APPLY'", "coalesce(candidate_action_at, updated_at)"),
+    "shortlisted": ("matchstate", "recruiter_action = 'LIKE'", "coalesce(recruiter_action_at, updated_at)"),
+    "recruiter_passed": ("matchstate", "recruiter_action = 'PASS'", "coalesce(recruiter_action_at, updated_at)"),
+    "asked_to_apply": ("matchstate", "ask_to_apply_sent_at IS NOT NULL", "ask_to_apply_sent_at"),
+    "ask_accepted": ("matchstate", "ask_to_apply_status = 'ACCEPTED'", "updated_at"),
+    "ask_declined": ("matchstate", "ask_to_apply_status = 'DECLINED'", "updated_at"),
+    "ask_expired": ("matchstate", "status = 'EXPIRED'", "updated_at"),
+    "matched": ("matchstate", "status = 'MATCHED'", "updated_at"),
+}
+# Older flows that never touched matchstate
+EXTRA_SOURCES = [
+    ("applied", "application", "TRUE", "applied_at"),
+    ("shortlisted", "swipe", "action = 'like'", "created_at"),
+    ("recruiter_passed", "swipe", "action = 'pass'", "created_at"),
+]
+
+
+def backfill_stages(conn) -> int:
+    sources = [(stage, *source) for stage, source in STAGE_SOURCES.items()] + EXTRA_SOURCES
+    added = 0
+    for stage, table, condition, reached_at in sources:
+        result = conn.execute(text(f"""
+            INSERT INTO matchfunnelstage (job_post_id, candidate_id, stage, reached_at)
+            SELECT job_post_id, candidate_id, :stage, min({reached_at})
+            FROM {table}
+            WHERE {condition}
+            GROUP BY job_post_id, candidate_id
+            ON CONFLICT DO NOTHING
+        """), {"stage": stage})
+        print(f"   {stage:<17} +{result.rowcount} from {table}")
+        added += result.rowcount
+    return added
+
+
+def backfill_company_stages(conn) -> int:
+    result = conn.execute(text("""
+        INSERT INTO companyfunnelstage (company_id, candidate_id, stage, reached_at)
+        SELECT j.company_id, s.candidate_id, s.stage, min(s.reached_at)
+        FROM matchfunnelstage s
+        JOIN jobpost j ON j.id = s.job_post_id
+        GROUP BY j.company_id, s.candidate_id, s.stage
+        ON CONFLICT DO NOTHING
+    """))
+    return result.rowcount
+
+
+def rebuild_counters(conn) -> int:
+    conn.execute(text("DELETE FROM funnelcounter"))
+    result = conn.execute(text("""
+        INSERT INTO funnelcounter (scope, scope_id, stage, count, updated_at)
+        SELECT 'job', job_post_id, stage, count(*), now() AT TIME ZONE 'utc'
+        FROM matchfunnelstage
+        GROUP BY job_post_id, stage
+        UNION ALL
+        SELECT 'company', company_id, stage, count(*), now() AT TIME ZONE 'utc'
+        FROM companyfunnelstage
+        GROUP BY company_id, stage
+    """))
+    return result.rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill match funnel stages and counters")
+    parser.add_argument("--counters-only", action="store_true", help="Only recompute counters from stages")
+    args = parser.parse_args()
+
+    for model in (MatchEvent, MatchFunnelStage, CompanyFunnelStage, FunnelCounter):
+        model.__table__.create(engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        # Block record_match_events() writers until the counters are consistent again
+        conn.execute(text(
+            "LOCK TABLE matchfunnelstage, companyfunnelstage, funnelcounter IN SHARE ROW EXCLUSIVE MODE"
+        ))
+        if not args.counters_only:
+            print("📊 Recording stages already reached...")
+            added = backfill_stages(conn)
+            print(f"✅ Added {added} stage rows")
+        # Always, so company stages also cover pairs recorded before the table existed
+        company_added = backfill_company_stages(conn)
+        print(f"✅ Added {company_added} company stage rows")
+        counters = rebuild_counters(conn)
+    print(f"\n✅ Rebuilt {counters} funnel counters")
+
+
+if __name__ == "__main__":
+    main()
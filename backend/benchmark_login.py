@@ -0,0 +1,100 @@
+"""
+Login throughput benchmark against a running API.
+
+Fires concurrent logins while probing a cheap endpoint at a steady rate, then
+reports logins/second alongside the probe's latency percentiles. With password
+hashing on its own bounded pool, the probe's p99 should stay flat as login
+concurrency rises (excess logins get 503 + Retry-After instead).
+
+Usage:
+    python benchmark_login.py --email user@example.com --password secret \\
+        [--base-url http://127.0.0.1:8000] [--concurrency 32] [--duration 20] [--probe-path /job-roles/authors]
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timed_request(request: urllib.request.Request) -> tuple[int, float]:
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            code = response.status
+    except urllib.error.HTTPError as e:
+        code = e.code
+    except urllib.error.URLError:
+        code = 0
+    return code, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput vs. other endpoints' latency")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent login clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--probe-path", default="/job-roles/authors", help="Cheap endpoint sampled for latency")
+    parser.add_argument("--probe-interval", type=float, default=0.05, help="Seconds between probe requests")
+    args = parser.parse_args()
+
+    login_body = json.dumps({"email": args.email, "password": args.password}).encode("utf-8")
+    deadline = time.perf_counter() + args.duration
+    lock = threading.Lock()
+    login_latencies, probe_latencies = [], []
+    login_codes: dict[int, int] = {}
+
+    def login_client():
+        while time.perf_counter() < deadline:
+            request = urllib.request.Request(
+                f"{args.base_url}/auth/login", data=login_body,
+                headers={"Content-Type": "application/json"}, method="POST"
+            )
+            code, elapsed = timed_request(request)
+            with lock:
+                login_codes[code] = login_codes.get(code, 0) + 1
+                if code == 200:
+                    login_latencies.append(elapsed)
+            if code == 503:
+                time.sleep(0.1)
+
+    def probe_client():
+        while time.perf_counter() < deadline:
+            code, elapsed = timed_request(urllib.request.Request(f"{args.base_url}{args.probe_path}"))
+            if code == 200:
+                with lock:
+                    probe_latencies.append(elapsed)
+            time.sleep(args.probe_interval)
+
+    print(f"Running {args.concurrency} login clients + 1 probe ({args.probe_path}) for {args.duration:.0f}s...")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency + 1) as pool:
+        futures = [pool.submit(login_client) for _ in range(args.concurrency)]
+        futures.append(pool.submit(probe_client))
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    print("\n📊 Results")
+    print(f"  Logins/s (200 only):  {len(login_latencies) / elapsed:,.1f}")
+    print(f"  Login responses:      {dict(sorted(login_codes.items()))}")
+    print(f"  Login latency ms:     p50={percentile(login_latencies, 50):.1f}  p99={percentile(login_latencies, 99):.1f}")
+    print(f"  Probe latency ms:     p50={percentile(probe_latencies, 50):.1f}  p99={percentile(probe_latencies, 99):.1f}"
+          f"  ({len(probe_latencies)} samples)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Skill extraction throughput benchmark (no database or running API needed).
+
+Scans a corpus with the Aho-Corasick skill matcher and reports MB/s, next to a
+naive baseline that runs one word-boundary regex per vocabulary pattern. The
+corpus is synthetic resume-like text by default, or the given text files.
+
+Usage:
+    python benchmark_skill_extraction.py [--size-mb 20] [--doc-kb 8] [--repeat 3] [--baseline] [FILE ...]
+"""
+import argparse
+import random
+import re
+import time
+
+from app.skill_extraction import get_skill_matcher, load_vocabulary, normalize
+
+FILLER = (
+    "led delivered implemented designed team project client requirements migration upgrade support "
+    "configured developed tested production environment stakeholders business process data reports "
+    "responsible for across global enterprise years experience including multiple phases go-live"
+).split()
+
+
+def synthetic_corpus(size_mb: float, doc_kb: float, seed: int = 7) -> list[str]:
+    """Resume-sized documents of filler words with roughly one skill mention per 20 words."""
+    rng = random.Random(seed)
+    patterns = list(load_vocabulary()[0])
+    documents, total, target = [], 0, int(size_mb * 1024 * 1024)
+    while total < target:
+        words, length = [], 0
+        while length < doc_kb * 1024:
+            word = rng.choice(patterns) if rng.random() < 0.05 else rng.choice(FILLER)
+            words.append(word.title() if rng.random() < 0.3 else word)
+            length += len(word) + 1
+        document = " ".join(words)
+        documents.append(document)
+        total += len(document)
+    return documents
+
+
+def run(label: str, documents: list[str], scan, repeat: int) -> float:
+    size_mb = sum(len(document.encode("utf-8")) for document in documents) / (1024 * 1024)
+    best = float("inf")
+    mentions = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        mentions = sum(sum(scan(document).values()) for document in documents)
+        best = min(best, time.perf_counter() - started)
+    throughput = size_mb / best
+    print(f"   {label:<18} {throughput:8.2f} MB/s  ({size_mb:.1f} MB in {best:.2f}s, {mentions} mentions)")
+    return throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction throughput")
+    parser.add_argument("files", nargs="*", help="Text files to scan instead of a synthetic corpus")
+    parser.add_argument("--size-mb", type=float, default=20.0, help="Synthetic corpus size")
+    parser.add_argument("--doc-kb", type=float, default=8.0, help="Synthetic document size")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per matcher (best is reported)")
+    parser.add_argument("--baseline", action="store_true", help="Also time one regex per pattern")
+    args = parser.parse_args()
+
+    if args.files:
+        documents = []
+        for path in args.files:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                documents.append(f.read())
+    else:
+        documents = synthetic_corpus(args.size_mb, args.doc_kb)
+
+    started = time.perf_counter()
+    matcher = get_skill_matcher()
+    print(f"🔧 Matcher: {len(matcher.skills)} skills, {matcher.pattern_count} patterns, "
+          f"built in {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(f"📄 Corpus: {len(documents)} documents")
+
+    automaton = run("aho-corasick", documents, matcher.find, args.repeat)
+
+    if args.baseline:
+        patterns = load_vocabulary()[0]
+        regexes = [
+            (re.compile(r"(?<![0-9a-z])" + re.escape(pattern) + r"(?![0-9a-z])"), skill)
+            for pattern, skill in patterns.items()
+        ]
+
+        def regex_scan(document: str) -> dict[str, int]:
+            text = normalize(document)
+            counts: dict[str, int] = {}
+            for regex, skill in regexes:
+                found = len(regex.findall(text))
+                if found:
+                    counts[skill] = counts.get(skill, 0) + found
+            return counts
+
+        baseline = run("regex per pattern", documents, regex_scan, args.repeat)
+        print(f"\n✅ Aho-Corasick is {automaton / baseline:.1f}x the per-pattern regex baseline")
+
+
+if __name__ == "__main__":
+    main()
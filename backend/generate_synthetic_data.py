@@ -0,0 +1,410 @@
+"""
+Synthetic Data Generator for TalentGraph Load Testing
+=====================================================
+Generates a parameterized, deterministic dataset and bulk-loads it through
+PostgreSQL COPY:
+- N candidates (users, profiles, skills, job preferences)
+- M companies with company users
+- K job postings drawn from the roles.json ontology
+- Swipe and match histories (with applications for APPLY actions)
+
+The same --seed always produces the same data, so results are comparable
+across runs. Ids are assigned explicitly (after any existing rows) and the id
+sequences are moved past them, so the app keeps working on top of the data.
+All generated users share one password (hashed once): loadtest123
+
+Usage:
+    python generate_synthetic_data.py --candidates 1000000 --companies 500 --jobs 50000 --seed 42
+    python generate_synthetic_data.py --truncate --candidates 10000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.database import engine
+from app.bulk_copy import copy_rows, next_id, sync_id_sequence
+from app.job_import import load_role_ontology
+from app.routers.job_roles import load_skills_data
+from app.security import hash_password
+
+PASSWORD = "loadtest123"
+
+# Fixed clock so timestamps are reproducible
+BASE_TIME = datetime(2025, 1, 1)
+HISTORY_DAYS = 365
+
+# Tables touched by the generator, children first (used by --truncate)
+TABLES = (
+    "application", "matchstate", "swipe", "candidatejobpreference", "skill",
+    "certification", "sociallink", "resume", "jobpost", "candidate",
+    "companyuser", "companyaccount", '"user"',
+)
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David",
+    "Elizabeth", "Wei", "Priya", "Carlos", "Fatima", "Kenji", "Olga", "Ahmed", "Sofia",
+    "Arjun", "Chloe", "Mateo", "Aisha", "Lucas", "Mei", "Noah", "Zara",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Chen",
+    "Patel", "Kim", "Nguyen", "Rodriguez", "Martinez", "Singh", "Kumar", "Anderson", "Lee",
+    "Wilson", "Moore", "Taylor", "Thomas", "Hernandez", "Lopez", "Khan", "Ito",
+)
+LOCATIONS = (
+    "San Francisco, CA", "New York, NY", "Austin, TX", "Chicago, IL", "Seattle, WA",
+    "Boston, MA", "Atlanta, GA", "Denver, CO", "Dallas, TX", "Remote",
+)
+WORK_TYPES = ("Remote", "Hybrid", "On-site")
+AVAILABILITY = ("Immediately", "2 weeks", "1 month", "Flexible")
+VISA_TYPES = ("Citizen", "Permanent Resident", "H1B", "OPT", "Requires Sponsorship")
+SENIORITY = ("Junior", "Mid", "Senior")
+SKILL_LEVELS = ("Beginner", "Intermediate", "Advanced", "Expert", "Expert")
+JOB_TYPES = ("Contract", "Permanent")
+
+
+def rng_for(seed: int, stream: str) -> random.Random:
+    """Independent deterministic RNG per generated table."""
+    return random.Random(f"{seed}:{stream}")
+
+
+def timestamp(rng: random.Random) -> datetime:
+    return BASE_TIME + timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+
+
+class SyntheticDataset:
+    """Generates every table as a lazy row stream and loads each one with COPY."""
+
+    def __init__(self, args, session: Session):
+        self.args = args
+        self.session = session
+        self.roles = sorted(load_role_ontology())
+        skills_data = load_skills_data()
+        self.base_skills = sorted({
+            skill for skills in skills_data.get("base_skills", {}).values() for skill in skills
+        })
+        role_skills = skills_data.get("role_skills", {})
+        self.skills_by_role = [
+            role_skills.get(author, {}).get(product, {}).get(role) or self.base_skills
+            for author, product, role in self.roles
+        ]
+        self.password_hash = hash_password(PASSWORD)
+
+        # Ids continue after any existing rows
+        self.user_base = next_id(session, '"user"')
+        self.candidate_base = next_id(session, "candidate")
+        self.company_base = next_id(session, "companyaccount")
+        self.company_user_base = next_id(session, "companyuser")
+        self.job_base = next_id(session, "jobpost")
+
+        # Per-row role choices, shared by the tables that depend on them
+        rng = rng_for(args.seed, "roles")
+        self.candidate_role = array("H", (rng.randrange(len(self.roles)) for _ in range(args.candidates)))
+        self.job_role = array("H", (rng.randrange(len(self.roles)) for _ in range(args.jobs)))
+        self.job_company = array("I", (rng.randrange(args.companies) for _ in range(args.jobs)))
+
+    # ------------------------------------------------------------------ users
+
+    def company_user_id(self, company_index: int, user_index: int) -> int:
+        return self.company_user_base + company_index * self.args.users_per_company + user_index
+
+    def iter_users(self):
+        rng = rng_for(self.args.seed, "users")
+        for i in range(self.args.candidates):
+            user_id = self.user_base + i
+            yield (user_id, f"candidate{user_id}@loadtest.example", self.password_hash, "candidate", True, timestamp(rng))
+        offset = self.args.candidates
+        for i in range(self.args.companies * self.args.users_per_company):
+            user_id = self.user_base + offset + i
+            yield (user_id, f"company{user_id}@loadtest.example", self.password_hash, "company", True, timestamp(rng))
+
+    # ------------------------------------------------------------- candidates
+
+    def iter_candidates(self):
+        rng = rng_for(self.args.seed, "candidates")
+        for i in range(self.args.candidates):
+            author, product, role = self.roles[self.candidate_role[i]]
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            rate_min = float(rng.randrange(50, 150, 5))
+            created_at = timestamp(rng)
+            yield (
+                self.candidate_base + i, self.user_base + i, name,
+                f"candidate{self.user_base + i}@loadtest.example", rng.choice(LOCATIONS),
+                rng.choice(VISA_TYPES), True,
+                f"{role} with experience across {product} implementations.",
+                product, role, rng.randint(1, 20), rate_min, rate_min + rng.randrange(10, 60, 5),
+                rng.choice(WORK_TYPES), rng.choice(AVAILABILITY),
+                created_at, created_at, 1,
+            )
+
+    def iter_skills(self):
+        rng = rng_for(self.args.seed, "skills")
+        low, high = self.args.skills_per_candidate
+        for i in range(self.args.candidates):
+            role_skills = self.skills_by_role[self.candidate_role[i]]
+            count = rng.randint(low, high)
+            names = rng.sample(role_skills, min(count, len(role_skills)))
+            extra = count - len(names)
+            if extra > 0:
+                names += rng.sample(self.base_skills, min(extra, len(self.base_skills)))
+            for name in names:
+                rating = rng.randint(1, 5)
+                yield (self.candidate_base + i, name, rating, SKILL_LEVELS[rating - 1], "technical")
+
+    def iter_preferences(self):
+        rng = rng_for(self.args.seed, "preferences")
+        for i in range(self.args.candidates):
+            for _ in range(rng.randint(0, self.args.max_preferences)):
+                author, product, role = self.roles[rng.randrange(len(self.roles))]
+                rate_min = float(rng.randrange(50, 150, 5))
+                skills = rng.sample(self.base_skills, min(3, len(self.base_skills)))
+                created_at = timestamp(rng)
+                yield (
+                    self.candidate_base + i, f"{product} - {role}", product, role,
+                    rng.randint(1, 20), rate_min, rate_min + rng.randrange(10, 60, 5),
+                    rng.choice(WORK_TYPES), rng.choice(LOCATIONS), rng.choice(AVAILABILITY),
+                    json.dumps([{"name": skill, "rating": rng.randint(3, 5)} for skill in skills]),
+                    True, created_at, created_at,
+                )
+
+    # -------------------------------------------------------------- companies
+
+    def iter_companies(self):
+        rng = rng_for(self.args.seed, "companies")
+        for c in range(self.args.companies):
+            company_id = self.company_base + c
+            yield (
+                company_id, f"Load Test Company {company_id}", f"company{company_id}.example",
+                rng.choice(LOCATIONS), "Synthetic company for load testing.", timestamp(rng),
+            )
+
+    def iter_company_users(self):
+        rng = rng_for(self.args.seed, "company_users")
+        user_offset = self.user_base + self.args.candidates
+        for c in range(self.args.companies):
+            for u in range(self.args.users_per_company):
+                index = c * self.args.users_per_company + u
+                role = "ADMIN" if u == 0 else "HR" if u == 1 else "RECRUITER"
+                yield (
+                    self.company_user_id(c, u), user_offset + index, self.company_base + c,
+                    rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), role, True, timestamp(rng),
+                )
+
+    # ------------------------------------------------------------------- jobs
+
+    def iter_jobs(self):
+        rng = rng_for(self.args.seed, "jobs")
+        for j in range(self.args.jobs):
+            author, product, role = self.roles[self.job_role[j]]
+            company = self.job_company[j]
+            role_skills = self.skills_by_role[self.job_role[j]]
+            required = rng.sample(role_skills, min(rng.randint(2, 5), len(role_skills)))
+            nice = rng.sample(self.base_skills, min(rng.randint(0, 3), len(self.base_skills)))
+            min_rate = float(rng.randrange(60, 160, 5))
+            job_type = rng.choice(JOB_TYPES)
+            created_at = timestamp(rng)
+            status = "active" if rng.random() < self.args.active_ratio else rng.choice(("closed", "archived"))
+            yield (
+                self.job_base + j, self.company_base + company,
+                self.company_user_id(company, rng.randrange(self.args.users_per_company)),
+                self.company_user_id(company, rng.randrange(self.args.users_per_company)),
+                role, f"Synthetic {role} opening.", author, product, role, rng.choice(SENIORITY),
+                job_type, "6 months" if job_type == "Contract" else None, None, "USD",
+                rng.choice(LOCATIONS), rng.choice(WORK_TYPES),
+                min_rate, min_rate + rng.randrange(10, 60, 5),
+                None if job_type == "Contract" else min_rate * 2000,
+                None if job_type == "Contract" else (min_rate + 40) * 2000,
+                json.dumps(required), json.dumps(nice),
+                status, created_at, created_at, 1,
+            )
+
+    # ----------------------------------------------------- swipes and matches
+
+    def _interactions(self, stream: str, per_job: int):
+        """Yield (job index, candidate index, rng) for distinct candidates per job."""
+        rng = rng_for(self.args.seed, stream)
+        count = min(per_job, self.args.candidates)
+        for j in range(self.args.jobs):
+            for i in rng.sample(range(self.args.candidates), rng.randint(0, count)):
+                yield j, i, rng
+
+    def iter_swipes(self):
+        for j, i, rng in self._interactions("swipes", self.args.swipes_per_job):
+            company = self.job_company[j]
+            liked = rng.random() < 0.4
+            yield (
+                self.candidate_base + i, self.job_base + j,
+                self.company_user_id(company, rng.randrange(self.args.users_per_company)),
+                "like" if liked else "pass",
+                round(rng.uniform(30, 100), 1) if liked else None, None, timestamp(rng),
+            )
+
+    def iter_matches(self, applications: list):
+        for j, i, rng in self._interactions("matches", self.args.matches_per_job):
+            candidate_action = rng.choice(("NONE", "LIKE", "PASS", "APPLY"))
+            recruiter_action = rng.choice(("NONE", "LIKE", "PASS", "ASK_TO_APPLY"))
+            if "PASS" in (candidate_action, recruiter_action):
+                status = "REJECTED"
+            elif candidate_action == "LIKE" and recruiter_action == "LIKE":
+                status = "MATCHED"
+            else:
+                status = "OPEN"
+            if candidate_action == "APPLY":
+                unlock_level = "FULL"
+            elif status == "MATCHED":
+                unlock_level = "PARTIAL"
+            else:
+                unlock_level = "PREVIEW"
+            created_at = timestamp(rng)
+            asked = recruiter_action == "ASK_TO_APPLY"
+            score = round(rng.uniform(30, 100), 1)
+            if candidate_action == "APPLY":
+                applications.append((self.candidate_base + i, self.job_base + j, score, created_at))
+            yield (
+                self.candidate_base + i, self.job_base + j, candidate_action, recruiter_action,
+                status, unlock_level, score, created_at, created_at,
+                created_at if candidate_action != "NONE" else None,
+                created_at if recruiter_action != "NONE" else None,
+                "We'd love you to apply." if asked else None,
+                "PENDING" if asked else None,
+                created_at if asked else None,
+                created_at + timedelta(days=30) if asked else None,
+                False,
+            )
+
+    def iter_applications(self, applications: list):
+        for candidate_id, job_id, score, applied_at in applications:
+            yield (candidate_id, job_id, "submitted", score, applied_at, applied_at)
+
+    # ------------------------------------------------------------------- load
+
+    def load(self, table: str, columns: tuple, rows) -> int:
+        started = time.perf_counter()
+        count = copy_rows(self.session, table, columns, rows)
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        name = table.replace('"', "")
+        print(f"  ✓ {name:<24} {count:>10,} rows  {elapsed:7.1f}s  ({rate:,.0f} rows/s)")
+        return count
+
+    def run(self) -> dict:
+        counts = {}
+        counts["users"] = self.load('"user"', (
+            "id", "email", "password_hash", "user_type", "is_active", "created_at",
+        ), self.iter_users())
+        counts["candidates"] = self.load("candidate", (
+            "id", "user_id", "name", "email", "location", "visa_type", "is_general_info_complete",
+            "summary", "product", "primary_role", "years_experience", "rate_min", "rate_max",
+            "work_type", "availability", "created_at", "updated_at", "version",
+        ), self.iter_candidates())
+        counts["skills"] = self.load("skill", (
+            "candidate_id", "name", "rating", "level", "category",
+        ), self.iter_skills())
+        counts["preferences"] = self.load("candidatejobpreference", (
+            "candidate_id", "preference_name", "product", "primary_role", "years_experience",
+            "rate_min", "rate_max", "work_type", "location", "availability", "required_skills",
+            "is_active", "created_at", "updated_at",
+        ), self.iter_preferences())
+        counts["companies"] = self.load("companyaccount", (
+            "id", "company_name", "domain", "hq_location", "description", "created_at",
+        ), self.iter_companies())
+        counts["company_users"] = self.load("companyuser", (
+            "id", "user_id", "company_id", "first_name", "last_name", "role", "is_active", "created_at",
+        ), self.iter_company_users())
+        counts["jobs"] = self.load("jobpost", (
+            "id", "company_id", "created_by_user_id", "assigned_to_user_id",
+            "title", "description", "product_author", "product", "role", "seniority",
+            "job_type", "duration", "start_date", "currency", "location", "work_type",
+            "min_rate", "max_rate", "salary_min", "salary_max",
+            "required_skills", "nice_to_have_skills", "status", "created_at", "updated_at", "version",
+        ), self.iter_jobs())
+        counts["swipes"] = self.load("swipe", (
+            "candidate_id", "job_post_id", "company_user_id", "action", "match_score",
+            "match_explanation", "created_at",
+        ), self.iter_swipes())
+        applications = []
+        counts["matches"] = self.load("matchstate", (
+            "candidate_id", "job_post_id", "candidate_action", "recruiter_action", "status",
+            "unlock_level", "initial_match_score", "created_at", "updated_at",
+            "candidate_action_at", "recruiter_action_at", "ask_to_apply_message",
+            "ask_to_apply_status", "ask_to_apply_sent_at", "ask_to_apply_expires_at",
+            "ask_to_apply_accepted",
+        ), self.iter_matches(applications))
+        counts["applications"] = self.load("application", (
+            "candidate_id", "job_post_id", "status", "match_score", "applied_at", "updated_at",
+        ), self.iter_applications(applications))
+
+        for table in ('"user"', "candidate", "skill", "candidatejobpreference", "companyaccount",
+                      "companyuser", "jobpost", "swipe", "matchstate", "application"):
+            sync_id_sequence(self.session, table)
+        return counts
+
+
+def parse_range(value: str) -> tuple[int, int]:
+    """'3-8' -> (3, 8); '5' -> (5, 5)."""
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic data via COPY")
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument("--users-per-company", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--skills-per-candidate", type=parse_range, default=(3, 8), help="min-max, e.g. 3-8")
+    parser.add_argument("--max-preferences", type=int, default=3, help="0..N job preferences per candidate")
+    parser.add_argument("--swipes-per-job", type=int, default=20, help="0..N recruiter swipes per job")
+    parser.add_argument("--matches-per-job", type=int, default=20, help="0..N match states per job")
+    parser.add_argument("--active-ratio", type=float, default=0.8, help="Share of jobs that are active")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true", help="Empty the generated tables first")
+    args = parser.parse_args()
+
+    if args.companies < 1 or args.users_per_company < 1:
+        parser.error("--companies and --users-per-company must be at least 1")
+
+    print("=" * 80)
+    print("🧪 TALENTGRAPH SYNTHETIC DATA GENERATOR")
+    print("=" * 80)
+    print(f"  • Candidates: {args.candidates:,} | Companies: {args.companies:,} "
+          f"({args.users_per_company} users each) | Jobs: {args.jobs:,} | Seed: {args.seed}")
+    print("=" * 80)
+
+    started = time.perf_counter()
+    try:
+        with Session(engine) as session:
+            if args.truncate:
+                print("🗑️  Truncating generated tables...")
+                session.exec(text(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE"))
+
+            counts = SyntheticDataset(args, session).run()
+            session.commit()
+
+            print("\n📈 Refreshing planner statistics...")
+            session.exec(text("ANALYZE"))
+            session.commit()
+    except Exception as e:
+        print(f"\n❌ Error during synthetic data generation: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    print(f"\n🎉 Loaded {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f}s")
+    print(f"   Login as any generated user with password: {PASSWORD}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
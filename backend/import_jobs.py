@@ -0,0 +1,51 @@
+"""
+Bulk-import job postings from a CSV or JSONL file via PostgreSQL COPY.
+
+Usage:
+    python import_jobs.py jobs.csv --company-id 1 [--created-by 3] [--format jsonl] [--dry-run]
+"""
+import argparse
+import sys
+
+from sqlmodel import Session
+
+from app.database import engine
+from app.job_import import IMPORT_FORMATS, JobImport, detect_format
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import job postings (CSV or JSONL)")
+    parser.add_argument("path", help="CSV or JSONL file ('-' for stdin)")
+    parser.add_argument("--company-id", type=int, required=True, help="Company the jobs belong to")
+    parser.add_argument("--created-by", type=int, default=None, help="CompanyUser id recorded as creator")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="Defaults to the file extension")
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, import nothing")
+    args = parser.parse_args()
+
+    fmt = detect_format(args.path, args.format)
+    stream = sys.stdin if args.path == "-" else open(args.path, "r", encoding="utf-8-sig", newline="")
+
+    print(f"Importing {fmt} jobs from {args.path} for company {args.company_id}...")
+    try:
+        with Session(engine) as session:
+            report = JobImport(args.company_id, args.created_by).run(
+                session, stream, fmt, dry_run=args.dry_run
+            )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    for error in report["errors"]:
+        print(f"   line {error['line']}: {error['error']}")
+    if report["errors_truncated"]:
+        print(f"   ... {report['failed'] - len(report['errors'])} more errors not shown")
+
+    if args.dry_run:
+        print(f"\n✅ Dry run: {report['valid']} valid, {report['failed']} invalid")
+    else:
+        print(f"\n✅ Imported {report['imported']} jobs, {report['failed']} rejected")
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
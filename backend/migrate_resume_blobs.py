@@ -0,0 +1,82 @@
+"""
+Move resumes stored under the old uploads/candidate_<id>_<filename> layout into
+the content-addressed blob store (app/blob_store.py).
+
+Creates the resumeblob table if needed, then hashes each legacy file, adds a
+blob reference and repoints the Resume row, one commit per resume. Legacy files
+are removed once migrated. Safe to re-run: resumes already in the store are skipped.
+
+Usage:
+    python migrate_resume_blobs.py [--keep-legacy-files]
+"""
+import argparse
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from sqlmodel import Session, select
+
+from app.database import engine
+from app.blob_store import BLOB_TMP_DIR, add_blob_reference, is_blob
+from app.models import Resume, ResumeBlob
+
+
+def copy_to_temp(source: Path) -> tuple[str, int, str]:
+    """Copy a legacy file into the blob temp dir, hashing it on the way."""
+    hasher = hashlib.sha256()
+    fd, temp_path = tempfile.mkstemp(dir=BLOB_TMP_DIR, prefix=".migrate-", suffix=".part")
+    size = 0
+    with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+        for chunk in iter(lambda: src.read(1024 * 1024), b""):
+            hasher.update(chunk)
+            dst.write(chunk)
+            size += len(chunk)
+    return temp_path, size, hasher.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate legacy resume files into the blob store")
+    parser.add_argument("--keep-legacy-files", action="store_true", help="Leave the old files in place")
+    args = parser.parse_args()
+
+    ResumeBlob.__table__.create(engine, checkfirst=True)
+
+    migrated = missing = 0
+    legacy_files = set()
+    with Session(engine) as session:
+        resumes = session.exec(select(Resume).order_by(Resume.id)).all()
+        for resume in resumes:
+            source = Path(resume.storage_path)
+            if is_blob(source):
+                continue
+            if not source.exists():
+                print(f"   ⚠️  resume {resume.id}: file missing ({source})")
+                missing += 1
+                continue
+
+            temp_path, size, content_hash = copy_to_temp(source)
+            try:
+                resume.storage_path = str(add_blob_reference(session, temp_path, content_hash, size))
+                resume.size_bytes = size
+                resume.content_hash = content_hash
+                session.add(resume)
+                session.commit()
+            except Exception:
+                session.rollback()
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+            legacy_files.add(source)
+            migrated += 1
+
+    if not args.keep_legacy_files:
+        for source in legacy_files:
+            source.unlink(missing_ok=True)
+
+    print(f"\n✅ Migrated {migrated} resumes into the blob store ({missing} with missing files)")
+    if legacy_files and not args.keep_legacy_files:
+        print(f"   Removed {len(legacy_files)} legacy files")
+
+
+if __name__ == "__main__":
+    main()
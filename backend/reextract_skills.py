@@ -0,0 +1,142 @@
+"""
+Re-run skill extraction over the whole corpus, e.g. after the skills vocabulary
+(app/data/skills.json, app/data/skill_aliases.json) has changed.
+
+Rescans every extracted resume (refreshing the "skills" entry of
+Resume.text_stats) and every job description (JobPost.description_skills) in
+id-ordered batches, one commit per batch. Only rows whose skills changed are
+written; changed jobs get a new updated_at/version and bump the job change
+sequence, so cached projections and ETags (single jobs and job lists) refresh.
+Matching runs in a process pool with --workers > 1.
+
+Usage:
+    python reextract_skills.py [--batch-size 500] [--workers 4] [--attach] [--resumes-only | --jobs-only]
+
+--attach also adds the skills found in each resume to the candidate's profile.
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app.database import engine
+from app.models import JobPost, Resume, bump_change_sequence
+from app.resume_extraction import attach_skills
+from app.skill_extraction import extract_skills, get_skill_matcher
+
+
+def id_batches(session: Session, columns: list, where, batch_size: int):
+    """Yield lists of rows ordered by id (columns[0] must be the id column), keyset-paged."""
+    last_id = 0
+    while True:
+        rows = session.exec(
+            select(*columns).where(where, columns[0] > last_id).order_by(columns[0]).limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def scan(texts: list[str], pool) -> list[dict[str, int]]:
+    if pool is None:
+        return [extract_skills(text) for text in texts]
+    return list(pool.map(extract_skills, texts, chunksize=max(1, len(texts) // 32)))
+
+
+def reextract_resumes(pool, batch_size: int, attach: bool) -> tuple[int, int, int]:
+    scanned = changed = scanned_bytes = 0
+    with Session(engine) as session:
+        columns = [Resume.id, Resume.candidate_id, Resume.extracted_text, Resume.text_stats]
+        for rows in id_batches(session, columns, Resume.extraction_status == "done", batch_size):
+            texts = [row[2] or "" for row in rows]
+            updates = []
+            for (resume_id, candidate_id, _, stats_json), skills in zip(rows, scan(texts, pool)):
+                stats = json.loads(stats_json or "{}")
+                if stats.get("skills") != skills:
+                    stats["skills"] = skills
+                    updates.append({"id": resume_id, "text_stats": json.dumps(stats)})
+                if attach and skills:
+                    attach_skills(session, candidate_id, skills)
+            if updates:
+                session.execute(update(Resume), updates)
+            session.commit()
+            scanned += len(rows)
+            changed += len(updates)
+            scanned_bytes += sum(len(text.encode("utf-8")) for text in texts)
+            print(f"   resumes: {scanned} scanned, {changed} updated")
+    return scanned, changed, scanned_bytes
+
+
+def reextract_jobs(pool, batch_size: int) -> tuple[int, int, int]:
+    scanned = changed = scanned_bytes = 0
+    with Session(engine) as session:
+        columns = [JobPost.id, JobPost.description, JobPost.description_skills, JobPost.version]
+        for rows in id_batches(session, columns, JobPost.description.is_not(None), batch_size):
+            texts = [row[1] or "" for row in rows]
+            now = datetime.utcnow()
+            updates = []
+            for (job_id, _, old_json, version), skills in zip(rows, scan(texts, pool)):
+                new_json = json.dumps(list(skills))
+                if new_json != (old_json or "[]"):
+                    updates.append({
+                        "id": job_id,
+                        "description_skills": new_json,
+                        "updated_at": now,
+                        "version": (version or 0) + 1,
+                    })
+            if updates:
+                session.execute(update(JobPost), updates)
+                # Bulk UPDATE skips the ORM hook that bumps it (job list ETags)
+                bump_change_sequence(session.connection(), "jobpost")
+            session.commit()
+            scanned += len(rows)
+            changed += len(updates)
+            scanned_bytes += sum(len(text.encode("utf-8")) for text in texts)
+            print(f"   jobs: {scanned} scanned, {changed} updated")
+    return scanned, changed, scanned_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract skills from all resumes and job descriptions")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=1, help="Processes used for matching")
+    parser.add_argument("--attach", action="store_true", help="Add resume skills to candidate profiles")
+    only = parser.add_mutually_exclusive_group()
+    only.add_argument("--resumes-only", action="store_true")
+    only.add_argument("--jobs-only", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    matcher = get_skill_matcher()
+    print(f"🔧 Built skill matcher: {len(matcher.skills)} skills, {matcher.pattern_count} patterns "
+          f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        started = time.perf_counter()
+        total_bytes = 0
+        if not args.jobs_only:
+            print("📄 Rescanning resumes...")
+            scanned, changed, scanned_bytes = reextract_resumes(pool, args.batch_size, args.attach)
+            total_bytes += scanned_bytes
+            print(f"✅ Resumes: {scanned} scanned, {changed} updated")
+        if not args.resumes_only:
+            print("💼 Rescanning job descriptions...")
+            scanned, changed, scanned_bytes = reextract_jobs(pool, args.batch_size)
+            total_bytes += scanned_bytes
+            print(f"✅ Jobs: {scanned} scanned, {changed} updated")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Done in {elapsed:.1f}s ({total_bytes / (1024 * 1024) / max(elapsed, 1e-9):.2f} MB/s including DB)")
+
+
+if __name__ == "__main__":
+    main()
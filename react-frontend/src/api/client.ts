@@ -2,7 +2,7 @@
  * API client with Axios + token management
  */
 
-import axios, { AxiosInstance } from 'axios';
+import axios, { AxiosInstance, AxiosResponse } from 'axios';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://127.0.0.1:8000';
 
@@ -250,6 +250,38 @@ apiClient.interceptors.response.use(
   }
 );
 
+// ============================================================================
+// PAGINATION
+// ============================================================================
+// List endpoints return one keyset page per request: plain arrays carry the next
+// page's cursor in the X-Next-Cursor header, wrapped listings in `next_cursor`.
+// These helpers follow the cursor so callers still receive the whole list.
+const PAGE_LIMIT = 200;
+
+const getAllPages = async <T>(url: string): Promise<AxiosResponse<T[]>> => {
+  const items: T[] = [];
+  let cursor: string | undefined;
+  let response: AxiosResponse<T[]>;
+  do {
+    response = await apiClient.get<T[]>(url, { params: { limit: PAGE_LIMIT, cursor } });
+    items.push(...response.data);
+    cursor = (response.headers['x-next-cursor'] as string | undefined) || undefined;
+  } while (cursor);
+  return { ...response, data: items };
+};
+
+const getAllListingPages = async (url: string, itemsKey: string): Promise<AxiosResponse<any>> => {
+  const items: any[] = [];
+  let cursor: string | undefined;
+  let response: AxiosResponse<any>;
+  do {
+    response = await apiClient.get<any>(url, { params: { limit: PAGE_LIMIT, cursor } });
+    items.push(...response.data[itemsKey]);
+    cursor = response.data.next_cursor || undefined;
+  } while (cursor);
+  return { ...response, data: { ...response.data, [itemsKey]: items, next_cursor: null } };
+};
+
 // ============================================================================
 // AUTH API
 // ============================================================================
@@ -339,7 +371,7 @@ export const candidateAPI = {
 
   // Applications
   listApplications: () =>
-    apiClient.get<Application[]>('/candidates/me/applications'),
+    getAllPages<Application>('/candidates/me/applications'),
 
   // Matching
   getRoleFit: (candidateId: number, author: string, product: string, role: string) =>
@@ -351,7 +383,7 @@ export const candidateAPI = {
   
   // List all candidates with preferences (for company users)
   listAllCandidates: () =>
-    apiClient.get<CandidateProfile[]>('/candidates/list/all'),
+    getAllPages<CandidateProfile>('/candidates/list/all'),
 };
 
 // ============================================================================
@@ -392,6 +424,9 @@ export const companyAPI = {
 
   listEmployees: (companyId: number) =>
     apiClient.get(`/company/${companyId}/employees`),
+
+  deactivateEmployee: (employeeId: number) =>
+    apiClient.put(`/company/employees/${employeeId}/deactivate`),
 };
 
 // ============================================================================
@@ -428,7 +463,7 @@ export const jobsAPI = {
     apiClient.get<JobPost[]>('/jobs/'),
 
   listAll: () =>
-    apiClient.get<JobPost[]>('/jobs/available'),
+    getAllPages<JobPost>('/jobs/available'),
 
   get: (jobId: number) =>
     apiClient.get<JobPost>(`/jobs/${jobId}`),
@@ -441,7 +476,7 @@ export const jobsAPI = {
 
   // Company-wide job listing (Admin/HR only)
   getCompanyAllPostings: () =>
-    apiClient.get<JobPost[]>('/jobs/company/all-postings'),
+    getAllPages<JobPost>('/jobs/company/all-postings'),
 
   // Recruiter's own job postings (created by current user)
   getRecruiterAccessiblePostings: () =>
@@ -453,7 +488,7 @@ export const jobsAPI = {
 
   // All company job postings for recruiter view
   getRecruiterPostings: () =>
-    apiClient.get<JobPost[]>('/jobs/recruiter/my-postings'),
+    getAllPages<JobPost>('/jobs/recruiter/my-postings'),
 
   createJobPosting: (data: Partial<JobPost>) =>
     apiClient.post<JobPost>('/jobs/recruiter/create', data),
@@ -546,7 +581,7 @@ export const matchesAPI = {
 
   // Get pending ask-to-apply requests for candidate
   getPendingAsks: (candidateId: number) =>
-    apiClient.get<any>(`/matches/candidate/pending-asks/${candidateId}`),
+    getAllListingPages(`/matches/candidate/pending-asks/${candidateId}`, 'pending_asks'),
 
   // Respond to ask-to-apply request
   respondToAsk: (matchStateId: number, accept: boolean) =>
@@ -561,9 +596,79 @@ export const matchesAPI = {
 
   // Get recruiter's shortlist (liked candidates)
   getRecruiterShortlist: (companyId: number) =>
-    apiClient.get<any>(`/matches/recruiter/shortlist/${companyId}`),
+    getAllListingPages(`/matches/recruiter/shortlist/${companyId}`, 'shortlisted_candidates'),
 
   // Get candidate's liked jobs
   getCandidateLikes: (candidateId: number) =>
-    apiClient.get<any>(`/matches/candidate/likes/${candidateId}`),
+    getAllListingPages(`/matches/candidate/likes/${candidateId}`, 'liked_jobs'),
+};
+
+// ============================================================================
+// EVENTS API (Server-sent events)
+// ============================================================================
+// The server pushes a notification when data behind a view changes; views
+// refetch on each event instead of polling. EventSource cannot send headers, so
+// the stream is opened with a single-use ticket, and a dropped stream is reopened
+// with a fresh ticket (the browser's own retry would reuse the spent one).
+export type PushEventName = 'ready' | 'match_updated' | 'ask_received' | 'feed_candidate' | 'resync';
+
+export type PushEventHandlers = Partial<Record<PushEventName, (data: any) => void>>;
+
+const PUSH_EVENTS: PushEventName[] = ['ready', 'match_updated', 'ask_received', 'feed_candidate', 'resync'];
+const EVENT_RECONNECT_MS = 5000;
+
+export const eventsAPI = {
+  createTicket: () =>
+    apiClient.post<{ ticket: string; expires_in: number }>('/events/ticket'),
+
+  // Open the caller's event stream; returns a function that closes it for good
+  subscribe: (handlers: PushEventHandlers): (() => void) => {
+    let source: EventSource | null = null;
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+    let closed = false;
+
+    const reconnect = () => {
+      source?.close();
+      source = null;
+      if (!closed) {
+        reconnectTimer = setTimeout(connect, EVENT_RECONNECT_MS);
+      }
+    };
+
+    const connect = async () => {
+      let ticket: string;
+      try {
+        ticket = (await eventsAPI.createTicket()).data.ticket;
+      } catch (error) {
+        console.error('[EVENTS-API] Could not get a stream ticket', error);
+        reconnect();
+        return;
+      }
+      if (closed) return;
+      const stream = new EventSource(`${API_BASE_URL}/events/stream?ticket=${encodeURIComponent(ticket)}`);
+      source = stream;
+      console.log('[EVENTS-API] Stream opened');
+      PUSH_EVENTS.forEach((name) => {
+        const handler = handlers[name];
+        if (handler) {
+          stream.addEventListener(name, (event) => {
+            const { data } = event as MessageEvent;
+            handler(data ? JSON.parse(data) : null);
+          });
+        }
+      });
+      stream.onerror = () => {
+        console.log('[EVENTS-API] Stream dropped - reconnecting with a new ticket');
+        reconnect();
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      source?.close();
+      source = null;
+    };
+  },
 };
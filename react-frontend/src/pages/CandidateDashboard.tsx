@@ -7,6 +7,7 @@ import {
   recommendationsAPI,
   matchesAPI,
   jobsAPI,
+  eventsAPI,
 } from '../api/client';
 import { useAuth } from '../context/authStore';
 import { SkillSelector } from '../components/SkillSelector';
@@ -72,6 +73,21 @@ const CandidateDashboard: React.FC = () => {
     fetchAllData();
   }, []);
 
+  // Refetch asks and likes when the server reports a change instead of polling
+  useEffect(() => {
+    if (!candidateId) return;
+    const refetch = () => {
+      loadPendingAsks();
+      loadLikedJobs();
+    };
+    return eventsAPI.subscribe({
+      ready: refetch,
+      resync: refetch,
+      ask_received: loadPendingAsks,
+      match_updated: refetch,
+    });
+  }, [candidateId]);
+
   const fetchAllData = async () => {
     try {
       setLoading(true);
@@ -3,9 +3,9 @@
  * Tabs: Job Management, Browse Candidates, Shortlist, Rankings
  */
 
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { jobsAPI, jobRolesAPI, candidateAPI, recommendationsAPI, matchesAPI } from '../api/client';
+import { jobsAPI, jobRolesAPI, candidateAPI, recommendationsAPI, matchesAPI, eventsAPI, PushEventHandlers } from '../api/client';
 import { useAuth } from '../context/authStore';
 import '../styles/Dashboard.css';
 import '../styles/EnterpriseDashboard.css';
@@ -79,6 +79,37 @@ const CompanyDashboard: React.FC = () => {
     }
   }, [activeTab]);
 
+  // Server events refetch the shortlist and candidate feed instead of polling.
+  // Handlers live in a ref so they see the current jobs and tab without reopening the stream.
+  const eventHandlers = useRef<PushEventHandlers>({});
+  const refetchOnEvent = () => {
+    if (jobs.length > 0) {
+      loadShortlist();
+    }
+    if (activeTab === 'recommendations') {
+      loadRecommendations();
+    }
+  };
+  eventHandlers.current = {
+    ready: refetchOnEvent,
+    resync: refetchOnEvent,
+    match_updated: () => {
+      if (jobs.length > 0) loadShortlist();
+    },
+    feed_candidate: () => {
+      if (activeTab === 'recommendations') loadRecommendations();
+    },
+  };
+
+  useEffect(() => {
+    return eventsAPI.subscribe({
+      ready: (data) => eventHandlers.current.ready?.(data),
+      resync: (data) => eventHandlers.current.resync?.(data),
+      match_updated: (data) => eventHandlers.current.match_updated?.(data),
+      feed_candidate: (data) => eventHandlers.current.feed_candidate?.(data),
+    });
+  }, []);
+
   const loadOntology = async () => {
     console.log('[COMPANY-DASHBOARD] Loading ontology (authors)');
     try {
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { candidateAPI, matchesAPI, jobsAPI } from '../api/client';
+import { candidateAPI, matchesAPI, jobsAPI, eventsAPI } from '../api/client';
 import '../styles/EnterpriseDashboard.css';
 
 interface RecruiterRequest {
@@ -59,6 +59,17 @@ const RequestsInboxPage: React.FC = () => {
     }
   }, [candidateId]);
 
+  // New or withdrawn asks arrive as server events; refetch the inbox on each
+  useEffect(() => {
+    if (!candidateId) return;
+    return eventsAPI.subscribe({
+      ready: fetchRequests,
+      resync: fetchRequests,
+      ask_received: fetchRequests,
+      match_updated: fetchRequests,
+    });
+  }, [candidateId]);
+
   const fetchCandidateProfile = async () => {
     try {
       const response = await candidateAPI.getMe();